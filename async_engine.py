@@ -0,0 +1,172 @@
+# ========== Import Required Libraries ==========
+import time  # Response times for the rate limiter
+import asyncio  # Concurrency without a thread per request
+import logging  # For logging events (info, warnings, errors)
+from datetime import datetime  # For timestamped output files
+from urllib.parse import urlsplit  # For grouping requests by host
+import aiohttp  # Async HTTP client
+
+import page_parser
+import rate_limiter
+import records
+import venues
+import writers
+from http_backend import USER_AGENT
+
+
+# ========== Async Scraper ==========
+class AsyncScraper:
+    """
+    Fetches production pages concurrently and parses them with page_parser.
+
+    global_limit caps requests in flight overall, per_host_limit caps them per
+    host, so several OvationTix clients can be scraped in one process.
+    """
+
+    def __init__(self, global_limit=20, per_host_limit=4, timeout=15):
+        self.global_limit = global_limit
+        self.per_host_limit = per_host_limit
+        self.timeout = timeout
+        self._global = None
+        self._hosts = {}
+        self.needs_browser = []  # Pages served without a rendered calendar
+        self.failed = []
+
+    def _host_semaphore(self, url):
+        host = urlsplit(url).netloc
+        if host not in self._hosts:
+            self._hosts[host] = asyncio.Semaphore(self.per_host_limit)
+        return self._hosts[host]
+
+    def create_session(self):
+        return aiohttp.ClientSession(
+            headers={"User-Agent": USER_AGENT},
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+            connector=aiohttp.TCPConnector(limit=self.global_limit, limit_per_host=self.per_host_limit),
+        )
+
+    async def fetch(self, session, url):
+        limiter = rate_limiter.get_limiter()
+        async with self._host_semaphore(url):
+            # Paced per host, same limiter as the threaded paths. The wait
+            # happens before taking a global slot, so a throttled host does
+            # not hold slots that requests to other hosts could use.
+            await asyncio.sleep(limiter.reserve(url))
+            async with self._global:
+                return await self._get(session, url, limiter)
+
+    async def _get(self, session, url, limiter):
+        start = time.monotonic()
+        try:
+            async with session.get(url) as response:
+                limiter.record(url, response.status, time.monotonic() - start,
+                               retry_after=rate_limiter.retry_after_seconds(response.headers))
+                response.raise_for_status()
+                page_html = await response.text()
+                logging.info(f"Fetched {url} ({len(page_html)} chars)")
+                return page_html
+        except asyncio.TimeoutError:
+            limiter.record(url, error=True)
+            logging.error(f"Timed out fetching {url} after {self.timeout}s")
+        except aiohttp.ClientResponseError as e:
+            logging.error(f"Error fetching {url}: {e}")  # Status already recorded
+        except aiohttp.ClientError as e:
+            limiter.record(url, error=True)
+            logging.error(f"Error fetching {url}: {e}")
+        return None
+
+    async def scrape_one(self, session, url):
+        # One bad page (empty body, undecodable text...) fails only itself
+        try:
+            page_html = await self.fetch(session, url)
+            if page_html is None:
+                self.failed.append(url)
+                return None
+
+            tree = page_parser.parse_html(page_html)
+            if not page_parser.has_rendered_calendar(tree):
+                logging.warning(f"No rendered calendar in HTML for {url}; needs browser fallback.")
+                self.needs_browser.append(url)
+                return None
+            return page_parser.parse_event_details(page_html, url, tree=tree)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logging.error(f"Error scraping {url}: {e}")
+            self.failed.append(url)
+            return None
+
+    async def scrape(self, urls):
+        """Yields details dicts as soon as each page is done (completion order)."""
+        self._global = asyncio.Semaphore(self.global_limit)
+        async with self.create_session() as session:
+            tasks = [asyncio.create_task(self.scrape_one(session, url)) for url in urls]
+            try:
+                for next_done in asyncio.as_completed(tasks):
+                    details = await next_done
+                    if details is not None:
+                        yield details
+            finally:
+                # Consumer stopped early or we were cancelled: don't leak tasks
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+
+# ========== Streaming CSV Writer ==========
+async def scrape_to_csv(urls, filename, scraper=None, flush_every=writers.FLUSH_EVERY):
+    # .csv or .ndjson; rows go to <filename>.part as pages finish and the
+    # file gets its final name once the run completes
+    scraper = scraper or AsyncScraper()
+    registry = venues.load_registry()  # For tagging rows with their venue
+    count = 0
+
+    with writers.open_writer(filename, records.FIELDNAMES, flush_every=flush_every) as writer:
+        async for details in scraper.scrape(urls):
+            details["venue"] = venues.venue_of(registry, details.get("event_url"))
+            rows = records.build_event_rows(details)
+            writer.write_many(rows)
+            count += len(rows)
+
+    logging.info(f"Successfully saved {count} records to {filename}")
+    if scraper.needs_browser:
+        logging.warning(f"{len(scraper.needs_browser)} pages need the browser backend: {scraper.needs_browser}")
+    if scraper.failed:
+        logging.warning(f"{len(scraper.failed)} pages failed: {scraper.failed}")
+    rate_limiter.get_limiter().save()
+    rate_limiter.get_limiter().log_summary()
+    return count
+
+
+# ========== Main Script ==========
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="Scrape production pages concurrently with asyncio")
+    parser.add_argument("urls", nargs="*", help="Production page URLs (any OvationTix client)")
+    parser.add_argument("--urls-file", help="File with one production URL per line")
+    parser.add_argument("--global-limit", type=int, default=20, help="Max requests in flight overall")
+    parser.add_argument("--per-host-limit", type=int, default=4, help="Max requests in flight per host")
+    parser.add_argument("--timeout", type=float, default=15, help="Per-request timeout in seconds")
+    parser.add_argument("--output", help="CSV or NDJSON file to write")
+    parser.add_argument("--flush-every", type=int, default=writers.FLUSH_EVERY, help="Rows between flushes to disk")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+    urls = list(args.urls)
+    if args.urls_file:
+        with open(args.urls_file, encoding="utf-8") as f:
+            urls.extend(line.strip() for line in f if line.strip())
+    if not urls:
+        parser.error("no production URLs given")
+
+    output = args.output or f"data/ovationtix_events_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+    scraper = AsyncScraper(args.global_limit, args.per_host_limit, args.timeout)
+    try:
+        asyncio.run(scrape_to_csv(urls, output, scraper, args.flush_every))
+    except KeyboardInterrupt:
+        logging.warning(f"Interrupted; rows written so far are kept in {output}.part")
+
+
+if __name__ == "__main__":
+    main()
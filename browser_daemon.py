@@ -0,0 +1,285 @@
+# ========== Import Required Libraries ==========
+import os  # For the auth key file and its override
+import time  # For browser age and health-check intervals
+import logging  # For logging events (info, warnings, errors)
+import secrets  # Random auth key on the daemon's first start
+import threading  # One thread per client connection
+from multiprocessing.connection import Client, Listener  # Local authenticated socket
+from selenium import webdriver  # For ChromeOptions on the attached driver
+from selenium.webdriver.chromium.remote_connection import ChromiumRemoteConnection
+from selenium.webdriver.remote.webdriver import WebDriver as RemoteWebDriver
+
+from driver_pool import driver_is_alive
+
+DEFAULT_ADDRESS = ("127.0.0.1", 6010)
+# Readable by the current user only; BROWSER_DAEMON_AUTHKEY overrides it
+AUTHKEY_PATH = os.path.join(os.path.expanduser("~"), ".tnny", "browser_daemon.key")
+HEALTH_INTERVAL = 60  # Seconds between health checks while idle
+MAX_BROWSER_AGE = 24 * 3600  # Recycle Chrome once a day
+
+
+def load_authkey(path=AUTHKEY_PATH, create=False):
+    """
+    The daemon's auth key: BROWSER_DAEMON_AUTHKEY, else the per-user key
+    file. With create, a missing file gets a new random key (mode 0600);
+    without it, a missing file raises FileNotFoundError.
+    """
+    override = os.environ.get("BROWSER_DAEMON_AUTHKEY")
+    if override:
+        return override.encode("utf-8")
+    if create and not os.path.exists(path):
+        os.makedirs(os.path.dirname(path), mode=0o700, exist_ok=True)
+        try:
+            fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        except FileExistsError:
+            pass  # Another daemon wrote it first; use that one
+        else:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(secrets.token_hex(32))
+            logging.info(f"Created browser daemon auth key {path}")
+    if os.stat(path).st_mode & 0o077:
+        logging.warning(f"{path} is readable by other users; anyone who can read it can drive the daemon")
+    with open(path, encoding="utf-8") as f:
+        return f.read().strip().encode("utf-8")
+
+
+def executor_url(driver):
+    # Where chromedriver listens; the attribute moved between Selenium versions
+    executor = driver.command_executor
+    config = getattr(executor, "client_config", None) or getattr(executor, "_client_config", None)
+    if config is not None and getattr(config, "remote_server_addr", None):
+        return config.remote_server_addr
+    return executor._url
+
+
+# ========== Browser Daemon (Server) ==========
+class BrowserDaemon:
+    """
+    Keeps one warm Chrome alive and lends it to scrape runs, one at a time.
+
+    A run connects over a local authenticated socket, gets the chromedriver
+    address and session id, and drives the browser directly. The daemon
+    health-checks the browser between leases and restarts it if it died or
+    is older than max_age.
+    """
+
+    def __init__(self, factory, address=DEFAULT_ADDRESS, authkey=None,
+                 health_interval=HEALTH_INTERVAL, max_age=MAX_BROWSER_AGE):
+        self.factory = factory
+        self.address = address
+        self.authkey = authkey or load_authkey(create=True)
+        self.health_interval = health_interval
+        self.max_age = max_age
+        self._driver = None
+        self._started_at = None
+        self._lease = threading.Lock()  # Held while a run uses the browser
+        self._stopped = threading.Event()
+        self.restarts = 0
+        self.leases = 0
+
+    # ---------- Browser lifecycle ----------
+    def _quit_driver(self):
+        if self._driver is not None:
+            try:
+                self._driver.quit()
+            except Exception as e:
+                logging.warning(f"Error quitting daemon browser: {e}")
+        self._driver = None
+
+    def _ensure_driver(self):
+        # Caller holds the lease
+        too_old = self._started_at is not None and time.time() - self._started_at > self.max_age
+        if self._driver is not None and not too_old and driver_is_alive(self._driver):
+            return self._driver
+
+        if self._driver is not None:
+            logging.warning("Daemon browser is dead or too old, restarting it.")
+            self.restarts += 1
+        self._quit_driver()
+        start = time.perf_counter()
+        self._driver = self.factory()
+        self._started_at = time.time()
+        logging.info(f"Daemon browser started in {time.perf_counter() - start:.1f}s")
+        return self._driver
+
+    def _reset_driver(self):
+        # Leave the browser clean for the next run
+        try:
+            handles = self._driver.window_handles
+            for handle in handles[1:]:
+                self._driver.switch_to.window(handle)
+                self._driver.close()
+            self._driver.switch_to.window(handles[0])
+            self._driver.delete_all_cookies()
+            self._driver.get("about:blank")
+        except Exception as e:
+            logging.warning(f"Could not reset daemon browser: {e}")
+
+    # ---------- Client protocol ----------
+    def _handle(self, conn):
+        leased = False
+        try:
+            while True:
+                request = conn.recv()
+                command = request.get("cmd")
+
+                if command == "acquire":
+                    if not self._lease.acquire(timeout=request.get("timeout", 300)):
+                        conn.send({"ok": False, "error": "browser busy"})
+                        continue
+                    leased = True
+                    try:
+                        driver = self._ensure_driver()
+                    except Exception as e:
+                        self._lease.release()
+                        leased = False
+                        conn.send({"ok": False, "error": f"browser failed to start: {e}"})
+                        continue
+                    self.leases += 1
+                    conn.send({"ok": True, "executor_url": executor_url(driver), "session_id": driver.session_id})
+
+                elif command == "release" and leased:
+                    self._reset_driver()
+                    self._lease.release()
+                    leased = False
+                    conn.send({"ok": True})
+
+                elif command == "status":
+                    conn.send({
+                        "ok": True,
+                        "alive": self._driver is not None and driver_is_alive(self._driver),
+                        "age": time.time() - self._started_at if self._started_at else None,
+                        "leased": self._lease.locked(),
+                        "leases": self.leases,
+                        "restarts": self.restarts,
+                    })
+
+                else:
+                    conn.send({"ok": False, "error": f"unknown command {command!r}"})
+        except (EOFError, OSError):
+            pass  # Client went away
+        finally:
+            if leased:
+                logging.warning("Client disconnected without releasing the browser.")
+                self._reset_driver()
+                self._lease.release()
+            conn.close()
+
+    def _health_loop(self):
+        while not self._stopped.wait(self.health_interval):
+            # Only check while nobody is using the browser
+            if self._lease.acquire(blocking=False):
+                try:
+                    self._ensure_driver()
+                except Exception as e:
+                    logging.error(f"Daemon health check failed to start browser: {e}")
+                finally:
+                    self._lease.release()
+
+    def serve_forever(self):
+        with self._lease:
+            self._ensure_driver()  # Pay the cold start now, not on the first run
+        threading.Thread(target=self._health_loop, daemon=True).start()
+
+        with Listener(self.address, authkey=self.authkey) as listener:
+            logging.info(f"Browser daemon listening on {self.address[0]}:{self.address[1]}")
+            try:
+                while not self._stopped.is_set():
+                    try:
+                        conn = listener.accept()
+                    except Exception as e:
+                        logging.warning(f"Rejected daemon connection: {e}")
+                        continue
+                    threading.Thread(target=self._handle, args=(conn,), daemon=True).start()
+            finally:
+                self._stopped.set()
+                self._quit_driver()
+
+
+# ========== Attached Driver (Client) ==========
+class AttachedDriver(RemoteWebDriver):
+    """WebDriver bound to the daemon's existing session; quit() releases it."""
+
+    def __init__(self, url, session_id, conn):
+        self._attached_session_id = session_id
+        self._conn = conn
+        executor = ChromiumRemoteConnection(url, vendor_prefix="goog", browser_name="chrome")
+        super().__init__(command_executor=executor, options=webdriver.ChromeOptions())
+
+    def start_session(self, capabilities):
+        # Reuse the running session instead of creating a new browser
+        self.session_id = self._attached_session_id
+        self.caps = {}
+
+    def execute_cdp_cmd(self, cmd, cmd_args):
+        return self.execute("executeCdpCommand", {"cmd": cmd, "params": cmd_args})["value"]
+
+    def quit(self):
+        if self._conn is None:
+            return
+        try:
+            self._conn.send({"cmd": "release"})
+            self._conn.recv()
+        except Exception as e:
+            logging.warning(f"Could not release daemon browser cleanly: {e}")
+        finally:
+            self._conn.close()
+            self._conn = None
+
+
+def connect(address=DEFAULT_ADDRESS, authkey=None, fallback_factory=None, timeout=300):
+    """
+    Borrows the daemon's warm browser. Without a daemon, launches one with
+    fallback_factory (or raises). Either way, driver.quit() ends the run.
+    """
+    try:
+        # No key file yet means no daemon has ever started for this user
+        conn = Client(address, authkey=authkey or load_authkey())
+    except OSError as e:
+        if fallback_factory is None:
+            raise
+        logging.warning(f"Browser daemon not reachable ({e}), launching a local browser.")
+        return fallback_factory()
+
+    conn.send({"cmd": "acquire", "timeout": timeout})
+    reply = conn.recv()
+    if not reply.get("ok"):
+        conn.close()
+        if fallback_factory is None:
+            raise RuntimeError(f"Browser daemon refused lease: {reply.get('error')}")
+        logging.warning(f"Browser daemon refused lease ({reply.get('error')}), launching a local browser.")
+        return fallback_factory()
+
+    logging.info(f"Attached to daemon browser session {reply['session_id']}")
+    return AttachedDriver(reply["executor_url"], reply["session_id"], conn)
+
+
+def status(address=DEFAULT_ADDRESS, authkey=None):
+    with Client(address, authkey=authkey or load_authkey()) as conn:
+        conn.send({"cmd": "status"})
+        return conn.recv()
+
+
+# ========== Main Script ==========
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="Keep a warm Chrome for scrape runs")
+    parser.add_argument("--port", type=int, default=DEFAULT_ADDRESS[1])
+    parser.add_argument("--status", action="store_true", help="Print the running daemon's status and exit")
+    args = parser.parse_args()
+    address = (DEFAULT_ADDRESS[0], args.port)
+
+    if args.status:
+        print(status(address))
+        return
+
+    # test0 configures logging and owns the browser setup
+    from test0 import setup_driver
+    from browser_profile import LeanProfile
+
+    lean_profile = LeanProfile()
+    BrowserDaemon(lambda: setup_driver(lean_profile), address=address).serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+# ========== Import Required Libraries ==========
+import json  # Performance log messages are JSON strings
+import fnmatch  # Match request URLs against the block patterns
+import logging  # For logging events (info, warnings, errors)
+import threading  # Stats are shared by pool workers
+from collections import defaultdict  # Per-category counters
+
+# URL patterns (Network.setBlockedURLs wildcard syntax) per asset category.
+# Blocking only stops the download: img.ot_prodImg keeps its src attribute.
+BLOCK_PATTERNS = {
+    "images": [
+        "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico",
+        "*/trs/api/rest/ClientFile(*",
+    ],
+    "fonts": ["*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot", "*fonts.googleapis.com*", "*fonts.gstatic.com*"],
+    "media": ["*.mp4", "*.webm", "*.mp3", "*.m4a", "*.ogg", "*youtube.com/embed*", "*player.vimeo.com*"],
+    "analytics": [
+        "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+        "*connect.facebook.net*", "*facebook.com/tr*", "*hotjar.com*", "*clarity.ms*",
+        "*newrelic.com*", "*nr-data.net*", "*sentry.io*",
+    ],
+}
+DEFAULT_CATEGORIES = ("images", "fonts", "media", "analytics")
+
+# Typical transfer size per blocked request, used to estimate bytes saved
+# (a blocked request never reports its real size)
+ESTIMATED_BYTES = {
+    "images": 150 * 1024,
+    "fonts": 40 * 1024,
+    "media": 1024 * 1024,
+    "analytics": 30 * 1024,
+}
+
+
+# ========== Lean Loading Profile ==========
+class LeanProfile:
+    """
+    Blocks asset categories through CDP and reports what that saved.
+
+    Call enable_logging(options) before the browser starts, apply(driver)
+    right after, and collect(driver) from time to time (it drains the
+    performance log).
+    """
+
+    def __init__(self, categories=DEFAULT_CATEGORIES, extra_patterns=()):
+        self.categories = tuple(categories)
+        self.extra_patterns = list(extra_patterns)
+        self._lock = threading.Lock()
+        self.blocked = defaultdict(int)  # category -> requests blocked
+        self.requests = 0  # Requests that completed
+        self.bytes_downloaded = 0
+
+    def patterns(self):
+        patterns = []
+        for category in self.categories:
+            patterns.extend(BLOCK_PATTERNS.get(category, []))
+        return patterns + self.extra_patterns
+
+    def category_of(self, url):
+        for category in self.categories:
+            if any(fnmatch.fnmatch(url, pattern) for pattern in BLOCK_PATTERNS.get(category, [])):
+                return category
+        return "other"
+
+    @staticmethod
+    def enable_logging(options):
+        # Performance log gives us the Network.* events used for the stats
+        options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+
+    def apply(self, driver):
+        try:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": self.patterns()})
+            logging.info(f"Lean profile active: blocking {', '.join(self.categories)}")
+        except Exception as e:
+            logging.warning(f"Could not apply lean profile: {e}")
+
+    def collect(self, driver):
+        try:
+            entries = driver.get_log("performance")
+        except Exception:
+            return  # Logging not enabled or browser gone
+
+        urls = {}
+        blocked = defaultdict(int)
+        requests = 0
+        downloaded = 0
+        for entry in entries:
+            try:
+                message = json.loads(entry["message"])["message"]
+            except (KeyError, ValueError):
+                continue
+            method = message.get("method")
+            params = message.get("params", {})
+            if method == "Network.requestWillBeSent":
+                urls[params.get("requestId")] = params.get("request", {}).get("url", "")
+            elif method == "Network.loadingFinished":
+                requests += 1
+                downloaded += params.get("encodedDataLength", 0)
+            elif method == "Network.loadingFailed" and params.get("blockedReason"):
+                blocked[self.category_of(urls.get(params.get("requestId"), ""))] += 1
+
+        with self._lock:
+            self.requests += requests
+            self.bytes_downloaded += int(downloaded)
+            for category, count in blocked.items():
+                self.blocked[category] += count
+
+    def estimated_bytes_saved(self):
+        return sum(ESTIMATED_BYTES.get(category, 0) * count for category, count in self.blocked.items())
+
+    def log_summary(self):
+        blocked_total = sum(self.blocked.values())
+        logging.info(
+            f"Lean profile: {blocked_total} requests blocked {dict(self.blocked)}, "
+            f"~{self.estimated_bytes_saved() / 1024 / 1024:.1f} MB saved; "
+            f"{self.requests} requests / {self.bytes_downloaded / 1024 / 1024:.1f} MB still downloaded."
+        )
@@ -0,0 +1,113 @@
+# ========== Import Required Libraries ==========
+import os  # For atomic writes
+import json  # The checkpoint is a small JSON file
+import logging  # For logging events (info, warnings, errors)
+from datetime import datetime  # When the run started
+
+from detail_cache import canonical_production_url
+
+DEFAULT_PATH = os.path.join("data", "checkpoint.json")
+
+
+# ========== Run Checkpoint ==========
+class Checkpoint:
+    """
+    Progress of the current scrape run, saved after every production.
+
+    Holds the discovered production URLs, the output file being written and,
+    per completed production, how many rows it wrote and where the output
+    ended. A resumed run cuts the output back to the last checkpoint and
+    only scrapes the productions that are not completed yet.
+    """
+
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = path
+        self.state = None
+
+    def load(self):
+        """The unfinished run's state if it can be resumed, else None."""
+        if not os.path.exists(self.path):
+            return None
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                state = json.load(f)
+        except Exception as e:
+            logging.warning(f"Could not read checkpoint {self.path}, starting over: {e}")
+            return None
+        if not os.path.exists(f"{state.get('output', '')}.part"):
+            logging.warning(f"Output of the checkpointed run is gone, starting over: {state.get('output')}")
+            return None
+        self.state = state
+        return state
+
+    def start(self, output, event_urls, offset, extra=None):
+        """extra: anything else a resumed run needs back (e.g. the SQLite snapshot id)."""
+        self.state = {
+            "started": datetime.now().isoformat(timespec="seconds"),
+            "output": output,
+            "event_urls": list(event_urls),
+            "offset": offset,  # End of the output after the last completed production
+            "rows": 0,
+            "completed": {},  # canonical URL -> rows written
+            "failed": [],  # Canonical URLs given up on; a resumed run does not retry them
+            "statuses": {},  # Production status counts so far
+            "seen": [],  # Fingerprint bookkeeping carried over to the resumed run
+            "changed": [],
+            **(extra or {}),
+        }
+        self.save()
+
+    # ---------- Progress ----------
+    def is_completed(self, event_url):
+        return self.state is not None and canonical_production_url(event_url) in self.state["completed"]
+
+    def is_failed(self, event_url):
+        return self.state is not None and canonical_production_url(event_url) in self.state.get("failed", [])
+
+    def remaining(self, event_links):
+        return [
+            link for link in event_links
+            if not self.is_completed(link["event_url"]) and not self.is_failed(link["event_url"])
+        ]
+
+    def complete(self, event_url, rows, offset, statuses, fingerprints=None):
+        """Records a production whose rows are flushed up to offset."""
+        self.state["completed"][canonical_production_url(event_url)] = rows
+        self.state["rows"] += rows
+        self.state["offset"] = offset
+        self.state["statuses"] = dict(statuses)
+        if fingerprints is not None:
+            self.state["seen"] = sorted(fingerprints.seen)
+            self.state["changed"] = sorted(fingerprints.changed)
+        self.save()
+
+    def fail(self, event_urls):
+        """Records productions given up on, so --resume moves past them."""
+        failed = self.state.setdefault("failed", [])
+        failed.extend(url for url in map(canonical_production_url, event_urls) if url not in failed)
+        self.save()
+
+    @property
+    def failed(self):
+        return list(self.state.get("failed", [])) if self.state is not None else []
+
+    def restore_fingerprints(self, fingerprints):
+        # Completed productions count as seen/changed for this run too
+        fingerprints.seen.update(self.state.get("seen", []))
+        fingerprints.changed.update(self.state.get("changed", []))
+
+    # ---------- Storage ----------
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.state, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+    def clear(self):
+        """The run finished: nothing left to resume."""
+        self.state = None
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
@@ -0,0 +1,213 @@
+# ========== Import Required Libraries ==========
+# Keep this list short: everything heavy (selenium, undetected_chromedriver,
+# lxml, requests, aiohttp, pandas, schedule...) is imported inside the
+# command that needs it, so "--help" and "--once" start instantly.
+import os  # For locating this file when measuring import time
+import re  # For parsing -X importtime output
+import sys  # For the exit code and interpreter path
+import argparse  # Command-line parsing
+import subprocess  # For running the import-time check in a fresh interpreter
+
+IMPORT_BUDGET_MS = 50  # Startup budget for "import cli"
+
+
+# ========== Commands ==========
+def cmd_scrape(args):
+    import test0  # Selenium, uc, lxml, requests: only now
+    test0.main(**scrape_options(args))
+
+
+def cmd_schedule(args):
+    import time
+    import schedule
+    import test0
+
+    run = lambda: test0.main(workers=args.workers, daemon=args.daemon)
+    if args.once:
+        run()
+        return
+    schedule.every(args.every_hours).hours.do(run)
+    print(f"Scheduler started. Scraper will run every {args.every_hours} hours.")
+    while True:
+        schedule.run_pending()
+        time.sleep(60)
+
+
+def cmd_async(args):
+    import asyncio
+    import logging
+    from datetime import datetime
+    import async_engine
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    urls = list(args.urls)
+    if args.urls_file:
+        with open(args.urls_file, encoding="utf-8") as f:
+            urls.extend(line.strip() for line in f if line.strip())
+    if not urls:
+        sys.exit("no production URLs given")
+
+    output = args.output or f"data/ovationtix_events_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+    scraper = async_engine.AsyncScraper(args.global_limit, args.per_host_limit, args.timeout)
+    asyncio.run(async_engine.scrape_to_csv(urls, output, scraper))
+
+
+def cmd_daemon(args):
+    import browser_daemon
+
+    address = (browser_daemon.DEFAULT_ADDRESS[0], args.port)
+    if args.status:
+        print(browser_daemon.status(address))
+        return
+    from test0 import setup_driver
+    from browser_profile import LeanProfile
+
+    lean_profile = LeanProfile()
+    browser_daemon.BrowserDaemon(lambda: setup_driver(lean_profile), address=address).serve_forever()
+
+
+def cmd_diff(args):
+    import snapshot_diff
+
+    snapshot_diff.main([args.old, args.new] + (["--output", args.output] if args.output else [])
+                       + (["--buckets", str(args.buckets)] if args.buckets else []))
+
+
+def cmd_whats_on(args):
+    import sqlite_store
+
+    sqlite_store.main(["--db", args.db, "closed" if args.closed else "whats-on"]
+                      + ([] if args.closed else ["--hours", str(args.hours)]))
+
+
+def cmd_status(args):
+    import live_status
+
+    live_status.main([args.file] + (["--at", args.at] if args.at else []) + (["--watch"] if args.watch else []))
+
+
+# ========== Import-Time Budget ==========
+def measure_import_ms(module="cli"):
+    """Cumulative import time of module in a fresh interpreter (-X importtime)."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__)),
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"importing {module} failed:\n{result.stderr}")
+
+    # "import time: self [us] | cumulative | imported package"; the module's
+    # own line carries the cumulative cost of everything it imported
+    for line in result.stderr.splitlines():
+        match = re.match(r"import time:\s+\d+ \|\s+(\d+) \| (\S+)$", line)
+        if match and match.group(2) == module:
+            return int(match.group(1)) / 1000
+    raise RuntimeError(f"no import time reported for {module}")
+
+
+def cmd_import_budget(args):
+    elapsed_ms = measure_import_ms(args.module)
+    verdict = "OK" if elapsed_ms <= args.budget_ms else "OVER BUDGET"
+    print(f"import {args.module}: {elapsed_ms:.1f} ms (budget {args.budget_ms} ms) {verdict}")
+    sys.exit(0 if elapsed_ms <= args.budget_ms else 1)
+
+
+# ========== Argument Parsing ==========
+def add_scrape_arguments(parser):
+    """
+    test0's options, shared by "cli.py scrape" and "python test0.py". Left
+    unset they are None and dropped by scrape_options, so test0.main's own
+    defaults apply and are not repeated here.
+    """
+    parser.add_argument("--workers", type=int, help="Parallel browser workers for detail pages")
+    parser.add_argument("--full", action="store_true", help="Ignore stored fingerprints and re-parse every page")
+    parser.add_argument("--daemon", action="store_true", help="Use the warm browser from browser_daemon.py")
+    parser.add_argument("--snapshot", dest="snapshot_formats", action="append", choices=("parquet", "csv.gz"),
+                        help="Also write normalized productions/performances tables (repeatable)")
+    parser.add_argument("--format", dest="output_format", choices=("csv", "ndjson"), help="Output file format")
+    parser.add_argument("--flush-every", type=int, help="Rows between flushes to disk")
+    parser.add_argument("--resume", action="store_true", help="Continue the last interrupted run from its checkpoint")
+    parser.add_argument("--mongo-uri", help="Also upsert every row into MongoDB (e.g. mongodb://localhost:27017)")
+    parser.add_argument("--sqlite", dest="sqlite_path", nargs="?", const=True,
+                        help="Also store every row in SQLite (default data/tnny.sqlite3)")
+    parser.add_argument("--venues", help='Comma-separated client ids, or "all" (default: every enabled venue)')
+    parser.add_argument("--venue-file", help="Venue registry (client id -> config)")
+    parser.add_argument("--per-host-limit", type=int, help="Pages in flight per host across all workers")
+    parser.add_argument("--budget-minutes", type=float, help="Stop scraping after this long; --resume continues")
+    parser.add_argument("--attempts", type=int, help="Tries per production page")
+
+
+def scrape_options(args):
+    """test0.main keyword arguments for the options given on the command line."""
+    options = {
+        name: getattr(args, name)
+        for name in ("workers", "full", "daemon", "snapshot_formats", "output_format", "flush_every", "resume",
+                     "mongo_uri", "sqlite_path", "venue_file", "per_host_limit", "budget_minutes", "attempts")
+    }
+    options["venue_ids"] = args.venues.split(",") if args.venues else None
+    return {name: value for name, value in options.items() if value is not None}
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="OvationTix scraper")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    scrape = commands.add_parser("scrape", help="Run one full scrape (test0 pipeline)")
+    add_scrape_arguments(scrape)
+    scrape.set_defaults(func=cmd_scrape)
+
+    sched = commands.add_parser("schedule", help="Scrape on a fixed interval")
+    sched.add_argument("--every-hours", type=int, default=6)
+    sched.add_argument("--once", action="store_true", help="Run scraper once and exit")
+    sched.add_argument("--workers", type=int, default=1)
+    sched.add_argument("--daemon", action="store_true")
+    sched.set_defaults(func=cmd_schedule)
+
+    async_cmd = commands.add_parser("async", help="Fetch production URLs concurrently over HTTP")
+    async_cmd.add_argument("urls", nargs="*", help="Production page URLs (any OvationTix client)")
+    async_cmd.add_argument("--urls-file", help="File with one production URL per line")
+    async_cmd.add_argument("--global-limit", type=int, default=20)
+    async_cmd.add_argument("--per-host-limit", type=int, default=4)
+    async_cmd.add_argument("--timeout", type=float, default=15)
+    async_cmd.add_argument("--output", help="CSV file to write")
+    async_cmd.set_defaults(func=cmd_async)
+
+    daemon = commands.add_parser("daemon", help="Run the long-lived browser daemon")
+    daemon.add_argument("--port", type=int, default=6010)
+    daemon.add_argument("--status", action="store_true", help="Print the running daemon's status and exit")
+    daemon.set_defaults(func=cmd_daemon)
+
+    diff = commands.add_parser("diff", help="Delta between two snapshot files")
+    diff.add_argument("old")
+    diff.add_argument("new")
+    diff.add_argument("--output")
+    diff.add_argument("--buckets", type=int)
+    diff.set_defaults(func=cmd_diff)
+
+    whats_on = commands.add_parser("whats-on", help="Query the SQLite store")
+    whats_on.add_argument("--db", default="data/tnny.sqlite3")
+    whats_on.add_argument("--hours", type=float, default=48, help="Performances in the next N hours")
+    whats_on.add_argument("--closed", action="store_true", help="Productions closed since the last snapshot instead")
+    whats_on.set_defaults(func=cmd_whats_on)
+
+    status = commands.add_parser("status", help="Live production status from a run's output file")
+    status.add_argument("file")
+    status.add_argument("--at", help='Timestamp to evaluate, e.g. "2025-06-05 19:00"')
+    status.add_argument("--watch", action="store_true", help="Print again at every status transition")
+    status.set_defaults(func=cmd_status)
+
+    budget = commands.add_parser("import-budget", help="Fail if startup imports exceed the budget")
+    budget.add_argument("--module", default="cli")
+    budget.add_argument("--budget-ms", type=float, default=IMPORT_BUDGET_MS)
+    budget.set_defaults(func=cmd_import_budget)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
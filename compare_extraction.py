@@ -0,0 +1,71 @@
+# ========== Import Required Libraries ==========
+import os  # For building the file:// URL of the saved page
+import sys  # For the exit code
+import time  # For timing each extraction mode
+import logging  # For logging events (info, warnings, errors)
+
+import page_parser
+from test0 import setup_driver, extract_event_details, extract_event_details_snapshot
+
+# Saved production page used as the reference snapshot
+SNAPSHOT_FILE = "web.html"
+
+
+def time_call(func, *args, repeat=5):
+    # Run the extraction a few times and keep the best timing
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return result, best
+
+
+def compare_extraction_modes(driver, repeat=5):
+    """Runs both extraction modes on the current page and compares them."""
+    webdriver_details, webdriver_time = time_call(extract_event_details, driver, repeat=repeat)
+    snapshot_details, snapshot_time = time_call(extract_event_details_snapshot, driver, repeat=repeat)
+
+    logging.info(f"Per-element WebDriver extraction: {webdriver_time * 1000:.1f} ms")
+    logging.info(f"Single-snapshot extraction:       {snapshot_time * 1000:.1f} ms")
+    if snapshot_time:
+        logging.info(f"Speed-up: {webdriver_time / snapshot_time:.1f}x")
+
+    if webdriver_details != snapshot_details:
+        for key in sorted(set(webdriver_details) | set(snapshot_details)):
+            if webdriver_details.get(key) != snapshot_details.get(key):
+                logging.error(
+                    f"Mismatch on '{key}': webdriver={webdriver_details.get(key)!r} "
+                    f"snapshot={snapshot_details.get(key)!r}"
+                )
+        return False
+
+    logging.info("Both extraction modes produced identical details.")
+    return True
+
+
+def main():
+    path = os.path.abspath(SNAPSHOT_FILE)
+    url = f"file://{path}"
+
+    # Offline timing of the parser alone (no browser)
+    with open(path, encoding="utf-8") as f:
+        page_html = f.read()
+    _, parse_time = time_call(page_parser.parse_event_details, page_html, url, repeat=20)
+    logging.info(f"lxml parse of {SNAPSHOT_FILE}: {parse_time * 1000:.2f} ms")
+
+    driver = setup_driver()
+    try:
+        driver.get(url)
+        ok = compare_extraction_modes(driver)
+    finally:
+        driver.quit()
+        del driver
+
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
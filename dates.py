@@ -0,0 +1,182 @@
+# ========== Import Required Libraries ==========
+import re  # Precompiled patterns for the OvationTix date/time shapes
+import time  # For the benchmark
+import logging  # For logging events (info, warnings, errors)
+from collections import Counter  # Parse failures per (kind, value)
+from datetime import date, datetime, time as time_of_day  # Parse results
+from functools import lru_cache  # The same dates repeat across productions
+
+# Every shape seen on OvationTix pages, for reference:
+#   "13 June 2025 - 7:00 PM"   records.py / test0 rows (DATE_TIME_FORMAT)
+#   "13 June 2025" + "7:00 pm" tnny's separate date and time-slot tokens
+#   "Fri, June 13, 2025"       test3's .ot_perfInfo text
+#   "day13 June 2025"          id attribute of the calendar <li> items
+DATE_TIME_FORMAT = "%d %B %Y - %I:%M %p"
+
+MONTHS = {
+    name: number
+    for number, names in enumerate([
+        ("january", "jan"), ("february", "feb"), ("march", "mar"), ("april", "apr"),
+        ("may",), ("june", "jun"), ("july", "jul"), ("august", "aug"),
+        ("september", "sep", "sept"), ("october", "oct"), ("november", "nov"), ("december", "dec"),
+    ], start=1)
+    for name in names
+}
+
+# "13 June 2025", "Fri, 13 June 2025", "Fri, June 13, 2025", "day13 June 2025"
+DATE_PATTERN = re.compile(
+    r"(?:day|[A-Za-z]{3,9},?\s+)?"
+    r"(?:(?P<day>\d{1,2})\s+(?P<month>[A-Za-z]{3,9})\.?"
+    r"|(?P<month_first>[A-Za-z]{3,9})\.?\s+(?P<day_second>\d{1,2})(?:st|nd|rd|th)?,?)"
+    r"\s+(?P<year>\d{4})"
+)
+# "7:00 PM", "7:00 pm", "7:00pm", "7:00 p.m."
+TIME_PATTERN = re.compile(r"(?P<hour>\d{1,2}):(?P<minute>\d{2})\s*(?P<meridiem>[AaPp])\.?[Mm]\.?")
+
+# The same shapes inside free text (test3's performance info)
+DATE_IN_TEXT = re.compile(r"\w{3},\s[\w\s]+\d{4}")
+TIME_IN_TEXT = re.compile(r"\d{1,2}:\d{2}\s[APMapm]{2}")
+
+# ========== Parse Failures ==========
+_failures = Counter()  # (kind, value, reason) -> occurrences
+
+
+def record_failure(kind, value, reason):
+    _failures[(kind, value, reason)] += 1
+    logging.debug(f"Could not parse {kind} {value!r}: {reason}")
+
+
+def failures():
+    """Every distinct failure as {kind, value, reason, count}, most frequent first."""
+    return [
+        {"kind": kind, "value": value, "reason": reason, "count": count}
+        for (kind, value, reason), count in _failures.most_common()
+    ]
+
+
+def log_summary():
+    if not _failures:
+        return
+    logging.warning(f"Date parsing: {sum(_failures.values())} failures over {len(_failures)} distinct values.")
+    for failure in failures()[:10]:
+        logging.warning(f"  {failure['kind']} {failure['value']!r} x{failure['count']}: {failure['reason']}")
+
+
+def reset():
+    _failures.clear()
+
+
+# ========== Cached Token Parsers ==========
+# Each returns (result, None) or (None, reason); results are cached, and
+# failures are counted by the public wrappers on every call.
+@lru_cache(maxsize=4096)
+def _parse_date_token(text):
+    match = DATE_PATTERN.fullmatch(text.strip())
+    if not match:
+        return None, "unrecognised date"
+    month_name = (match.group("month") or match.group("month_first")).lower()
+    month = MONTHS.get(month_name)
+    if month is None:
+        return None, f"unknown month {month_name!r}"
+    day = int(match.group("day") or match.group("day_second"))
+    try:
+        return date(int(match.group("year")), month, day), None
+    except ValueError as e:
+        return None, str(e)
+
+
+@lru_cache(maxsize=1024)
+def _parse_time_token(text):
+    match = TIME_PATTERN.fullmatch(text.strip())
+    if not match:
+        return None, "unrecognised time"
+    hour, minute = int(match.group("hour")), int(match.group("minute"))
+    if not 1 <= hour <= 12 or minute > 59:
+        return None, "hour or minute out of range"
+    hour = hour % 12 + (12 if match.group("meridiem") in "Pp" else 0)
+    return time_of_day(hour, minute), None
+
+
+# ========== Public Parsers ==========
+def parse_date(text):
+    """date for any known date shape, or None (failure recorded)."""
+    if not text:
+        record_failure("date", text, "empty")
+        return None
+    result, reason = _parse_date_token(text)
+    if reason:
+        record_failure("date", text, reason)
+    return result
+
+
+def parse_time(text):
+    """time of day for "7:00 PM"-style text, or None (failure recorded)."""
+    if not text:
+        record_failure("time", text, "empty")
+        return None
+    result, reason = _parse_time_token(text)
+    if reason:
+        record_failure("time", text, reason)
+    return result
+
+
+def parse_date_time(text):
+    """datetime for "13 June 2025 - 7:00 PM", or None (failure recorded)."""
+    if not text:
+        record_failure("date_time", text, "empty")
+        return None
+    date_text, separator, time_text = text.rpartition(" - ")
+    if not separator:
+        record_failure("date_time", text, "missing ' - ' between date and time")
+        return None
+    # Tokens are cached separately: a run has few distinct dates and times
+    parsed_date, date_reason = _parse_date_token(date_text)
+    parsed_time, time_reason = _parse_time_token(time_text)
+    if date_reason or time_reason:
+        record_failure("date_time", text, date_reason or time_reason)
+        return None
+    return datetime.combine(parsed_date, parsed_time)
+
+
+def cache_info():
+    return {"date": _parse_date_token.cache_info(), "time": _parse_time_token.cache_info()}
+
+
+# ========== Benchmark ==========
+def benchmark(values, runs=3):
+    """Best-of-runs seconds for the old strptime loop and for parse_date_time."""
+    def best(func):
+        timings = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - start)
+        return min(timings)
+
+    def strptime_loop():
+        for value in values:
+            try:
+                datetime.strptime(value, DATE_TIME_FORMAT)
+            except ValueError:
+                pass
+
+    def cached_loop():
+        for value in values:
+            parse_date_time(value)
+
+    return best(strptime_loop), best(cached_loop)
+
+
+if __name__ == "__main__":
+    import random
+    from datetime import timedelta
+
+    # A season of evening and matinee performances, repeated across productions
+    start = datetime(2025, 1, 1, 19, 30)
+    season = [start + timedelta(days=day, hours=hours) for day in range(180) for hours in (-5, 0)]
+    values = [random.choice(season).strftime(DATE_TIME_FORMAT) for _ in range(200_000)]
+
+    strptime_seconds, cached_seconds = benchmark(values)
+    print(f"strptime loop:     {strptime_seconds:.3f}s for {len(values)} values")
+    print(f"dates.parse_*:     {cached_seconds:.3f}s ({strptime_seconds / cached_seconds:.1f}x faster)")
+    print(f"cache: {cache_info()}")
@@ -0,0 +1,77 @@
+# ========== Import Required Libraries ==========
+import re  # For recognising production URLs
+import logging  # For logging events (info, warnings, errors)
+import threading  # The cache is shared by pool workers
+from urllib.parse import urlsplit, urlunsplit  # For normalising URLs
+
+PRODUCTION_PATH = re.compile(r"^/(\d+)/production/(\d+)")
+
+
+def canonical_production_url(url):
+    """Same production page -> same key (scheme, host case, query, slash)."""
+    if not url or url == "N/A":
+        return url
+    parts = urlsplit(url.strip())
+    match = PRODUCTION_PATH.match(parts.path)
+    if match:
+        path = f"/{match.group(1)}/production/{match.group(2)}"
+        return urlunsplit(("https", parts.netloc.lower(), path, "", ""))
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path.rstrip("/") or "/", parts.query, ""))
+
+
+# ========== Per-Run Cache of Extracted Details ==========
+class DetailCache:
+    """
+    Extracted details keyed by canonical production URL, shared by every
+    stage of a run so each page is fetched and parsed exactly once.
+    """
+
+    def __init__(self):
+        self._details = {}
+        self._key_locks = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __contains__(self, url):
+        return canonical_production_url(url) in self._details
+
+    def __len__(self):
+        return len(self._details)
+
+    def get(self, url):
+        return self._details.get(canonical_production_url(url))
+
+    def put(self, url, details):
+        if details:
+            self._details[canonical_production_url(url)] = details
+        return details
+
+    def _key_lock(self, key):
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def get_or_extract(self, url, extract):
+        """Returns cached details for url, calling extract() only on a miss."""
+        key = canonical_production_url(url)
+        # Per-key lock: two workers asking for the same page wait for one fetch
+        with self._key_lock(key):
+            details = self._details.get(key)
+            if details is not None:
+                with self._lock:
+                    self.hits += 1
+                logging.info(f"Detail cache hit: {key}")
+                return details
+
+            with self._lock:
+                self.misses += 1
+            details = extract()
+            if details:
+                self._details[key] = details
+            return details
+
+    def log_summary(self):
+        logging.info(
+            f"Detail cache: {len(self._details)} pages extracted, "
+            f"{self.hits} hits, {self.misses} misses."
+        )
@@ -0,0 +1,153 @@
+# ========== Import Required Libraries ==========
+import re  # For pulling the client id out of the current URL
+import logging  # For logging events (info, warnings, errors)
+from selenium.webdriver.common.by import By  # For locating elements
+
+import http_backend
+import waits
+from detail_cache import canonical_production_url
+
+LIST_ITEM_SELECTOR = ".ot_prodListItem.ot_callout"
+
+# Reads every production id from the calendar list in a single round trip.
+# For each list item it looks at link targets, data attributes and finally the
+# props React keeps on the DOM nodes (the router pushes /production/<id> from
+# the button's click handler, so the id is in the component props).
+HARVEST_SCRIPT = r"""
+const prodRe = /production\/(\d+)/;
+const idKeys = ['productionId', 'production_id', 'prodId'];
+
+function fromAttributes(root) {
+    const nodes = [root, ...root.querySelectorAll('*')];
+    for (const node of nodes) {
+        for (const attr of Array.from(node.attributes || [])) {
+            const m = prodRe.exec(attr.value);
+            if (m) return m[1];
+            if (/^data-.*prod.*id$/i.test(attr.name) && /^\d+$/.test(attr.value)) return attr.value;
+        }
+    }
+    return null;
+}
+
+function fromProps(props, depth) {
+    if (!props || typeof props !== 'object' || depth < 0) return null;
+    for (const key of idKeys) {
+        if (/^\d+$/.test(String(props[key] ?? ''))) return String(props[key]);
+    }
+    const prod = props.production || props.prod;
+    if (prod && typeof prod === 'object') {
+        const id = prod.productionId ?? prod.id;
+        if (/^\d+$/.test(String(id ?? ''))) return String(id);
+    }
+    for (const key of ['item', 'data', 'event', 'value']) {
+        const found = fromProps(props[key], depth - 1);
+        if (found) return found;
+    }
+    return null;
+}
+
+function fromReact(root) {
+    const nodes = [root.querySelector('button.ot_prodInfoButton'), root].filter(Boolean);
+    for (const node of nodes) {
+        for (const key of Object.keys(node)) {
+            if (key.startsWith('__reactProps$')) {
+                const found = fromProps(node[key], 2);
+                if (found) return found;
+            }
+            if (key.startsWith('__reactFiber$') || key.startsWith('__reactInternalInstance$')) {
+                let fiber = node[key];
+                for (let i = 0; fiber && i < 15; i++, fiber = fiber.return) {
+                    const found = fromProps(fiber.memoizedProps, 2);
+                    if (found) return found;
+                }
+            }
+        }
+    }
+    return null;
+}
+
+return Array.from(document.querySelectorAll(arguments[0])).map((item, index) => {
+    const heading = item.querySelector('h1, h2, h3');
+    return {
+        index: index,
+        title: heading ? heading.innerText.trim() : null,
+        production_id: fromAttributes(item) || fromReact(item),
+    };
+});
+"""
+
+
+def client_id_from_url(url):
+    match = re.search(r"ovationtix\.com/(\d+)", url or "")
+    return match.group(1) if match else None
+
+
+# ========== One-Pass Harvest ==========
+def harvest_productions(driver):
+    """Reads id/title for every calendar list item with one execute_script."""
+    try:
+        waits.wait_for_calendar_list(driver)
+        items = driver.execute_script(HARVEST_SCRIPT, LIST_ITEM_SELECTOR) or []
+    except Exception as e:
+        logging.error(f"Failed to harvest productions from calendar: {e}")
+        return []
+
+    client_id = client_id_from_url(driver.current_url)
+    for item in items:
+        production_id = item.get("production_id")
+        item["event_url"] = (
+            http_backend.production_url(client_id, production_id)
+            if client_id and production_id else None
+        )
+
+    resolved = sum(1 for item in items if item["event_url"])
+    logging.info(f"Harvested {resolved} of {len(items)} production URLs in one pass.")
+    return items
+
+
+# ========== Click Fallback for Unresolved Items ==========
+def click_through(driver, index, on_page=None):
+    # Old behaviour, kept for items the harvest could not resolve.
+    # on_page(driver) runs while the production page is open, so callers can
+    # extract its details now instead of loading the page again later.
+    events = driver.find_elements(By.CSS_SELECTOR, LIST_ITEM_SELECTOR)
+    if index >= len(events):
+        logging.warning(f"Event #{index + 1} no longer exists on reloaded page.")
+        return None
+
+    button = events[index].find_element(By.CSS_SELECTOR, "button.ot_prodInfoButton")
+    driver.execute_script(
+        "arguments[0].scrollIntoView({behavior: 'instant', block: 'center'});", button
+    )
+    calendar_url = driver.current_url
+    button.click()
+    logging.info(f"Clicked 'See this event' on event #{index + 1}")
+
+    waits.wait_for_url_change(driver, calendar_url)
+    event_url = canonical_production_url(driver.current_url)
+    if on_page is not None:
+        on_page(driver)
+
+    driver.back()
+    waits.wait_for_calendar_list(driver, timeout=10)
+    return event_url
+
+
+def discover_production_urls(driver, click_fallback=True, on_page=None):
+    """Returns every production URL on the calendar, in list order."""
+    items = harvest_productions(driver)
+    urls = []
+
+    for item in items:
+        event_url = item["event_url"]
+        if not event_url and click_fallback:
+            try:
+                event_url = click_through(driver, item["index"], on_page=on_page)
+            except Exception as e:
+                logging.error(f"Error processing event #{item['index'] + 1}: {e}")
+        if event_url:
+            urls.append(event_url)
+            logging.info(f"Captured event URL: {event_url}")
+
+    # Keep list order but drop duplicates
+    return list(dict.fromkeys(urls))
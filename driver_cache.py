@@ -0,0 +1,156 @@
+# ========== Import Required Libraries ==========
+import os  # For cache paths and file permissions
+import re  # For pulling the version out of "--version" output
+import sys  # For the platform check
+import json  # Small metadata file next to each cached binary
+import time  # For the startup benchmark
+import shutil  # For copying the patched binary into the cache
+import logging  # For logging events (info, warnings, errors)
+import subprocess  # For asking Chrome its version
+from contextlib import contextmanager  # For the file lock helper
+import undetected_chromedriver as uc  # For bypassing bot detection in Chrome
+from undetected_chromedriver.patcher import Patcher  # Downloads and patches chromedriver
+
+DEFAULT_DIRECTORY = os.path.join("cache", "chromedriver")
+EXE_NAME = "undetected_chromedriver.exe" if sys.platform.startswith("win") else "undetected_chromedriver"
+
+_resolved = {}  # Per-process memo: cache directory -> uc.Chrome kwargs
+
+
+# ========== Installed Chrome Version ==========
+def chrome_version():
+    """Full version of the installed Chrome (e.g. '125.0.6422.141'), or None."""
+    if sys.platform.startswith("win"):
+        commands = [["reg", "query", r"HKEY_CURRENT_USER\Software\Google\Chrome\BLBeacon", "/v", "version"]]
+    else:
+        commands = [[binary, "--version"] for binary in (uc.find_chrome_executable(), "google-chrome",
+                                                          "google-chrome-stable", "chromium", "chromium-browser") if binary]
+    for command in commands:
+        try:
+            output = subprocess.run(command, capture_output=True, text=True, timeout=10).stdout
+        except (OSError, subprocess.SubprocessError):
+            continue
+        match = re.search(r"(\d+\.\d+\.\d+\.\d+)", output)
+        if match:
+            return match.group(1)
+    return None
+
+
+# ========== Cross-Process File Lock ==========
+@contextmanager
+def file_lock(path):
+    # Only one process downloads/patches; the others wait and reuse its result
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "a+") as handle:
+        if sys.platform.startswith("win"):
+            import msvcrt
+            handle.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(handle.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    time.sleep(0.1)
+            try:
+                yield
+            finally:
+                handle.seek(0)
+                msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+
+# ========== Patched Driver Cache ==========
+def cached_driver_path(directory=DEFAULT_DIRECTORY, version=None):
+    """
+    Path to a patched chromedriver for the installed Chrome, patching it
+    once per Chrome version. Older versions are removed from the cache.
+    """
+    version = version or chrome_version()
+    if not version:
+        logging.warning("Could not detect the Chrome version; chromedriver will not be cached.")
+        return None
+
+    version_dir = os.path.join(directory, version)
+    driver_path = os.path.join(version_dir, EXE_NAME)
+
+    with file_lock(os.path.join(directory, ".lock")):
+        patcher = Patcher(executable_path=driver_path, version_main=int(version.split(".")[0]))
+        if os.path.exists(driver_path) and patcher.is_binary_patched(driver_path):
+            return driver_path
+
+        logging.info(f"Patching chromedriver for Chrome {version} (one-time)...")
+        start = time.perf_counter()
+        # Let undetected_chromedriver download and patch into its own folder,
+        # then keep a copy that no later launch will touch
+        fresh = Patcher(version_main=int(version.split(".")[0]))
+        fresh.auto()
+        os.makedirs(version_dir, exist_ok=True)
+        tmp_path = f"{driver_path}.tmp"
+        shutil.copy2(fresh.executable_path, tmp_path)
+        os.chmod(tmp_path, 0o755)
+        os.replace(tmp_path, driver_path)
+        with open(os.path.join(version_dir, "version.json"), "w", encoding="utf-8") as f:
+            json.dump({"chrome_version": version, "patched_at": time.time()}, f)
+        logging.info(f"Cached patched chromedriver in {time.perf_counter() - start:.1f}s: {driver_path}")
+
+        # Chrome was upgraded: drivers for other versions are now useless
+        for name in os.listdir(directory):
+            stale_dir = os.path.join(directory, name)
+            if name != version and os.path.isdir(stale_dir):
+                shutil.rmtree(stale_dir, ignore_errors=True)
+                logging.info(f"Removed cached chromedriver for Chrome {name}")
+
+    return driver_path
+
+
+def chrome_kwargs(directory=DEFAULT_DIRECTORY):
+    """Extra uc.Chrome() arguments that reuse the cached driver ({} on failure)."""
+    if directory not in _resolved:
+        try:
+            version = chrome_version()
+            driver_path = cached_driver_path(directory, version)
+            _resolved[directory] = (
+                {"driver_executable_path": os.path.abspath(driver_path), "version_main": int(version.split(".")[0])}
+                if driver_path else {}
+            )
+        except Exception as e:
+            logging.warning(f"chromedriver cache unavailable, letting undetected_chromedriver patch: {e}")
+            _resolved[directory] = {}
+    return dict(_resolved[directory])
+
+
+# ========== Startup Benchmark ==========
+def _launch_seconds(kwargs):
+    options = uc.ChromeOptions()
+    options.add_argument("--headless=new")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    start = time.perf_counter()
+    driver = uc.Chrome(options=options, **kwargs)
+    elapsed = time.perf_counter() - start
+    driver.quit()
+    return elapsed
+
+
+def benchmark_startup(runs=3, directory=DEFAULT_DIRECTORY):
+    """Average uc.Chrome launch time with and without the cached driver."""
+    cached_kwargs = chrome_kwargs(directory)
+    if not cached_kwargs:
+        raise RuntimeError("chromedriver cache unavailable; nothing to compare")
+
+    uncached = [_launch_seconds({}) for _ in range(runs)]
+    cached = [_launch_seconds(cached_kwargs) for _ in range(runs)]
+    return sum(uncached) / runs, sum(cached) / runs
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    uncached_avg, cached_avg = benchmark_startup()
+    print(f"uc.Chrome startup, default patching: {uncached_avg:.2f}s")
+    print(f"uc.Chrome startup, cached driver:    {cached_avg:.2f}s")
@@ -0,0 +1,125 @@
+# ========== Import Required Libraries ==========
+import queue  # Shared work queue for the workers
+import logging  # For logging events (info, warnings, errors)
+import threading  # One thread per browser worker
+
+
+def driver_is_alive(driver):
+    # Any cheap command fails once chromedriver or Chrome has died
+    try:
+        driver.current_url
+        return True
+    except Exception:
+        return False
+
+
+# ========== Pool of Browser Workers ==========
+class DriverPool:
+    """
+    Bounded pool of WebDriver workers fed from a shared queue.
+
+    Each worker owns one browser for its whole life. A failing item only
+    affects its own result; a crashed browser is quit and replaced before
+    the item is retried once.
+    """
+
+    def __init__(self, size, factory, is_alive=driver_is_alive):
+        self.size = max(1, int(size))
+        self.factory = factory
+        self.is_alive = is_alive
+        self._drivers = [None] * self.size
+        self._launch_lock = threading.Lock()  # Serialize browser start-up
+        self.restarts = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    # ---------- Driver lifecycle ----------
+    def _get_driver(self, slot):
+        if self._drivers[slot] is None:
+            with self._launch_lock:
+                logging.info(f"Starting browser for worker {slot + 1}/{self.size}")
+                self._drivers[slot] = self.factory()
+        return self._drivers[slot]
+
+    def _discard_driver(self, slot):
+        driver = self._drivers[slot]
+        self._drivers[slot] = None
+        if driver is not None:
+            try:
+                driver.quit()
+            except Exception as e:
+                logging.warning(f"Error quitting browser for worker {slot + 1}: {e}")
+
+    def close(self):
+        for slot in range(self.size):
+            self._discard_driver(slot)
+
+    # ---------- Work distribution ----------
+    def _worker(self, slot, tasks, done, func):
+        while True:
+            try:
+                index, item = tasks.get_nowait()
+            except queue.Empty:
+                return
+
+            result = None
+            for attempt in range(2):
+                try:
+                    driver = self._get_driver(slot)
+                    result = func(driver, item)
+                    break
+                except Exception as e:
+                    logging.error(f"Worker {slot + 1} failed on item #{index + 1}: {e}")
+                    driver = self._drivers[slot]
+                    if driver is not None and self.is_alive(driver):
+                        break  # Page-level failure, the browser is fine
+
+                    logging.warning(f"Browser for worker {slot + 1} is gone, replacing it.")
+                    self._discard_driver(slot)
+                    self.restarts += 1
+            done.put((index, result))
+
+    def imap(self, func, items):
+        """
+        Runs func(driver, item) for every item and yields the results in
+        input order as soon as each one (and everything before it) is done.
+        """
+        items = list(items)
+        tasks = queue.Queue()
+        done = queue.Queue()
+        for index, item in enumerate(items):
+            tasks.put((index, item))
+
+        workers = [
+            threading.Thread(target=self._worker, args=(slot, tasks, done, func), daemon=True)
+            for slot in range(min(self.size, len(items)))
+        ]
+        for worker in workers:
+            worker.start()
+
+        # Only results that finished ahead of a slower earlier item are held
+        pending = {}
+        try:
+            for next_index in range(len(items)):
+                while next_index not in pending:
+                    index, result = done.get()
+                    pending[index] = result
+                yield pending.pop(next_index)
+        finally:
+            # Consumer stopped early: workers finish their current item only
+            while not tasks.empty():
+                try:
+                    tasks.get_nowait()
+                except queue.Empty:
+                    break
+            for worker in workers:
+                worker.join()
+        logging.info(f"Pool processed {len(items)} items with {len(workers)} workers ({self.restarts} browser restarts).")
+
+    def map(self, func, items):
+        """Runs func(driver, item) for every item; results keep input order."""
+        return list(self.imap(func, items))
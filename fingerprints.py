@@ -0,0 +1,124 @@
+# ========== Import Required Libraries ==========
+import os  # For atomic file replacement
+import json  # The store is a small JSON file
+import hashlib  # Content hashes
+import logging  # For logging events (info, warnings, errors)
+import threading  # The store is shared by pool workers
+from datetime import datetime  # When each entry last changed
+from lxml import etree, html as lxml_html  # For normalising page markup
+
+from detail_cache import canonical_production_url
+
+DEFAULT_PATH = "data/fingerprints.json"
+
+# Markup that changes between requests without the production changing
+VOLATILE_TAGS = ("script", "style", "noscript", "link", "meta")
+VOLATILE_ATTRIBUTES = ("style", "nonce", "integrity", "data-reactroot")
+
+
+# ========== Hashing ==========
+def normalize_page(page_html):
+    """Page markup with scripts, inline styles, comments and whitespace removed."""
+    try:
+        tree = lxml_html.fromstring(page_html)
+    except Exception:
+        return " ".join((page_html or "").split())
+
+    etree.strip_elements(tree, *VOLATILE_TAGS, etree.Comment, with_tail=False)
+    for element in tree.iter():
+        for attribute in VOLATILE_ATTRIBUTES:
+            element.attrib.pop(attribute, None)
+    return " ".join(etree.tostring(tree, encoding="unicode").split())
+
+
+def fingerprint_page(page_html):
+    return hashlib.sha256(normalize_page(page_html).encode("utf-8")).hexdigest()
+
+
+def fingerprint_record(record):
+    payload = json.dumps(record, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+# ========== Persistent Fingerprint Store ==========
+class FingerprintStore:
+    """
+    Page and record hashes per production URL, kept between runs.
+
+    unchanged() hands back the previous record when the page hash matches, so
+    the caller can skip parsing; update() tells whether the record changed.
+    """
+
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self.entries = self._load()
+        self.reused = 0
+        self.changed = set()  # URLs whose record changed this run
+        self.seen = set()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f)
+        except Exception as e:
+            logging.warning(f"Could not read fingerprint store {self.path}, starting fresh: {e}")
+            return {}
+
+    @staticmethod
+    def fingerprint(page_html):
+        return fingerprint_page(page_html)
+
+    def unchanged(self, url, page_hash):
+        """Previous record for url if its page hash is the same, else None."""
+        key = canonical_production_url(url)
+        with self._lock:
+            self.seen.add(key)
+            entry = self.entries.get(key)
+            if entry and entry.get("page") == page_hash and "record" in entry:
+                self.reused += 1
+                return entry["record"]
+        return None
+
+    def update(self, url, page_hash, record):
+        """Stores the new hashes and record; True when the record changed."""
+        key = canonical_production_url(url)
+        record_hash = fingerprint_record(record)
+        with self._lock:
+            self.seen.add(key)
+            entry = self.entries.get(key, {})
+            record_changed = entry.get("record_hash") != record_hash
+            self.entries[key] = {
+                "page": page_hash,
+                "record_hash": record_hash,
+                "record": record,
+                "updated": entry.get("updated") if not record_changed else datetime.now().isoformat(timespec="seconds"),
+            }
+            if record_changed:
+                self.changed.add(key)
+        return record_changed
+
+    @property
+    def has_changes(self):
+        # A production that disappeared from the site is a change too
+        removed = set(self.entries) - self.seen
+        return bool(self.changed or (self.seen and removed))
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with self._lock:
+            # Forget productions that are no longer on the site
+            if self.seen:
+                self.entries = {key: value for key, value in self.entries.items() if key in self.seen}
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.entries, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)  # Never leave a half-written store
+
+    def log_summary(self):
+        logging.info(
+            f"Fingerprints: {len(self.seen)} pages checked, {self.reused} unchanged (reused), "
+            f"{len(self.changed)} changed records."
+        )
@@ -0,0 +1,142 @@
+# ========== Import Required Libraries ==========
+import logging  # For logging events (info, warnings, errors)
+import requests  # For plain HTTP fetching (no browser)
+from requests.adapters import HTTPAdapter  # Connection pooling per host
+from urllib3.util.retry import Retry  # Automatic retries on transient errors
+
+import page_parser
+import rate_limiter
+import retry
+import waits
+
+BASE_URL = "https://ci.ovationtix.com"
+
+# Same user-agent as the Selenium drivers so the site serves identical markup
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/114.0.0.0 Safari/537.36"
+)
+
+_session = None  # Shared pooled session, created on first use
+
+
+def production_url(client_id, production_id):
+    """Builds the detail page URL for a production."""
+    return f"{BASE_URL}/{client_id}/production/{production_id}"
+
+
+# ========== Set Up Pooled Session ==========
+def create_session(pool_size=10, retries=2):
+    session = requests.Session()
+    session.headers.update({
+        "User-Agent": USER_AGENT,
+        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+        "Accept-Language": "en-US,en;q=0.9",
+    })
+
+    # Keep connections alive and retry only on connection errors. 429/5xx
+    # come back as they are: rate_limiter backs off on them and retry.py
+    # re-queues the page, each request paced through the limiter.
+    retry = Retry(
+        total=retries,
+        status=0,
+        backoff_factor=0.5,
+        allowed_methods=("GET", "HEAD"),
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_session():
+    global _session
+    if _session is None:
+        _session = create_session()
+    return _session
+
+
+# ========== Fetch a Page Over HTTP ==========
+def fetch_page(url, session=None, timeout=15, cache=None):
+    session = session or get_session()
+    try:
+        if cache is not None:
+            # On-disk cache: fresh copies skip the network, stale ones revalidate
+            response = cache.get(session, url, timeout=timeout)
+            logging.info(f"Fetched {url} ({len(response.content)} bytes, cache {response.source})")
+        else:
+            response = rate_limiter.http_get(session, url, timeout=timeout)
+            response.raise_for_status()
+            logging.info(f"Fetched {url} ({len(response.content)} bytes)")
+        return response.text
+    except Exception as e:
+        logging.error(f"Error fetching {url}: {e}")
+        return None
+
+
+# ========== Extract Details Without a Browser ==========
+def fetch_event_details(event_url, session=None, driver=None, fallback=None, timeout=15,
+                        fingerprints=None, cache=None, render_timeout=10):
+    """
+    Fetches a production page over HTTP and parses it with lxml.
+    Falls back to Selenium only when the HTML has no rendered calendar.
+    With a FingerprintStore, an unchanged page reuses its previous record;
+    with an HttpCache, the page itself may come from disk.
+
+    The browser fallback waits for the calendar once, for at most
+    render_timeout seconds. fallback(driver) is only called when there is
+    no fingerprint to take; otherwise the DOM that was fingerprinted is
+    parsed directly.
+    """
+    page_html = fetch_page(event_url, session=session, timeout=timeout, cache=cache)
+    if page_html:
+        page_hash = None
+        if fingerprints is not None:
+            page_hash = fingerprints.fingerprint(page_html)
+            previous = fingerprints.unchanged(event_url, page_hash)
+            if previous is not None:
+                logging.info(f"Page unchanged since last run, reusing record: {event_url}")
+                return previous
+
+        tree = page_parser.parse_html(page_html)
+        if page_parser.has_rendered_calendar(tree):
+            details = page_parser.parse_event_details(page_html, event_url, tree=tree)
+            if fingerprints is not None:
+                fingerprints.update(event_url, page_hash, details)
+            return details
+        logging.info(f"No rendered calendar in HTML for {event_url}, falling back to browser.")
+
+    if driver is None:
+        logging.warning(f"No driver available for browser fallback on {event_url}")
+        return None
+
+    try:
+        rate_limiter.browser_get(driver, event_url)
+    except Exception as e:
+        logging.error(f"Error loading {event_url} in browser: {e}")
+        return None
+
+    if fingerprints is None:
+        if fallback is not None:
+            return fallback(driver)
+        waits.wait_for_event_list(driver, timeout=render_timeout)
+        return page_parser.parse_event_details(driver.page_source, driver.current_url)
+
+    # Pages that need the browser are fingerprinted on the rendered DOM, both
+    # when stored and when compared; the raw HTML above is only the app shell.
+    # The DOM that was hashed is also the one parsed, after a single wait.
+    event_list = waits.wait_for_event_list(driver, timeout=render_timeout)
+    if event_list["status"] in ("timeout", "error"):
+        raise retry.PageFailed(f"Event list did not render ({event_list['status']})", kind="render")
+    rendered_html = driver.page_source
+    rendered_hash = fingerprints.fingerprint(rendered_html)
+    previous = fingerprints.unchanged(event_url, rendered_hash)
+    if previous is not None:
+        logging.info(f"Rendered page unchanged since last run, reusing record: {event_url}")
+        return previous
+
+    details = page_parser.parse_event_details(rendered_html, driver.current_url)
+    if details:
+        fingerprints.update(event_url, rendered_hash, details)
+    return details
@@ -0,0 +1,197 @@
+# ========== Import Required Libraries ==========
+import os  # For the cache directory and atomic writes
+import re  # For per-URL-pattern TTLs
+import json  # The index is a small JSON file
+import time  # For entry ages and LRU order
+import hashlib  # Cache file names
+import logging  # For logging events (info, warnings, errors)
+import threading  # The cache is shared by pool workers
+
+import rate_limiter  # Requests that do go out are paced per host
+
+DEFAULT_DIRECTORY = os.path.join("cache", "http")
+DEFAULT_MAX_BYTES = 200 * 1024 * 1024  # 200 MB
+
+# Seconds a stored response is served without asking the server again.
+# First match wins; anything else is always revalidated. Only production
+# pages are fetched over HTTP (the calendar is read in the browser, images
+# are never downloaded), so that is the only pattern.
+DEFAULT_TTLS = [
+    (r"ovationtix\.com/\d+/production/\d+", 3600),  # Production pages
+]
+
+
+# ========== Response Returned From the Cache ==========
+class CachedResponse:
+    def __init__(self, url, status_code, content, headers, encoding, source):
+        self.url = url
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers
+        self.encoding = encoding or "utf-8"
+        self.source = source  # "hit", "revalidated", "miss" or "stale"
+
+    @property
+    def text(self):
+        return self.content.decode(self.encoding, errors="replace")
+
+
+# ========== On-Disk Cache ==========
+class HttpCache:
+    """
+    Response bodies on disk with ETag/Last-Modified validators.
+
+    Fresh entries (younger than their pattern's TTL) are served without a
+    request; stale ones are revalidated with If-None-Match/If-Modified-Since.
+    Least recently used entries are evicted once max_bytes is exceeded.
+    """
+
+    def __init__(self, directory=DEFAULT_DIRECTORY, max_bytes=DEFAULT_MAX_BYTES, ttls=None):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.ttls = [(re.compile(pattern), seconds) for pattern, seconds in (ttls or DEFAULT_TTLS)]
+        self.index_path = os.path.join(directory, "index.json")
+        self._lock = threading.Lock()
+        self.stats = {"hit": 0, "revalidated": 0, "miss": 0, "stale": 0, "evicted": 0, "bytes_saved": 0}
+
+        os.makedirs(directory, exist_ok=True)
+        self.index = self._load_index()
+
+    # ---------- Index ----------
+    def _load_index(self):
+        if not os.path.exists(self.index_path):
+            return {}
+        try:
+            with open(self.index_path, encoding="utf-8") as f:
+                return json.load(f)
+        except Exception as e:
+            logging.warning(f"Could not read HTTP cache index, starting empty: {e}")
+            return {}
+
+    def save(self):
+        tmp_path = f"{self.index_path}.tmp"
+        with self._lock:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.index, f)
+        os.replace(tmp_path, self.index_path)
+
+    def _key(self, url):
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    def _body_path(self, key):
+        return os.path.join(self.directory, f"{key}.body")
+
+    def ttl_for(self, url):
+        for pattern, seconds in self.ttls:
+            if pattern.search(url):
+                return seconds
+        return 0
+
+    # ---------- Storage ----------
+    def _read(self, key):
+        try:
+            with open(self._body_path(key), "rb") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def _store(self, key, url, response):
+        content = response.content
+        tmp_path = f"{self._body_path(key)}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(content)
+        os.replace(tmp_path, self._body_path(key))
+
+        now = time.time()
+        with self._lock:
+            self.index[key] = {
+                "url": url,
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+                "content_type": response.headers.get("Content-Type"),
+                "encoding": response.encoding,
+                "size": len(content),
+                "stored_at": now,
+                "last_access": now,
+            }
+        self._evict()
+
+    def _evict(self):
+        with self._lock:
+            total = sum(entry["size"] for entry in self.index.values())
+            if total <= self.max_bytes:
+                return
+            # Oldest access first
+            for key, entry in sorted(self.index.items(), key=lambda item: item[1]["last_access"]):
+                if total <= self.max_bytes:
+                    break
+                total -= entry["size"]
+                del self.index[key]
+                try:
+                    os.remove(self._body_path(key))
+                except OSError:
+                    pass
+                self.stats["evicted"] += 1
+
+    def _from_entry(self, key, entry, content, source):
+        with self._lock:
+            if key in self.index:
+                self.index[key]["last_access"] = time.time()
+            self.stats[source] += 1
+            if source in ("hit", "revalidated", "stale"):
+                self.stats["bytes_saved"] += entry["size"]
+        headers = {"Content-Type": entry.get("content_type")}
+        return CachedResponse(entry["url"], 200, content, headers, entry.get("encoding"), source)
+
+    # ---------- Fetch ----------
+    def get(self, session, url, timeout=15):
+        """GET through the cache; raises like session.get when nothing is cached."""
+        key = self._key(url)
+        with self._lock:
+            entry = dict(self.index[key]) if key in self.index else None
+        content = self._read(key) if entry else None
+        if entry and content is None:
+            entry = None  # Body file went missing
+
+        # Fresh enough: no request at all
+        if entry and time.time() - entry["stored_at"] < self.ttl_for(url):
+            return self._from_entry(key, entry, content, "hit")
+
+        headers = {}
+        if entry and entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry and entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+
+        try:
+            response = rate_limiter.http_get(session, url, headers=headers, timeout=timeout)
+        except Exception as e:
+            if entry:
+                logging.warning(f"Serving stale cached copy of {url} after error: {e}")
+                return self._from_entry(key, entry, content, "stale")
+            raise
+
+        if response.status_code == 304 and entry:
+            with self._lock:
+                if key in self.index:
+                    self.index[key]["stored_at"] = time.time()
+            return self._from_entry(key, entry, content, "revalidated")
+
+        if response.status_code >= 500 and entry:
+            logging.warning(f"Serving stale cached copy of {url} after HTTP {response.status_code}")
+            return self._from_entry(key, entry, content, "stale")
+
+        response.raise_for_status()
+        with self._lock:
+            self.stats["miss"] += 1
+        self._store(key, url, response)
+        return CachedResponse(url, response.status_code, response.content, response.headers, response.encoding, "miss")
+
+    def log_summary(self):
+        stats = self.stats
+        requests_made = stats["revalidated"] + stats["miss"]
+        logging.info(
+            f"HTTP cache: {stats['hit']} hits, {stats['revalidated']} revalidated (304), "
+            f"{stats['miss']} misses, {stats['stale']} stale, {stats['evicted']} evicted; "
+            f"{requests_made} requests sent, {stats['bytes_saved'] / 1024:.1f} KB not downloaded."
+        )
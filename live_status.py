@@ -0,0 +1,141 @@
+# ========== Import Required Libraries ==========
+import time  # For the watch loop
+import logging  # For logging events (info, warnings, errors)
+from bisect import bisect_left, bisect_right  # O(log n) lookups in sorted times
+from collections import defaultdict  # Per-production time lists
+from datetime import datetime, timedelta  # Query timestamps
+
+import dates  # Parsing date_time strings
+
+DEFAULT_BUFFER = timedelta(minutes=5)  # Same window as records.performance_status
+ONE_SECOND = timedelta(seconds=1)
+
+
+def performance_status(starts_at, at=None, buffer=DEFAULT_BUFFER):
+    """Status of one performance at `at` (default: now)."""
+    at = at or datetime.now()
+    if starts_at is None:
+        return "N/A"
+    if abs(starts_at - at) <= buffer:
+        return "active"
+    return "upcoming" if starts_at > at else "closed"
+
+
+# ========== Interval Index ==========
+class StatusIndex:
+    """
+    Sorted performance start times per production, so status is worked out
+    for whatever time it is asked about instead of being frozen at scrape
+    time.
+
+    A performance is active within buffer of its start, upcoming before
+    that and closed after. A production follows tnny's rule: active if any
+    performance is active or it has both past and future performances.
+    Every lookup is a bisect, O(log n).
+    """
+
+    def __init__(self, buffer=DEFAULT_BUFFER):
+        self.buffer = buffer
+        self.times = {}  # event_url -> sorted start datetimes
+        self.transitions = []  # Sorted instants at which some status changes
+
+    @classmethod
+    def from_rows(cls, rows, buffer=DEFAULT_BUFFER):
+        """Rows with event_url and date_time (records.FIELDNAMES, CSV, NDJSON...)."""
+        grouped = defaultdict(set)
+        for row in rows:
+            starts_at = dates.parse_date_time(row.get("date_time"))
+            if starts_at is not None:
+                grouped[row.get("event_url")].add(starts_at)
+            else:
+                grouped[row.get("event_url")]  # Known production, no usable date
+
+        index = cls(buffer)
+        index.times = {event_url: sorted(times) for event_url, times in grouped.items()}
+        # Active from start - buffer; closed from the first second after start + buffer
+        index.transitions = sorted({
+            instant
+            for times in index.times.values()
+            for starts_at in times
+            for instant in (starts_at - buffer, starts_at + buffer + ONE_SECOND)
+        })
+        return index
+
+    @classmethod
+    def from_file(cls, path, buffer=DEFAULT_BUFFER):
+        from snapshot_diff import iter_rows  # Streams .csv and .ndjson alike
+        return cls.from_rows(iter_rows(path), buffer)
+
+    def __len__(self):
+        return len(self.times)
+
+    # ---------- Status ----------
+    def performance_status(self, starts_at, at=None):
+        return performance_status(starts_at, at, self.buffer)
+
+    def production_status(self, event_url, at=None):
+        at = at or datetime.now()
+        times = self.times.get(event_url)
+        if not times:
+            return "N/A"
+        first_not_past = bisect_left(times, at - self.buffer)  # times before this are closed
+        first_future = bisect_right(times, at + self.buffer)  # times from this on are upcoming
+        has_active = first_not_past < first_future
+        has_past = first_not_past > 0
+        has_future = first_future < len(times)
+        if has_active or (has_past and has_future):
+            return "active"
+        return "upcoming" if has_future else "closed"
+
+    def statuses(self, at=None):
+        at = at or datetime.now()
+        return {event_url: self.production_status(event_url, at) for event_url in self.times}
+
+    def rows_with_status(self, rows, at=None):
+        """Yields rows with "status" recomputed for `at` (default: now)."""
+        at = at or datetime.now()
+        for row in rows:
+            yield {**row, "status": self.performance_status(dates.parse_date_time(row.get("date_time")), at)}
+
+    # ---------- Transitions ----------
+    def next_transition(self, at=None, event_url=None):
+        """First instant after `at` at which a status changes (None if never)."""
+        at = at or datetime.now()
+        if event_url is None:
+            transitions = self.transitions
+        else:
+            transitions = sorted(
+                instant for starts_at in self.times.get(event_url, [])
+                for instant in (starts_at - self.buffer, starts_at + self.buffer + ONE_SECOND)
+            )
+        position = bisect_right(transitions, at)
+        return transitions[position] if position < len(transitions) else None
+
+
+# ========== Main Script ==========
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Live production status from a finished run's output")
+    parser.add_argument("file", help="data/ovationtix_events_*.csv or .ndjson")
+    parser.add_argument("--at", help='Timestamp to evaluate, e.g. "2025-06-05 19:00" (default: now)')
+    parser.add_argument("--watch", action="store_true", help="Print again at every status transition")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    index = StatusIndex.from_file(args.file)
+    at = datetime.fromisoformat(args.at) if args.at else None
+
+    while True:
+        now = at or datetime.now()
+        for event_url, status in sorted(index.statuses(now).items()):
+            print(f"{status:<9} {event_url}")
+        upcoming = index.next_transition(now)
+        print(f"Next status change: {upcoming or 'none'}")
+        if not args.watch or upcoming is None or at:
+            return
+        # Sleep exactly until something changes instead of polling
+        time.sleep(max(0.0, (upcoming - datetime.now()).total_seconds()))
+
+
+if __name__ == "__main__":
+    main()
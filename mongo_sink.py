@@ -0,0 +1,225 @@
+# ========== Import Required Libraries ==========
+import os  # For the connection string override
+import time  # For retry backoff and the benchmark
+import logging  # For logging events (info, warnings, errors)
+from datetime import datetime, timezone  # first_seen / last_seen stamps
+from pymongo import ASCENDING, MongoClient, UpdateOne  # Bulk upserts
+from pymongo.errors import AutoReconnect, BulkWriteError, NetworkTimeout  # Retryable failures
+
+import dates  # starts_at as a real datetime, for range queries
+from records import PRODUCTION_FIELDS  # Stored once per production
+
+DEFAULT_URI = os.environ.get("MONGO_URI", "mongodb://localhost:27017")
+DEFAULT_DATABASE = "tnny"
+BATCH_SIZE = 1000  # Operations per bulk_write round trip
+RETRIES = 3  # Extra attempts for a batch after a network error
+
+
+# ========== Bulk-Upsert Sink ==========
+class MongoSink:
+    """
+    Upserts records.FIELDNAMES rows into MongoDB in bulk_write batches.
+
+    performances holds one document per (event_url, date_time), productions
+    one per event_url; both have unique indexes so re-running a scrape
+    updates documents in place. Writes are unordered, so one bad document
+    does not stop the rest of its batch, and a batch is retried as a whole
+    after a network error (upserts are idempotent).
+
+    Has the same write/write_many/flush/close methods as writers.py, so it
+    can sit next to the CSV writer. Pass client=mongomock.MongoClient() to
+    run without a server.
+    """
+
+    def __init__(self, uri=DEFAULT_URI, database=DEFAULT_DATABASE, batch_size=BATCH_SIZE, client=None):
+        self.client = client or MongoClient(uri, retryWrites=True, serverSelectionTimeoutMS=5000)
+        self.db = self.client[database]
+        self.performances = self.db["performances"]
+        self.productions = self.db["productions"]
+        self.batch_size = batch_size
+        self._performance_ops = []
+        self._production_docs = {}  # event_url -> fields, deduplicated per batch
+        self.count = 0
+        self.stats = {"batches": 0, "upserted": 0, "modified": 0, "errors": 0, "retries": 0}
+        self.ensure_indexes()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def ensure_indexes(self):
+        self.performances.create_index(
+            [("event_url", ASCENDING), ("date_time", ASCENDING)], unique=True, name="event_url_date_time"
+        )
+        self.performances.create_index([("starts_at", ASCENDING)], name="starts_at")
+        self.productions.create_index([("event_url", ASCENDING)], unique=True, name="event_url")
+
+    # ---------- Writing ----------
+    def write(self, row):
+        now = datetime.now(timezone.utc)
+        event_url = row.get("event_url")
+        self._performance_ops.append(UpdateOne(
+            {"event_url": event_url, "date_time": row.get("date_time")},
+            {
+                "$set": {
+                    "status": row.get("status"),
+                    "starts_at": dates.parse_date_time(row.get("date_time")),
+                    "last_seen": now,
+                },
+                "$setOnInsert": {"first_seen": now},
+            },
+            upsert=True,
+        ))
+        self._add_production(row)
+        self.count += 1
+        if len(self._performance_ops) >= self.batch_size:
+            self.flush()
+
+    def write_many(self, rows):
+        for row in rows:
+            self.write(row)
+
+    def upsert_productions(self, productions):
+        """Production-level documents only (e.g. test2's calendar links)."""
+        for production in productions:
+            self._add_production(production)
+        self.flush()
+
+    def _add_production(self, row):
+        # Only the fields this row has: test2 knows a few calendar-link fields
+        # and must not overwrite what test0 stored for the rest
+        fields = self._production_docs.setdefault(row["event_url"], {})
+        fields.update((field, row[field]) for field in PRODUCTION_FIELDS if field in row)
+
+    def flush(self):
+        now = datetime.now(timezone.utc)
+        production_ops = [
+            UpdateOne(
+                {"event_url": event_url},
+                {
+                    "$set": {**fields, "last_seen": now},
+                    # A new production starts with "N/A" for whatever this run does not know
+                    "$setOnInsert": {
+                        "first_seen": now,
+                        **{field: "N/A" for field in PRODUCTION_FIELDS if field not in fields},
+                    },
+                },
+                upsert=True,
+            )
+            for event_url, fields in self._production_docs.items()
+        ]
+        performance_ops = self._performance_ops
+        self._production_docs = {}
+        self._performance_ops = []
+
+        self._bulk_write(self.productions, production_ops)
+        for start in range(0, len(performance_ops), self.batch_size):
+            self._bulk_write(self.performances, performance_ops[start:start + self.batch_size])
+
+    def _bulk_write(self, collection, ops):
+        if not ops:
+            return
+        for attempt in range(RETRIES + 1):
+            try:
+                result = collection.bulk_write(ops, ordered=False)
+                self._count_result(result.upserted_count, result.modified_count)
+                return
+            except BulkWriteError as e:
+                # Unordered: everything except the reported documents was written
+                details = e.details or {}
+                self._count_result(details.get("nUpserted", 0), details.get("nModified", 0))
+                self.stats["errors"] += len(details.get("writeErrors", []))
+                for error in details.get("writeErrors", [])[:5]:
+                    logging.error(f"Mongo write error in {collection.name}: {error.get('errmsg')}")
+                return
+            except (AutoReconnect, NetworkTimeout) as e:
+                if attempt == RETRIES:
+                    raise
+                self.stats["retries"] += 1
+                logging.warning(f"Mongo bulk write to {collection.name} failed ({e}), retrying.")
+                time.sleep(0.5 * 2 ** attempt)
+
+    def _count_result(self, upserted, modified):
+        self.stats["batches"] += 1
+        self.stats["upserted"] += upserted
+        self.stats["modified"] += modified
+
+    def close(self):
+        self.flush()
+        self.log_summary()
+
+    def abort(self):
+        # Nothing is finished at close() here, so an interrupted run just
+        # sends what it has
+        self.close()
+
+    def log_summary(self):
+        stats = self.stats
+        logging.info(
+            f"Mongo sink: {self.count} rows in {stats['batches']} bulk writes, {stats['upserted']} inserted, "
+            f"{stats['modified']} updated, {stats['errors']} errors, {stats['retries']} retries."
+        )
+
+
+# ========== Benchmark ==========
+def synthetic_rows(count, performances_per_production=20):
+    for index in range(count):
+        production = index // performances_per_production
+        yield {
+            "title": f"Production {production}",
+            "event_url": f"https://ci.ovationtix.com/35583/production/{1000000 + production}",
+            "image_url": "N/A",
+            "status": "upcoming",
+            "production_type": "N/A",
+            "date_time": f"{index % performances_per_production + 1} June 2025 - 7:00 pm",
+            "origin": "N/A",
+            "market_presence": "N/A",
+            "age_of_production": "N/A",
+        }
+
+
+def benchmark(count=100_000, client=None, database="tnny_benchmark", batch_size=BATCH_SIZE, row_by_row=1000):
+    """Rows/second for bulk upserts, and for one update_one per row on a sample."""
+    client = client or MongoClient(DEFAULT_URI)
+    client.drop_database(database)
+
+    sink = MongoSink(database=database, batch_size=batch_size, client=client)
+    start = time.perf_counter()
+    sink.write_many(synthetic_rows(count))
+    sink.flush()
+    bulk_rate = count / (time.perf_counter() - start)
+
+    # The old way: one round trip per row (a sample, it is slow)
+    collection = client[database]["performances_row_by_row"]
+    start = time.perf_counter()
+    for row in synthetic_rows(row_by_row):
+        collection.update_one(
+            {"event_url": row["event_url"], "date_time": row["date_time"]},
+            {"$set": {"status": row["status"]}},
+            upsert=True,
+        )
+    single_rate = row_by_row / (time.perf_counter() - start)
+
+    client.drop_database(database)
+    return bulk_rate, single_rate
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Benchmark bulk upserts of synthetic performances")
+    parser.add_argument("--count", type=int, default=100_000)
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--mongomock", action="store_true", help="Use mongomock (checks the code path; its timings mean nothing)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    if args.mongomock:
+        import mongomock
+        client = mongomock.MongoClient()
+    else:
+        client = MongoClient(DEFAULT_URI)
+    bulk_rate, single_rate = benchmark(args.count, client, batch_size=args.batch_size)
+    print(f"bulk_write upserts:  {bulk_rate:,.0f} rows/s ({args.count} rows, batches of {args.batch_size})")
+    print(f"update_one per row:  {single_rate:,.0f} rows/s")
@@ -0,0 +1,78 @@
+# ========== Import Required Libraries ==========
+import logging  # For logging events (info, warnings, errors)
+from urllib.parse import urljoin  # For resolving relative image URLs
+from lxml import html as lxml_html  # Fast HTML parser (no browser needed)
+
+# ========== Selectors ==========
+# XPath equivalents of the CSS selectors used by the Selenium scrapers,
+# so we don't need the optional cssselect package.
+def _css_class(name):
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+TITLE_XPATH = f"//h1[{_css_class('calendarTitle')} and {_css_class('prodTitle')}]"
+IMAGE_XPATH = f"//img[{_css_class('ot_prodImg')}]"
+EVENT_ITEMS_XPATH = f"//li[{_css_class('events')}]"
+DATE_XPATH = f".//h5[{_css_class('ot_eventDateTitle')}]//*[{_css_class('date')}]"
+TIME_XPATH = f".//button[{_css_class('ot_timeSlotBtn')}]//p"
+CALENDAR_XPATH = f"//*[{_css_class('ot_calendarView')}] | {EVENT_ITEMS_XPATH}"
+
+
+# ========== Helpers ==========
+def _text(element):
+    # Collapse whitespace the same way WebDriver's element.text does
+    return " ".join(element.text_content().split())
+
+
+def parse_html(page_html):
+    """Parses raw HTML into an lxml tree."""
+    return lxml_html.fromstring(page_html)
+
+
+def has_rendered_calendar(tree):
+    """True when the calendar markup has been rendered into the HTML."""
+    return bool(tree.xpath(CALENDAR_XPATH))
+
+
+# ========== Extract Details From Page HTML ==========
+def parse_event_details(page_html, event_url, tree=None):
+    """Builds the same details dict as extract_event_details, from HTML."""
+    if tree is None:
+        tree = parse_html(page_html)
+
+    details = {"event_url": event_url or "N/A"}
+
+    # Extract the title of the event
+    titles = tree.xpath(TITLE_XPATH)
+    details["title"] = _text(titles[0]) if titles else "N/A"
+    if titles:
+        logging.info(f"Extracted title: {details['title']}")
+    else:
+        logging.warning(f"Failed to extract title from {event_url}")
+
+    # Extract all date and time slots for the event
+    formatted_date_times = []
+    for item in tree.xpath(EVENT_ITEMS_XPATH):
+        dates = item.xpath(DATE_XPATH)
+        if not dates:
+            logging.warning("Failed to extract date/time from an event item: no date")
+            continue
+        date_text = _text(dates[0])
+
+        for p_tag in item.xpath(TIME_XPATH):
+            time_text = _text(p_tag)
+            if time_text:
+                formatted_date_times.append(f"{date_text} - {time_text}")
+    details["date_times"] = formatted_date_times
+
+    # Extract image URL (WebDriver returns src resolved against the page URL)
+    images = tree.xpath(IMAGE_XPATH)
+    src = images[0].get("src") if images else None
+    if src:
+        details["image_url"] = urljoin(event_url or "", src)
+        logging.info(f"Extracted image URL: {details['image_url']}")
+    else:
+        logging.warning(f"Image not found on {event_url}")
+        details["image_url"] = "N/A"
+
+    return details
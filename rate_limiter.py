@@ -0,0 +1,214 @@
+# ========== Import Required Libraries ==========
+import os  # For the saved rates file
+import json  # Learned rates are kept in a small JSON file
+import time  # Token refill clock and waiting
+import logging  # For logging events (info, warnings, errors)
+import threading  # Shared by every worker thread
+from collections import Counter  # Per-host outcome counts
+from urllib.parse import urlsplit  # For grouping requests by host
+
+DEFAULT_PATH = os.path.join("data", "rate_limits.json")
+
+INITIAL_RATE = 2.0  # Requests/second for a host we know nothing about
+MIN_RATE = 0.1
+MAX_RATE = 20.0
+BURST = 2  # Requests that may go out back to back
+INCREASE = 0.1  # Added to the rate after every healthy response
+DECREASE = 0.5  # Rate multiplier after pushback
+SLOW_SECONDS = 8.0  # A response slower than this counts as pushback
+BACKOFF_SECONDS = 2.0  # First pause after a 429/5xx, doubled while they continue
+MAX_BACKOFF_SECONDS = 120.0
+THROTTLED_STATUSES = {429, 500, 502, 503, 504}
+
+# Whole titles (lowercased) of the block pages a browser shows when the site
+# pushes back; Selenium has no status code. Exact matches only, so a
+# production page whose title merely mentions one is not taken for pushback.
+THROTTLED_TITLES = {
+    "429 too many requests",
+    "too many requests",
+    "503 service unavailable",
+    "service unavailable",
+    "access denied",
+    "rate limit exceeded",
+}
+
+
+# ========== Adaptive Per-Host Rate Limiter ==========
+class _Host:
+    def __init__(self, rate):
+        self.rate = rate
+        self.tokens = BURST
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.failures = 0  # Consecutive throttled responses
+
+
+class RateLimiter:
+    """
+    Token bucket per host whose rate adapts to how the host responds.
+
+    Every healthy response adds INCREASE requests/second (up to max_rate);
+    a 429/5xx, an error or a page slower than slow_seconds multiplies the
+    rate by DECREASE. 429/5xx also pause the host, for Retry-After when the
+    server sends one, otherwise for an exponentially growing backoff. So the
+    rate climbs to what the site tolerates and drops as soon as it objects.
+
+    reserve() never sleeps, so the same limiter serves threads (acquire) and
+    asyncio (await asyncio.sleep(reserve(url))).
+    """
+
+    def __init__(self, initial_rate=INITIAL_RATE, min_rate=MIN_RATE, max_rate=MAX_RATE,
+                 slow_seconds=SLOW_SECONDS, rates=None):
+        self.initial_rate = initial_rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.slow_seconds = slow_seconds
+        self.rates = dict(rates or {})  # host -> rate to start from (e.g. last run's)
+        self._hosts = {}
+        self._lock = threading.Lock()
+        self.stats = Counter()
+        self.waited = 0.0
+
+    def _host(self, url):
+        host = urlsplit(url).netloc
+        if host not in self._hosts:
+            rate = min(self.max_rate, max(self.min_rate, self.rates.get(host, self.initial_rate)))
+            self._hosts[host] = _Host(rate)
+        return self._hosts[host]
+
+    # ---------- Pacing ----------
+    def reserve(self, url):
+        """Takes a token for url's host; returns the seconds to wait before sending."""
+        with self._lock:
+            host = self._host(url)
+            now = time.monotonic()
+            host.tokens = min(BURST, host.tokens + (now - host.updated) * host.rate)
+            host.updated = now
+            host.tokens -= 1  # Below zero: queued behind earlier reservations
+            wait = max(-host.tokens / host.rate, host.paused_until - now, 0.0)
+            self.stats["requests"] += 1
+            if wait:
+                self.stats["delayed"] += 1
+                self.waited += wait
+            return wait
+
+    def acquire(self, url):
+        wait = self.reserve(url)
+        if wait:
+            time.sleep(wait)
+        return wait
+
+    # ---------- Feedback ----------
+    def record(self, url, status=None, elapsed=None, error=False, retry_after=None):
+        """Adjusts the host's rate from one response (status None: no status known)."""
+        with self._lock:
+            host = self._host(url)
+            if error or status in THROTTLED_STATUSES:
+                host.failures += 1
+                host.rate = max(self.min_rate, host.rate * DECREASE)
+                pause = retry_after if retry_after is not None else min(
+                    MAX_BACKOFF_SECONDS, BACKOFF_SECONDS * 2 ** (host.failures - 1)
+                )
+                host.paused_until = max(host.paused_until, time.monotonic() + pause)
+                self.stats["errors" if error else "throttled"] += 1
+                logging.warning(
+                    f"Pushback from {urlsplit(url).netloc} ({'error' if error else status}): "
+                    f"rate {host.rate:.2f}/s, pausing {pause:.1f}s"
+                )
+            elif elapsed is not None and elapsed > self.slow_seconds:
+                host.rate = max(self.min_rate, host.rate * DECREASE)
+                self.stats["slow"] += 1
+                logging.info(f"Slow page ({elapsed:.1f}s) from {urlsplit(url).netloc}: rate {host.rate:.2f}/s")
+            else:
+                host.failures = 0
+                host.rate = min(self.max_rate, host.rate + INCREASE)
+                self.stats["healthy"] += 1
+
+    # ---------- Saved Rates ----------
+    def current_rates(self):
+        with self._lock:
+            return {host: round(state.rate, 3) for host, state in self._hosts.items()}
+
+    def save(self, path=DEFAULT_PATH):
+        # Next run starts from what this one learned instead of INITIAL_RATE
+        rates = {**self.rates, **self.current_rates()}
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(rates, f, indent=2)
+        os.replace(tmp_path, path)
+
+    def log_summary(self):
+        stats = self.stats
+        logging.info(
+            f"Rate limiter: {stats['requests']} requests, {stats['delayed']} delayed ({self.waited:.1f}s total), "
+            f"{stats['throttled']} throttled, {stats['slow']} slow, {stats['errors']} errors. "
+            f"Rates now: {self.current_rates()}"
+        )
+
+
+def load_rates(path=DEFAULT_PATH):
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except Exception as e:
+        logging.warning(f"Could not read saved rates {path}: {e}")
+        return {}
+
+
+_limiter = None  # Shared by every fetch path in the process
+
+
+def get_limiter():
+    global _limiter
+    if _limiter is None:
+        _limiter = RateLimiter(rates=load_rates())
+    return _limiter
+
+
+def retry_after_seconds(headers):
+    value = (headers or {}).get("Retry-After")
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None  # HTTP-date form: fall back to the exponential backoff
+
+
+# ========== Fetch Paths ==========
+def http_get(session, url, limiter=None, **kwargs):
+    """session.get(url) paced and fed back through the limiter."""
+    limiter = limiter or get_limiter()
+    limiter.acquire(url)
+    start = time.monotonic()
+    try:
+        response = session.get(url, **kwargs)
+    except Exception:
+        limiter.record(url, error=True)
+        raise
+    limiter.record(url, response.status_code, time.monotonic() - start,
+                   retry_after=retry_after_seconds(response.headers))
+    return response
+
+
+def looks_throttled(driver):
+    try:
+        title = (driver.title or "").lower()
+    except Exception:
+        return False
+    return title.strip() in THROTTLED_TITLES
+
+
+def browser_get(driver, url, limiter=None):
+    """driver.get(url) paced and fed back through the limiter."""
+    limiter = limiter or get_limiter()
+    limiter.acquire(url)
+    start = time.monotonic()
+    try:
+        driver.get(url)
+    except Exception:
+        limiter.record(url, error=True)
+        raise
+    # Selenium has no status code; an error page title is the next best thing
+    limiter.record(url, 429 if looks_throttled(driver) else None, time.monotonic() - start)
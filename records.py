@@ -0,0 +1,77 @@
+# ========== Import Required Libraries ==========
+import logging  # For logging events (info, warnings, errors)
+from datetime import datetime  # For working with dates and times
+
+import dates  # Cached date/time parsing
+
+# Column order of the CSV files in data/
+FIELDNAMES = [
+    "title",
+    "event_url",
+    "image_url",
+    "status",
+    "production_type",
+    "date_time",
+    "origin",
+    "market_presence",
+    "age_of_production",
+    "venue",
+]
+
+# The FIELDNAMES that belong to the production rather than one performance;
+# the sinks and snapshot_diff store or compare them once per event_url
+PRODUCTION_FIELDS = ["title", "image_url", "production_type", "origin", "market_presence", "age_of_production", "venue"]
+
+
+# ========== Merge Two Detail Dicts ==========
+def merge_details(link, event_data):
+    # Prefer freshly extracted values, keep the link's value when missing
+    merged_data = link.copy()
+    for key in set(list(link.keys()) + list(event_data.keys())):
+        val1 = event_data.get(key, "N/A")
+        val2 = link.get(key, "N/A")
+        merged_data[key] = val1 if val1 not in [None, "", "N/A"] else val2
+    return merged_data
+
+
+# ========== Status of a Single Performance ==========
+def performance_status(date_time, now=None):
+    event_datetime = dates.parse_date_time(date_time)
+    if event_datetime is None:
+        logging.warning(f"Could not parse date_time '{date_time}' for status.")
+        return "N/A"
+    now = now or datetime.now()
+    if abs((event_datetime - now).total_seconds()) <= 300:
+        return "active"
+    elif event_datetime > now:
+        return "upcoming"
+    else:
+        return "closed"
+
+
+# ========== One CSV Row per Date/Time ==========
+def build_event_rows(merged_data, now=None, with_status=True):
+    # with_status=False leaves "status" as N/A for status_engine to fill in
+    # for the whole run at once
+    rows = []
+
+    # Check if title is missing
+    if merged_data.get("date_times") and merged_data.get("title") in [None, "", "N/A"]:
+        logging.warning(f"Missing title for event: {merged_data.get('event_url')}")
+
+    # Go through each date/time combo
+    for date_time in merged_data.get("date_times", []):
+        rows.append({
+            "title": merged_data.get("title", "N/A"),
+            "event_url": merged_data.get("event_url", "N/A"),
+            "image_url": merged_data.get("image_url", "N/A"),
+            "status": performance_status(date_time, now) if with_status else "N/A",
+            "production_type": merged_data.get("production_type", "N/A"),
+            "date_time": date_time,
+            "origin": "N/A",
+            "market_presence": "N/A",
+            "age_of_production": "N/A",
+            "venue": merged_data.get("venue", "N/A"),
+        })
+
+    return rows
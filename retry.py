@@ -0,0 +1,205 @@
+# ========== Import Required Libraries ==========
+import time  # Backoff, cool-downs and the run budget
+import random  # Jitter so re-queued pages don't all retry at once
+import logging  # For logging events (info, warnings, errors)
+import threading  # Shared by every worker thread
+from collections import Counter  # Failure counts per kind
+from urllib.parse import urlsplit  # For grouping failures by host
+
+ATTEMPTS = 3  # Tries per page, the first one included
+BASE_DELAY = 2.0  # Seconds before the first re-queue, doubled every round
+MAX_DELAY = 30.0
+FAILURE_THRESHOLD = 5  # Consecutive failures that open a host's circuit
+COOL_DOWN = 60.0  # Seconds an open circuit rejects requests before one trial
+MAX_TRIPS = 3  # Circuit openings after which the host is given up for this run
+
+# Kinds worth another try; anything else fails the page for this run
+RETRYABLE = {"stale", "render", "timeout", "navigation", "throttled", "browser", "circuit_open"}
+# Kinds that say something about the host rather than one page. A page whose
+# calendar did not render ("render") is that page's problem: every venue
+# shares ci.ovationtix.com, so counting it would stop the whole run.
+HOST_FAILURES = {"timeout", "navigation", "throttled"}
+
+# Matched on class names through the MRO, so neither selenium, requests nor
+# aiohttp has to be imported here
+_KINDS_BY_CLASS = {
+    "StaleElementReferenceException": "stale",
+    "InvalidSessionIdException": "browser",
+    "NoSuchWindowException": "browser",
+    "TimeoutException": "render",  # selenium: an element or the page did not show up in time
+    "Timeout": "timeout",  # requests
+    "ServerTimeoutError": "timeout",  # aiohttp
+    "TimeoutError": "timeout",
+    "ConnectionError": "navigation",  # requests and builtin
+    "ClientConnectionError": "navigation",  # aiohttp
+}
+
+
+class PageFailed(Exception):
+    """A page produced nothing usable; kind says why (see classify)."""
+
+    def __init__(self, message, kind="navigation"):
+        super().__init__(message)
+        self.kind = kind
+
+
+class Failure:
+    """What RetryPolicy.attempt returns instead of raising."""
+
+    def __init__(self, kind, error=None):
+        self.kind = kind
+        self.error = error
+
+    def __repr__(self):
+        return f"Failure({self.kind!r}, {self.error!r})"
+
+
+# ========== Classifying Errors ==========
+def classify(error):
+    """stale, render, timeout, navigation, throttled, browser or permanent."""
+    if isinstance(error, PageFailed):
+        return error.kind
+    status = getattr(getattr(error, "response", None), "status_code", None) or getattr(error, "status", None)
+    if isinstance(status, int):
+        return "throttled" if status == 429 or status >= 500 else "permanent"
+    for cls in type(error).__mro__:
+        if cls.__name__ in _KINDS_BY_CLASS:
+            return _KINDS_BY_CLASS[cls.__name__]
+    if type(error).__name__ == "WebDriverException" and "net::ERR" in str(error):
+        return "navigation"  # DNS, refused, reset... reported by Chrome
+    return "permanent"
+
+
+# ========== Per-Host Circuit Breaker ==========
+class CircuitBreaker:
+    """
+    Stops sending a host requests after FAILURE_THRESHOLD consecutive host
+    failures. After COOL_DOWN seconds one trial request goes through: success
+    closes the circuit, failure opens it for another cool-down.
+    """
+
+    def __init__(self, threshold=FAILURE_THRESHOLD, cool_down=COOL_DOWN):
+        self.threshold = threshold
+        self.cool_down = cool_down
+        self._failures = Counter()  # host -> consecutive failures
+        self._opened = {}  # host -> when the circuit opened
+        self._trial = set()  # Hosts with a trial request in flight
+        self._lock = threading.Lock()
+        self.trips = Counter()
+
+    def allow(self, url):
+        host = urlsplit(url).netloc
+        with self._lock:
+            opened = self._opened.get(host)
+            if opened is None:
+                return True
+            if time.monotonic() - opened < self.cool_down or host in self._trial:
+                return False
+            self._trial.add(host)  # Half-open: let exactly one through
+            return True
+
+    def success(self, url):
+        host = urlsplit(url).netloc
+        with self._lock:
+            if host in self._opened:
+                logging.info(f"Circuit for {host} closed again.")
+            self._failures.pop(host, None)
+            self._opened.pop(host, None)
+            self._trial.discard(host)
+
+    def failure(self, url):
+        host = urlsplit(url).netloc
+        with self._lock:
+            self._failures[host] += 1
+            if host in self._trial or (host not in self._opened and self._failures[host] >= self.threshold):
+                self._opened[host] = time.monotonic()
+                self._trial.discard(host)
+                self.trips[host] += 1
+                logging.warning(
+                    f"Circuit for {host} opened after {self._failures[host]} failures; "
+                    f"pausing it for {self.cool_down:.0f}s."
+                )
+
+    def is_open(self, url):
+        return urlsplit(url).netloc in self._opened
+
+    def cool_down_left(self, url):
+        """Seconds until url's host takes a trial request again (0 if closed)."""
+        host = urlsplit(url).netloc
+        with self._lock:
+            opened = self._opened.get(host)
+        return 0.0 if opened is None else max(0.0, opened + self.cool_down - time.monotonic())
+
+    def gave_up(self, url):
+        return self.trips[urlsplit(url).netloc] >= MAX_TRIPS
+
+
+# ========== Retry Policy ==========
+class RetryPolicy:
+    """
+    Classified errors, bounded exponential backoff, a time budget for the
+    whole run and a per-host circuit breaker.
+
+    attempt() runs one try and returns the result or a Failure, never
+    raising, so callers can re-queue failed items at the end of the queue
+    instead of blocking a worker on them. A page of a host whose circuit is
+    open fails as "circuit_open" without being tried, and the caller waits
+    out the cool-down instead of counting it as an attempt; after MAX_TRIPS
+    openings it fails as "host_down". Once budget_seconds have passed every
+    attempt fails as "budget". Neither is retried this run: the rest is left
+    for --resume.
+    """
+
+    def __init__(self, attempts=ATTEMPTS, base_delay=BASE_DELAY, max_delay=MAX_DELAY,
+                 budget_seconds=None, breaker=None):
+        self.attempts = attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline = time.monotonic() + budget_seconds if budget_seconds else None
+        self.breaker = breaker or CircuitBreaker()
+        self.failures = Counter()  # kind -> count
+        self._lock = threading.Lock()
+
+    # ---------- Budget ----------
+    def time_left(self):
+        return float("inf") if self.deadline is None else max(0.0, self.deadline - time.monotonic())
+
+    @property
+    def expired(self):
+        return self.time_left() <= 0
+
+    # ---------- Backoff ----------
+    def delay(self, attempt):
+        """Seconds to wait before re-queue round `attempt` (1 for the first retry)."""
+        return min(self.max_delay, self.base_delay * 2 ** (attempt - 1)) * random.uniform(0.5, 1.0)
+
+    def is_retryable(self, kind):
+        return kind in RETRYABLE
+
+    # ---------- One Try ----------
+    def attempt(self, url, func, *args):
+        if self.expired:
+            return self._failed(Failure("budget"))
+        if not self.breaker.allow(url):
+            return self._failed(Failure("host_down" if self.breaker.gave_up(url) else "circuit_open"))
+        try:
+            result = func(*args)
+        except Exception as e:
+            kind = classify(e)
+            if kind in HOST_FAILURES:
+                self.breaker.failure(url)
+            else:
+                self.breaker.success(url)  # The host answered; the page itself was the problem
+            logging.warning(f"{kind} failure on {url}: {e}")
+            return self._failed(Failure(kind, e))
+        self.breaker.success(url)
+        return result
+
+    def _failed(self, failure):
+        with self._lock:
+            self.failures[failure.kind] += 1
+        return failure
+
+    def log_summary(self):
+        if self.failures:
+            logging.info(f"Retry policy: failures by kind {dict(self.failures)}, circuit trips {dict(self.breaker.trips)}")
@@ -0,0 +1,175 @@
+# ========== Import Required Libraries ==========
+import os  # For bucket files and output paths
+import csv  # For reading CSV snapshots
+import json  # Bucket files and the delta are NDJSON
+import shutil  # For removing the bucket directory
+import hashlib  # Stable bucket assignment across processes
+import logging  # For logging events (info, warnings, errors)
+import tempfile  # Spill directory for the partitioned inputs
+from collections import Counter, defaultdict  # Delta counts, per-production grouping
+
+import writers  # NdjsonWriter for the delta file
+from records import PRODUCTION_FIELDS  # Compared once per event_url
+
+# Fields that belong to one performance, compared per (event_url, date_time)
+PERFORMANCE_FIELDS = ["status"]
+
+BUCKET_BYTES = 32 * 1024 * 1024  # Target input bytes per bucket held in memory
+
+
+# ========== Reading Snapshots ==========
+def iter_rows(path):
+    """Rows of a .csv or .ndjson snapshot, one at a time."""
+    with open(path, newline="", encoding="utf-8") as f:
+        if path.endswith((".ndjson", ".jsonl")):
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            yield from csv.DictReader(f)
+
+
+def bucket_of(event_url, buckets):
+    # All performances of a production land in the same bucket, so both
+    # performance and production differences are found within one bucket
+    digest = hashlib.blake2b((event_url or "").encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big") % buckets
+
+
+def partition(path, directory, buckets):
+    """Spills a snapshot into bucket files; returns their paths."""
+    os.makedirs(directory, exist_ok=True)
+    paths = [os.path.join(directory, f"{index:04d}.ndjson") for index in range(buckets)]
+    files = [open(bucket_path, "w", encoding="utf-8") for bucket_path in paths]
+    try:
+        for row in iter_rows(path):
+            files[bucket_of(row.get("event_url"), buckets)].write(json.dumps(row, ensure_ascii=False) + "\n")
+    finally:
+        for f in files:
+            f.close()
+    return paths
+
+
+# ========== Diffing One Bucket ==========
+def _index(rows):
+    # event_url -> {date_time -> row}; the last duplicate wins
+    productions = defaultdict(dict)
+    for row in rows:
+        productions[row.get("event_url")][row.get("date_time")] = row
+    return productions
+
+
+def _value(row, field):
+    # Older snapshots lack some columns; missing, empty and N/A are all "no value"
+    value = row.get(field)
+    return "N/A" if value in (None, "") else value
+
+
+def _production_fields(performances):
+    row = next(iter(performances.values()))
+    return {field: _value(row, field) for field in PRODUCTION_FIELDS}
+
+
+def diff_rows(old_rows, new_rows):
+    """
+    Yields delta records for two sets of rows sharing the same productions:
+    productions and performances that were added, removed or changed.
+    """
+    old, new = _index(old_rows), _index(new_rows)
+
+    for event_url in sorted(old.keys() | new.keys(), key=str):
+        old_performances = old.get(event_url, {})
+        new_performances = new.get(event_url, {})
+
+        # Production level
+        if not old_performances:
+            yield {"op": "added", "kind": "production", "event_url": event_url, **_production_fields(new_performances)}
+        elif not new_performances:
+            yield {"op": "removed", "kind": "production", "event_url": event_url}
+        else:
+            before, after = _production_fields(old_performances), _production_fields(new_performances)
+            changes = {field: [before[field], after[field]] for field in PRODUCTION_FIELDS if before[field] != after[field]}
+            if changes:
+                yield {"op": "changed", "kind": "production", "event_url": event_url, "changes": changes}
+
+        # Performance level: hash join on date_time within the production
+        for date_time in new_performances.keys() - old_performances.keys():
+            row = new_performances[date_time]
+            yield {"op": "added", "kind": "performance", "event_url": event_url, "date_time": date_time,
+                   **{field: _value(row, field) for field in PERFORMANCE_FIELDS}}
+        for date_time in old_performances.keys() - new_performances.keys():
+            yield {"op": "removed", "kind": "performance", "event_url": event_url, "date_time": date_time}
+        for date_time in old_performances.keys() & new_performances.keys():
+            before, after = old_performances[date_time], new_performances[date_time]
+            changes = {
+                field: [_value(before, field), _value(after, field)]
+                for field in PERFORMANCE_FIELDS
+                if _value(before, field) != _value(after, field)
+            }
+            if changes:
+                yield {"op": "changed", "kind": "performance", "event_url": event_url, "date_time": date_time,
+                       "changes": changes}
+
+
+# ========== Diffing Two Snapshots ==========
+def diff_snapshots(old_path, new_path, output_path, buckets=None):
+    """
+    Writes the delta between two snapshots to output_path (NDJSON, one
+    change per line) and returns counts per (op, kind).
+
+    Inputs are partitioned by a hash of event_url into buckets sized to
+    fit in memory, then each bucket pair is joined on its own, so time is
+    linear and memory is bounded by one bucket.
+    """
+    if buckets is None:
+        total_bytes = os.path.getsize(old_path) + os.path.getsize(new_path)
+        buckets = max(1, -(-total_bytes // BUCKET_BYTES))
+
+    counts = Counter()
+    with writers.NdjsonWriter(output_path) as delta:
+        if buckets == 1:
+            # Small inputs: join straight from the files
+            for change in diff_rows(iter_rows(old_path), iter_rows(new_path)):
+                delta.write(change)
+                counts[(change["op"], change["kind"])] += 1
+        else:
+            spill_dir = tempfile.mkdtemp(prefix="snapshot_diff_")
+            try:
+                old_buckets = partition(old_path, os.path.join(spill_dir, "old"), buckets)
+                new_buckets = partition(new_path, os.path.join(spill_dir, "new"), buckets)
+                for old_bucket, new_bucket in zip(old_buckets, new_buckets):
+                    for change in diff_rows(iter_rows(old_bucket), iter_rows(new_bucket)):
+                        delta.write(change)
+                        counts[(change["op"], change["kind"])] += 1
+            finally:
+                shutil.rmtree(spill_dir, ignore_errors=True)
+
+    logging.info(f"Diff {old_path} -> {new_path}: {dict(counts)} written to {output_path}")
+    return counts
+
+
+def default_output_path(old_path, new_path, directory=os.path.join("data", "deltas")):
+    name = lambda path: os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(directory, f"{name(old_path)}__{name(new_path)}.ndjson")
+
+
+# ========== Main Script ==========
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Diff two scrape snapshots on (event_url, date_time)")
+    parser.add_argument("old", help="Older snapshot (.csv or .ndjson)")
+    parser.add_argument("new", help="Newer snapshot (.csv or .ndjson)")
+    parser.add_argument("--output", help="Delta file to write (default data/deltas/<old>__<new>.ndjson)")
+    parser.add_argument("--buckets", type=int, help="Hash partitions (default: one per 32 MB of input)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    output = args.output or default_output_path(args.old, args.new)
+    counts = diff_snapshots(args.old, args.new, output, args.buckets)
+    for (op, kind), count in sorted(counts.items()):
+        print(f"{op:>8} {kind:<12} {count}")
+    print(f"Delta written to {output}")
+
+
+if __name__ == "__main__":
+    main()
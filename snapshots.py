@@ -0,0 +1,200 @@
+# ========== Import Required Libraries ==========
+import os  # For partition directories and atomic writes
+import re  # For the snapshot date in old CSV file names
+import logging  # For logging events (info, warnings, errors)
+from datetime import date, datetime  # Snapshot dates
+from urllib.parse import urlsplit  # For the production id in event URLs
+import pandas as pd  # Tables and CSV/Parquet writers
+
+import status_engine  # Parsed performance datetimes
+from detail_cache import PRODUCTION_PATH, canonical_production_url
+
+DEFAULT_DIRECTORY = os.path.join("data", "snapshots")
+FORMATS = ("parquet", "csv.gz")
+
+# Columns stored once per production instead of on every performance row
+PRODUCTION_COLUMNS = [
+    "production_id",
+    "client_id",
+    "event_url",
+    "title",
+    "image_url",
+    "production_type",
+    "origin",
+    "market_presence",
+    "age_of_production",
+    "venue",
+]
+PERFORMANCE_COLUMNS = ["production_id", "date_time", "starts_at", "status"]
+
+
+# ========== Rows -> Two Linked Tables ==========
+def production_key(event_url):
+    # "35583-1204356" for .../35583/production/1204356, the URL otherwise
+    url = canonical_production_url(event_url)
+    match = PRODUCTION_PATH.match(urlsplit(url or "").path)
+    return (match.group(1), f"{match.group(1)}-{match.group(2)}") if match else (None, url)
+
+
+def normalize(rows):
+    """
+    records.FIELDNAMES rows -> (productions, performances) DataFrames,
+    linked by production_id. Repeated strings become categoricals.
+    """
+    frame = pd.DataFrame(rows)
+    for column in PRODUCTION_COLUMNS[2:] + ["status", "date_time"]:
+        if column not in frame:
+            frame[column] = "N/A"
+
+    keys = {url: production_key(url) for url in frame["event_url"].unique()}
+    frame["client_id"] = frame["event_url"].map(lambda url: keys[url][0])
+    frame["production_id"] = frame["event_url"].map(lambda url: keys[url][1])
+
+    # Last row wins for production-level fields, like merge_details
+    productions = frame.drop_duplicates("production_id", keep="last")[PRODUCTION_COLUMNS].reset_index(drop=True)
+
+    performances = frame[["production_id", "date_time", "status"]].drop_duplicates(["production_id", "date_time"])
+    performances = performances.reset_index(drop=True)
+    performances["starts_at"] = status_engine.parse_date_times(performances["date_time"])
+    for column in ("production_id", "status"):
+        performances[column] = performances[column].astype("category")
+    return productions, performances[PERFORMANCE_COLUMNS]
+
+
+def denormalize(productions, performances):
+    """Back to one row per performance, the shape of the data/*.csv files."""
+    performances = performances.assign(production_id=performances["production_id"].astype(str))
+    productions = productions.assign(production_id=productions["production_id"].astype(str))
+    return performances.merge(productions, on="production_id", how="left")
+
+
+# ========== Writers ==========
+def partition_path(directory, table, snapshot_date):
+    # Hive-style partitions, so readers can filter on snapshot_date
+    return os.path.join(directory, table, f"snapshot_date={snapshot_date.isoformat()}")
+
+
+def _write_atomic(path, write):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    write(tmp_path)
+    os.replace(tmp_path, path)
+    return path
+
+
+def write_parquet(frame, path):
+    import pyarrow as pa  # Optional: only needed for Parquet output
+    import pyarrow.parquet as pq
+
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    # Dictionary-encode every string column: titles and URLs repeat a lot
+    return _write_atomic(path, lambda tmp: pq.write_table(table, tmp, compression="zstd", use_dictionary=True))
+
+
+def write_csv_gz(frame, path):
+    return _write_atomic(path, lambda tmp: frame.to_csv(tmp, index=False, compression="gzip"))
+
+
+def write_snapshot(rows, directory=DEFAULT_DIRECTORY, formats=("parquet",), snapshot_date=None, snapshot_time=None):
+    """
+    Writes this run's rows as productions/ and performances/ tables under
+    directory, partitioned by snapshot date. Each run is its own
+    part-<HHMMSS> file (snapshot_time), so runs on the same day are kept
+    side by side. Returns the written paths.
+    """
+    now = datetime.now()
+    snapshot_date = snapshot_date or now.date()
+    snapshot_time = snapshot_time or now.strftime("%H%M%S")
+    productions, performances = normalize(rows)
+    written = []
+
+    for output_format in formats:
+        if output_format not in FORMATS:
+            raise ValueError(f"unknown snapshot format {output_format!r}, expected one of {FORMATS}")
+        if output_format == "parquet":
+            try:
+                import pyarrow  # noqa: F401
+            except ImportError:
+                logging.warning("pyarrow is not installed; writing the snapshot as csv.gz instead of Parquet.")
+                output_format = "csv.gz"
+
+        writer = write_parquet if output_format == "parquet" else write_csv_gz
+        for table, frame in (("productions", productions), ("performances", performances)):
+            path = os.path.join(partition_path(directory, table, snapshot_date), f"part-{snapshot_time}.{output_format}")
+            written.append(writer(frame, path))
+
+    logging.info(
+        f"Snapshot {snapshot_date} {snapshot_time}: {len(productions)} productions, {len(performances)} performances "
+        f"-> {', '.join(written)}"
+    )
+    return written
+
+
+# ========== Readers ==========
+PART_FILE = re.compile(r"part(?:-(\d{6}))?\.(parquet|csv\.gz)$")  # part.* from before per-run files
+
+
+def read_table(table, directory=DEFAULT_DIRECTORY, since=None):
+    """
+    All snapshots of one table (Parquet and csv.gz), with snapshot_date and
+    snapshot_time (HHMMSS, empty for old part.* files) columns.
+    """
+    root = os.path.join(directory, table)
+    frames = []
+    for partition in sorted(os.listdir(root)) if os.path.isdir(root) else []:
+        snapshot_date = date.fromisoformat(partition.split("=", 1)[1])
+        if since and snapshot_date < since:
+            continue
+        # Every run of the day; both formats may exist for a run and hold the same rows
+        runs = {}
+        for name in sorted(os.listdir(os.path.join(root, partition))):
+            match = PART_FILE.match(name)
+            if match and (match.group(2) == "parquet" or match.group(1) not in runs):
+                runs[match.group(1)] = os.path.join(root, partition, name)
+        for snapshot_time, path in sorted(runs.items(), key=lambda run: run[0] or ""):
+            if path.endswith(".parquet"):
+                frame = pd.read_parquet(path)
+            else:
+                frame = pd.read_csv(path, dtype=str, keep_default_na=False)
+            frames.append(frame.assign(snapshot_date=snapshot_date, snapshot_time=snapshot_time or ""))
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+
+# ========== Convert Old CSV Files ==========
+def snapshot_taken_at(path):
+    # data/ovationtix_events_20250605_143442.csv -> 2025-06-05 14:34:42
+    match = re.search(r"\d{8}_\d{6}", os.path.basename(path))
+    if match:
+        return datetime.strptime(match.group(0), "%Y%m%d_%H%M%S")
+    return datetime.fromtimestamp(os.path.getmtime(path))
+
+
+def convert_file(path, directory=DEFAULT_DIRECTORY, formats=("parquet",)):
+    """Snapshot of a finished run's .csv or .ndjson output file."""
+    if path.endswith((".ndjson", ".jsonl")):
+        frame = pd.read_json(path, lines=True, dtype=False)
+    else:
+        frame = pd.read_csv(path, dtype=str, keep_default_na=False)
+    taken_at = snapshot_taken_at(path)
+    return write_snapshot(frame.to_dict("records"), directory, formats, taken_at.date(), taken_at.strftime("%H%M%S"))
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="Convert denormalized event files into normalized snapshots")
+    parser.add_argument("files", nargs="+", help="data/ovationtix_events_*.csv or .ndjson files")
+    parser.add_argument("--directory", default=DEFAULT_DIRECTORY)
+    parser.add_argument("--format", dest="formats", action="append", choices=FORMATS,
+                        help="Output format (repeatable, default parquet)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    for path in args.files:
+        written = convert_file(path, args.directory, args.formats or ["parquet"])
+        before = os.path.getsize(path)
+        after = sum(os.path.getsize(p) for p in written)
+        print(f"{path}: {before / 1024:.1f} KB -> {after / 1024:.1f} KB in {len(written)} files")
+
+
+if __name__ == "__main__":
+    main()
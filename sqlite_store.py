@@ -0,0 +1,376 @@
+# ========== Import Required Libraries ==========
+import os  # For the database directory
+import re  # For the run timestamp in output file names
+import time  # For the query benchmark
+import sqlite3  # Embedded database, no server needed
+import logging  # For logging events (info, warnings, errors)
+from datetime import datetime, timedelta  # Snapshot stamps and query windows
+
+import dates  # starts_at for every performance
+import live_status  # Status worked out at read time
+from records import PRODUCTION_FIELDS  # Columns of the productions table
+
+DEFAULT_PATH = os.path.join("data", "tnny.sqlite3")
+BATCH_SIZE = 1000  # Rows per transaction
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS productions (
+    id INTEGER PRIMARY KEY,
+    event_url TEXT NOT NULL UNIQUE,
+    title TEXT,
+    image_url TEXT,
+    production_type TEXT,
+    origin TEXT,
+    market_presence TEXT,
+    age_of_production TEXT,
+    venue TEXT,
+    first_seen TEXT NOT NULL,
+    last_seen TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS performances (
+    id INTEGER PRIMARY KEY,
+    production_id INTEGER NOT NULL REFERENCES productions(id),
+    date_time TEXT NOT NULL,
+    starts_at TEXT,  -- "YYYY-MM-DD HH:MM:SS", sorts like the datetime
+    status TEXT,
+    first_seen TEXT NOT NULL,
+    last_seen TEXT NOT NULL,
+    last_snapshot INTEGER,
+    UNIQUE (production_id, date_time)
+);
+CREATE TABLE IF NOT EXISTS snapshots (
+    id INTEGER PRIMARY KEY,
+    taken_at TEXT NOT NULL,
+    source TEXT
+);
+CREATE TABLE IF NOT EXISTS production_snapshots (
+    snapshot_id INTEGER NOT NULL REFERENCES snapshots(id),
+    production_id INTEGER NOT NULL REFERENCES productions(id),
+    status TEXT NOT NULL,
+    PRIMARY KEY (snapshot_id, production_id)
+);
+CREATE INDEX IF NOT EXISTS performances_starts_at ON performances (starts_at);
+CREATE INDEX IF NOT EXISTS performances_status ON performances (status, starts_at);
+CREATE INDEX IF NOT EXISTS performances_production ON performances (production_id, starts_at);
+CREATE INDEX IF NOT EXISTS performances_snapshot ON performances (last_snapshot);
+CREATE INDEX IF NOT EXISTS production_snapshots_production ON production_snapshots (production_id);
+"""
+
+# tnny's rule: any active performance, or both past and future ones, means active
+ROLLUP_STATUS_SQL = """
+CASE
+    WHEN MAX(status = 'active') OR (MAX(status = 'upcoming') AND MAX(status = 'closed')) THEN 'active'
+    WHEN MAX(status = 'upcoming') THEN 'upcoming'
+    WHEN MAX(status = 'closed') THEN 'closed'
+    ELSE 'N/A'
+END
+"""
+
+
+# ========== Indexed SQLite Store ==========
+class SqliteStore:
+    """
+    productions/performances tables, filled one snapshot (scrape run) at a time.
+
+    Rows are buffered and written BATCH_SIZE at a time inside a transaction.
+    close() adds the snapshot row and every production's rolled-up status,
+    which is what "closed since the last snapshot" compares; an interrupted
+    run (abort()) adds neither, so it never counts as a snapshot. Pass the
+    same snapshot_id to carry on with an interrupted run. Has the same
+    write/write_many/flush/close methods as writers.py.
+    """
+
+    def __init__(self, path=DEFAULT_PATH, batch_size=BATCH_SIZE, taken_at=None, source=None, snapshot_id=None):
+        self.path = path
+        self.batch_size = batch_size
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.conn = connect(path)
+        self.conn.executescript(SCHEMA)
+        migrate(self.conn)
+        self.taken_at = _stamp(taken_at or datetime.now())
+        self.source = source
+        self.snapshot_id = snapshot_id or next_snapshot_id(self.conn)
+        self._pending = []
+        self.count = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    # ---------- Writing ----------
+    def write(self, row):
+        self._pending.append(row)
+        self.count += 1
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def write_many(self, rows):
+        for row in rows:
+            self.write(row)
+
+    def flush(self):
+        rows, self._pending = self._pending, []
+        if not rows:
+            return
+        now = self.taken_at
+        productions = {row.get("event_url"): row for row in rows}  # Last row wins, like merge_details
+
+        with self.conn:  # One transaction per batch
+            self.conn.executemany(
+                f"""
+                INSERT INTO productions (event_url, {", ".join(PRODUCTION_FIELDS)}, first_seen, last_seen)
+                VALUES (?, {", ".join("?" for _ in PRODUCTION_FIELDS)}, ?, ?)
+                ON CONFLICT (event_url) DO UPDATE SET
+                    {", ".join(f"{field} = excluded.{field}" for field in PRODUCTION_FIELDS)},
+                    last_seen = excluded.last_seen
+                """,
+                [
+                    (event_url, *(row.get(field, "N/A") for field in PRODUCTION_FIELDS), now, now)
+                    for event_url, row in productions.items()
+                ],
+            )
+            ids = dict(self.conn.execute(
+                f"SELECT event_url, id FROM productions WHERE event_url IN ({', '.join('?' for _ in productions)})",
+                list(productions),
+            ).fetchall())
+            self.conn.executemany(
+                """
+                INSERT INTO performances (production_id, date_time, starts_at, status, first_seen, last_seen, last_snapshot)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (production_id, date_time) DO UPDATE SET
+                    starts_at = excluded.starts_at,
+                    status = excluded.status,
+                    last_seen = excluded.last_seen,
+                    last_snapshot = excluded.last_snapshot
+                """,
+                [
+                    (
+                        ids[row.get("event_url")],
+                        row.get("date_time"),
+                        _stamp(dates.parse_date_time(row.get("date_time"))),
+                        row.get("status"),
+                        now,
+                        now,
+                        self.snapshot_id,
+                    )
+                    for row in rows
+                ],
+            )
+
+    def close(self):
+        if self.conn is None:
+            return
+        self.flush()
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO snapshots (id, taken_at, source) VALUES (?, ?, ?)",
+                (self.snapshot_id, self.taken_at, self.source),
+            )
+            self.conn.execute(
+                f"""
+                INSERT OR REPLACE INTO production_snapshots (snapshot_id, production_id, status)
+                SELECT ?, production_id, {ROLLUP_STATUS_SQL}
+                FROM performances WHERE last_snapshot = ? GROUP BY production_id
+                """,
+                (self.snapshot_id, self.snapshot_id),
+            )
+        logging.info(f"SQLite store: snapshot {self.snapshot_id} with {self.count} rows saved to {self.path}")
+        self.conn.close()
+        self.conn = None
+
+    def abort(self):
+        """Interrupted run: keeps the rows written so far, no status rollup."""
+        if self.conn is None:
+            return
+        self.flush()
+        self.conn.close()
+        self.conn = None
+
+
+def connect(path=DEFAULT_PATH):
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")  # Readers don't block the scraper
+    conn.execute("PRAGMA synchronous=NORMAL")  # Safe with WAL, far fewer fsyncs
+    conn.execute("PRAGMA foreign_keys=ON")
+    return conn
+
+
+def next_snapshot_id(conn):
+    # Past finished snapshots and past interrupted runs, whose rows are
+    # already tagged with their id
+    row = conn.execute(
+        """
+        SELECT MAX(id) FROM (
+            SELECT MAX(id) AS id FROM snapshots
+            UNION ALL SELECT MAX(last_snapshot) FROM performances
+        )
+        """
+    ).fetchone()
+    return (row[0] or 0) + 1
+
+
+def migrate(conn):
+    # Databases created before a column existed: add it, empty for old rows
+    columns = {row["name"] for row in conn.execute("PRAGMA table_info(productions)")}
+    for field in PRODUCTION_FIELDS:
+        if field not in columns:
+            conn.execute(f"ALTER TABLE productions ADD COLUMN {field} TEXT")
+
+
+def _stamp(value):
+    return value.strftime("%Y-%m-%d %H:%M:%S") if value else None
+
+
+# ========== Query API ==========
+def performances_between(conn, start, end, at=None):
+    """
+    Performances starting in [start, end), soonest first. "status" is for
+    `at` (default: now), not the one stored at scrape time.
+    """
+    rows = [dict(row) for row in conn.execute(
+        """
+        SELECT p.title, p.venue, p.event_url, f.date_time, f.starts_at
+        FROM performances f JOIN productions p ON p.id = f.production_id
+        WHERE f.starts_at >= ? AND f.starts_at < ?
+        ORDER BY f.starts_at
+        """,
+        (_stamp(start), _stamp(end)),
+    )]
+    for row in rows:
+        row["status"] = live_status.performance_status(datetime.fromisoformat(row["starts_at"]), at)
+    return rows
+
+
+def whats_on(conn, hours=48, now=None):
+    """Performances in the next `hours` hours (or running right now)."""
+    now = now or datetime.now()
+    return performances_between(conn, now - live_status.DEFAULT_BUFFER, now + timedelta(hours=hours), now)
+
+
+def latest_snapshots(conn, count=2):
+    return [row["id"] for row in conn.execute("SELECT id FROM snapshots ORDER BY id DESC LIMIT ?", (count,))]
+
+
+def productions_by_status(conn, status, snapshot_id=None):
+    snapshot_id = snapshot_id or next(iter(latest_snapshots(conn, 1)), None)
+    return [dict(row) for row in conn.execute(
+        """
+        SELECT p.title, p.event_url, s.status
+        FROM production_snapshots s JOIN productions p ON p.id = s.production_id
+        WHERE s.snapshot_id = ? AND s.status = ?
+        ORDER BY p.title
+        """,
+        (snapshot_id, status),
+    )]
+
+
+def closed_since_last_snapshot(conn):
+    """Productions closed in the latest snapshot that were not closed in the one before."""
+    snapshots = latest_snapshots(conn, 2)
+    if len(snapshots) < 2:
+        return []
+    latest, previous = snapshots
+    return [dict(row) for row in conn.execute(
+        """
+        SELECT p.title, p.event_url, before.status AS previous_status
+        FROM production_snapshots now
+        JOIN productions p ON p.id = now.production_id
+        LEFT JOIN production_snapshots before
+            ON before.production_id = now.production_id AND before.snapshot_id = ?
+        WHERE now.snapshot_id = ? AND now.status = 'closed'
+            AND (before.status IS NULL OR before.status != 'closed')
+        ORDER BY p.title
+        """,
+        (previous, latest),
+    )]
+
+
+# ========== Loading Old Output Files ==========
+def run_time_of(path):
+    # data/ovationtix_events_20250605_143442.csv -> 2025-06-05 14:34:42
+    match = re.search(r"(\d{8}_\d{6})", os.path.basename(path))
+    if match:
+        return datetime.strptime(match.group(1), "%Y%m%d_%H%M%S")
+    return datetime.fromtimestamp(os.path.getmtime(path))
+
+
+def load_file(path, db_path=DEFAULT_PATH):
+    """Adds a finished run's .csv/.ndjson output as one snapshot."""
+    from snapshot_diff import iter_rows
+
+    with SqliteStore(db_path, taken_at=run_time_of(path), source=os.path.basename(path)) as store:
+        store.write_many(iter_rows(path))
+    return store.count
+
+
+# ========== Benchmark ==========
+def benchmark(db_path, years=3, productions_per_month=40, performances_per_production=30):
+    """Fills db_path with synthetic history and times the query API."""
+    start = datetime(2025, 1, 1, 19, 30) - timedelta(days=365 * years)
+    with SqliteStore(db_path, taken_at=start) as store:
+        for month in range(12 * years):
+            for index in range(productions_per_month):
+                opening = start + timedelta(days=30 * month + index % 30)
+                event_url = f"https://ci.ovationtix.com/35583/production/{month * 1000 + index}"
+                store.write_many(
+                    {
+                        "event_url": event_url,
+                        "title": f"Production {month}-{index}",
+                        "date_time": (opening + timedelta(days=day)).strftime(dates.DATE_TIME_FORMAT),
+                        "status": "closed",
+                    }
+                    for day in range(performances_per_production)
+                )
+        rows = store.count
+
+    conn = connect(db_path)
+    timings = {}
+    for name, query in [
+        ("next 48 hours", lambda: whats_on(conn, 48, now=start + timedelta(days=400))),
+        ("closed since last snapshot", lambda: closed_since_last_snapshot(conn)),
+        ("closed productions", lambda: productions_by_status(conn, "closed")),
+    ]:
+        began = time.perf_counter()
+        result = query()
+        timings[name] = ((time.perf_counter() - began) * 1000, len(result))
+    conn.close()
+    return rows, timings
+
+
+# ========== Main Script ==========
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Query or fill the SQLite store")
+    parser.add_argument("--db", default=DEFAULT_PATH)
+    commands = parser.add_subparsers(dest="command", required=True)
+    load = commands.add_parser("load", help="Add finished .csv/.ndjson runs as snapshots, oldest first")
+    load.add_argument("files", nargs="+")
+    upcoming = commands.add_parser("whats-on", help="Performances in the next N hours")
+    upcoming.add_argument("--hours", type=float, default=48)
+    commands.add_parser("closed", help="Productions that closed since the last snapshot")
+    bench = commands.add_parser("benchmark", help="Time the queries over synthetic years of history")
+    bench.add_argument("--years", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    if args.command == "load":
+        for path in sorted(args.files, key=run_time_of):
+            print(f"{path}: {load_file(path, args.db)} rows")
+    elif args.command == "benchmark":
+        rows, timings = benchmark(args.db, args.years)
+        print(f"{rows} performances")
+        for name, (ms, count) in timings.items():
+            print(f"{name:<28} {ms:8.2f} ms ({count} rows)")
+    else:
+        conn = connect(args.db)
+        results = whats_on(conn, args.hours) if args.command == "whats-on" else closed_since_last_snapshot(conn)
+        for row in results:
+            print(" | ".join(str(value) for value in row.values()))
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+# ========== Import Required Libraries ==========
+import logging  # For logging events (info, warnings, errors)
+import numpy as np  # Vectorized comparisons over datetime64 arrays
+import pandas as pd  # Per-production grouping
+
+import dates  # Cached date/time token parsing
+DEFAULT_BUFFER_MINUTES = 5  # A performance within this window of now is "active"
+
+
+# ========== Parsing ==========
+def parse_date_times(date_times):
+    """date_time strings -> datetime64 Series; unparseable values become NaT."""
+    # Months of history repeat the same few thousand strings: parse each once
+    values = pd.Categorical(pd.Series(date_times, dtype="object"))
+    parsed = pd.to_datetime(pd.Series([dates.parse_date_time(value) for value in values.categories], dtype="object"))
+    # Code -1 (missing value) picks the extra NaT at the end
+    lookup = np.append(parsed.to_numpy(dtype="datetime64[ns]"), np.datetime64("NaT", "ns"))
+    times = lookup[values.codes]
+    return pd.Series(times)
+
+
+# ========== Per-Performance Status ==========
+def performance_statuses(times, now=None, buffer_minutes=DEFAULT_BUFFER_MINUTES):
+    """
+    "active", "upcoming", "closed" or "N/A" (unparsed) for every datetime in
+    times, matching records.performance_status row for row.
+    """
+    times = pd.Series(times).to_numpy(dtype="datetime64[ns]")
+    now = np.datetime64(now or pd.Timestamp.now(), "ns")
+    buffer = np.timedelta64(int(buffer_minutes * 60), "s")
+
+    missing = np.isnat(times)
+    active = ~missing & (times >= now - buffer) & (times <= now + buffer)
+    upcoming = ~missing & (times > now + buffer)
+    return np.select([missing, active, upcoming], ["N/A", "active", "upcoming"], default="closed")
+
+
+# ========== Per-Production Rollup ==========
+def production_statuses(productions, statuses):
+    """
+    One status per production: "active" if any performance is active or the
+    run has both past and future dates, "upcoming" if only future dates,
+    "closed" if only past ones, "N/A" if no date could be parsed.
+    """
+    flags = pd.DataFrame({
+        "production": pd.Series(productions).to_numpy(),
+        "active": statuses == "active",
+        "future": statuses == "upcoming",
+        "past": statuses == "closed",
+    }).groupby("production", sort=False)[["active", "future", "past"]].any()
+
+    rollup = np.select(
+        [flags["active"] | (flags["future"] & flags["past"]), flags["future"], flags["past"]],
+        ["active", "upcoming", "closed"],
+        default="N/A",
+    )
+    return pd.Series(rollup, index=flags.index, name="production_status")
+
+
+# ========== Whole Table at Once ==========
+def classify(frame, now=None, buffer_minutes=DEFAULT_BUFFER_MINUTES,
+             time_column="date_time", production_column="event_url"):
+    """Adds "status" and "production_status" columns to a performances frame."""
+    times = parse_date_times(frame[time_column])
+    unparsed = int(times.isna().sum() - frame[time_column].isna().sum())
+    if unparsed:
+        logging.warning(f"Could not parse {unparsed} date_time values for status.")
+
+    frame = frame.copy()
+    frame["status"] = performance_statuses(times, now, buffer_minutes)
+    rollup = production_statuses(frame[production_column], frame["status"].to_numpy())
+    frame["production_status"] = frame[production_column].map(rollup)
+    return frame
+
+
+def assign_statuses(rows, now=None, buffer_minutes=DEFAULT_BUFFER_MINUTES):
+    """
+    Sets row["status"] on records.build_event_rows() rows in place, in one
+    vectorized pass, and returns the per-production rollup.
+    """
+    if not rows:
+        return pd.Series(dtype="object", name="production_status")
+
+    frame = classify(pd.DataFrame(rows, columns=["event_url", "date_time"]), now, buffer_minutes)
+    for row, status in zip(rows, frame["status"].tolist()):
+        row["status"] = status
+    return frame.drop_duplicates("event_url").set_index("event_url")["production_status"]
+
+
+def production_status(date_times, now=None, buffer_minutes=DEFAULT_BUFFER_MINUTES):
+    """Rollup status for a single production's date_time strings."""
+    statuses = performance_statuses(parse_date_times(date_times), now, buffer_minutes)
+    return str(production_statuses(np.zeros(len(statuses)), statuses).iloc[0]) if len(statuses) else "N/A"
@@ -2,9 +2,13 @@ import os
 import logging
 import undetected_chromedriver as uc
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
+import discovery
+import waits
+import rate_limiter
+import driver_cache
+
 # ========== Setup Logging ==========
 os.makedirs("log", exist_ok=True)
 
@@ -43,7 +47,7 @@ def setup_driver():
         "--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/114.0.0.0 Safari/537.36"
     )
 
-    driver = uc.Chrome(options=options)
+    driver = uc.Chrome(options=options, **driver_cache.chrome_kwargs())
     if not options.headless:
         driver.maximize_window()
     return driver
@@ -52,12 +56,11 @@ def setup_driver():
 # ========== Load Page and Wait ==========
 def load_page(driver, url):
     try:
-        driver.get(url)
+        rate_limiter.browser_get(driver, url)
         logging.info(f"Navigated to {url}")
 
-        WebDriverWait(driver, 20).until(
-            EC.presence_of_element_located((By.TAG_NAME, "body"))
-        )
+        # Wait until the DOM is ready (no fixed sleep)
+        waits.wait_for_dom_ready(driver, timeout=20)
         logging.info("Page fully loaded")
         return True
     except Exception as e:
@@ -68,17 +71,17 @@ def load_page(driver, url):
 def click_calendar_button(driver):
     try:
         # Wait for the calendar button to be clickable
-        calendar_btn = WebDriverWait(driver, 15).until(
-            EC.element_to_be_clickable(
-                (By.CSS_SELECTOR, 'button[data-test="calendar_button"]')
-            )
+        calendar_btn = waits.wait_for_element(
+            driver, (By.CSS_SELECTOR, 'button[data-test="calendar_button"]'),
+            timeout=15, condition=EC.element_to_be_clickable, name="calendar_button",
         )
+        if calendar_btn is None:
+            logging.error("Calendar button is not on this page.")
+            return False
         calendar_btn.click()
         logging.info("Clicked the 'Calendar' button successfully.")
 
-        WebDriverWait(driver, 15).until(
-            EC.visibility_of_element_located((By.CLASS_NAME, "ot_prodListContainer"))
-        )
+        waits.wait_for_calendar_list(driver)
         logging.info("Calendar content (.ot_prodListContainer) is visible.")
 
         return True
@@ -89,73 +92,11 @@ def click_calendar_button(driver):
 
 # ========== Extract Event Links ==========
 def extract_events(driver):
-    try:
-        # Wait for the event list container to appear
-        WebDriverWait(driver, 15).until(
-            EC.visibility_of_element_located((By.CLASS_NAME, "ot_prodListContainer"))
-        )
-        logging.info("Event list container is visible.")
-
-        # Get the initial list of event containers once
-        original_events = driver.find_elements(
-            By.CSS_SELECTOR, ".ot_prodListItem.ot_callout"
-        )
-        logging.info(f"Found {len(original_events)} event items.")
-
-        event_links = []  # Store final URLs here
-
-        # Loop to click each "See this event" button and capture the URL
-        for idx in range(len(original_events)):
-            try:
-                # Refetch all current events each time to avoid stale element references
-                events = driver.find_elements(
-                    By.CSS_SELECTOR, ".ot_prodListItem.ot_callout"
-                )
-
-                # Skip if the number of events has changed (e.g., due to loading issues)
-                if idx >= len(events):
-                    logging.warning(
-                        f"Event #{idx + 1} no longer exists on reloaded page."
-                    )
-                    continue
-
-                button = events[idx].find_element(
-                    By.CSS_SELECTOR, "button.ot_prodInfoButton"
-                )  # Get the correct button inside this event
-
-                driver.execute_script(
-                    "arguments[0].scrollIntoView({behavior: 'instant', block: 'center'});",
-                    button,
-                )  # Scroll to the button (helps avoid hidden elements)
-
-                button.click()  # Click the event button
-                logging.info(f"Clicked 'See this event' on event #{idx + 1}")
-
-                # Wait for the new URL to load (event detail page)
-                WebDriverWait(driver, 10).until(EC.url_contains("production"))
-                current_url = driver.current_url
-                event_links.append(current_url)
-                logging.info(f"Captured event URL: {current_url}")
-
-                # Go back to the calendar page
-                driver.back()
-                logging.info("Returned to calendar page.")
-
-                # Wait for calendar to reload
-                WebDriverWait(driver, 10).until(
-                    EC.visibility_of_element_located(
-                        (By.CLASS_NAME, "ot_prodListContainer")
-                    )
-                )
-
-            except Exception as e:
-                logging.error(f"Error processing event #{idx + 1}: {e}")
-
-        return event_links
-
-    except Exception as e:
-        logging.error(f"Failed to extract events: {e}")
-        return []
+    # Read every production URL from the calendar list in one pass instead of
+    # clicking each "See this event" button and going back
+    event_links = discovery.discover_production_urls(driver)
+    logging.info(f"Found {len(event_links)} event URLs.")
+    return event_links
 
 
 # ========== Main Script ==========
@@ -191,6 +132,7 @@ def main():
             logging.error("Page did not load properly.")
     finally:
         # Step 5: Close the browser and cleanup
+        waits.log_summary()  # How long each kind of wait actually took
         driver.quit()
         del driver  # Helps suppress warning messages in Windows
 
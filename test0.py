@@ -1,14 +1,35 @@
 # ========== Import Required Libraries ==========
-import csv  # For writing data to CSV files
 import os  # For creating folders and handling paths
-import time  # For adding delays (e.g., waiting for pages to load)
+import time  # Backoff before re-queued pages are tried again
 from datetime import datetime  # For working with dates and times
 import logging  # For logging events (info, warnings, errors)
+from collections import Counter  # Production status counts
 import undetected_chromedriver as uc  # For bypassing bot detection in Chrome
 from selenium.webdriver.common.by import By  # For locating elements
-from selenium.webdriver.support.ui import WebDriverWait  # To wait until elements are available
 from selenium.webdriver.support import expected_conditions as EC  # Expected conditions for waits
 
+import http_backend  # Browser-free fetching of production pages
+import page_parser  # Local lxml parsing of page HTML
+import discovery  # One-pass production URL harvesting
+import waits  # Event-driven waits instead of fixed sleeps
+import rate_limiter  # Adaptive per-host pacing for every page load
+import retry  # Classified errors, re-queueing, run budget, circuit breaker
+from driver_pool import DriverPool, driver_is_alive  # Parallel browser workers
+import records  # Row building shared by all engines
+from detail_cache import DetailCache  # Visit each production page once per run
+from fingerprints import FingerprintStore  # Skip pages unchanged since the last run
+from http_cache import HttpCache  # Conditional, on-disk HTTP cache
+from browser_profile import LeanProfile  # Block heavy assets at the browser level
+import browser_daemon  # Long-lived browser shared across runs
+import driver_cache  # Patch chromedriver once per Chrome version
+import status_engine  # Vectorized active/upcoming/closed classification
+import dates  # Cached date/time parsing with failure reporting
+import snapshots  # Normalized Parquet/csv.gz output
+import writers  # Incremental CSV/NDJSON output with atomic rename
+from checkpoint import Checkpoint  # Resume interrupted runs
+import sqlite_store  # Indexed local history of every run
+import venues  # Venue registry, per-host limits, multi-venue discovery
+
 # ========== Setup Logging ==========
 # Create 'log' folder if it doesn't exist
 os.makedirs("log", exist_ok=True)
@@ -32,7 +53,9 @@ logger.addHandler(file_handler)
 logger.addHandler(console_handler)
 
 # ========== Set Up Chrome Driver ==========
-def setup_driver():
+PAGE_LOAD_TIMEOUT = 15  # driver.get gives up after this instead of Chrome's 300 s
+
+def setup_driver(lean_profile=None):
     options = uc.ChromeOptions()
     options.headless = True  # Run browser in headless mode (no window)
     options.add_argument("--no-sandbox")
@@ -45,7 +68,14 @@ def setup_driver():
         "--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/114.0.0.0 Safari/537.36"
     )
 
-    driver = uc.Chrome(options=options)  # Launch browser with options
+    # Lean loading: record network events so the profile can report savings
+    if lean_profile is not None:
+        lean_profile.enable_logging(options)
+
+    driver = uc.Chrome(options=options, **driver_cache.chrome_kwargs())  # Launch browser with options
+    driver.set_page_load_timeout(PAGE_LOAD_TIMEOUT)  # A hung page load fails fast and is re-queued
+    if lean_profile is not None:
+        lean_profile.apply(driver)  # Block images, fonts, media and trackers via CDP
     if not options.headless:
         driver.maximize_window()  # Maximize if not headless
     return driver
@@ -53,13 +83,11 @@ def setup_driver():
 # ========== Load Page and Wait for It ==========
 def load_page(driver, url):
     try:
-        driver.get(url)  # Navigate to URL
+        rate_limiter.browser_get(driver, url)  # Navigate to URL, paced per host
         logging.info(f"Navigated to {url}")
 
-        # Wait until body tag appears (ensures page is loaded)
-        WebDriverWait(driver, 20).until(
-            EC.presence_of_element_located((By.TAG_NAME, "body"))
-        )
+        # Wait until the DOM is ready (no fixed sleep)
+        waits.wait_for_dom_ready(driver, timeout=20)
         logging.info("Page fully loaded")
         return True
     except Exception as e:
@@ -70,18 +98,18 @@ def load_page(driver, url):
 def click_calendar_button(driver):
     try:
         # Wait for and click the "Calendar" button
-        calendar_btn = WebDriverWait(driver, 15).until(
-            EC.element_to_be_clickable(
-                (By.CSS_SELECTOR, 'button[data-test="calendar_button"]')
-            )
+        calendar_btn = waits.wait_for_element(
+            driver, (By.CSS_SELECTOR, 'button[data-test="calendar_button"]'),
+            timeout=15, condition=EC.element_to_be_clickable, name="calendar_button",
         )
+        if calendar_btn is None:
+            logging.error("Calendar button is not on this page.")
+            return False
         calendar_btn.click()
         logging.info("Clicked the 'Calendar' button successfully.")
 
         # Wait until calendar container is visible
-        WebDriverWait(driver, 15).until(
-            EC.visibility_of_element_located((By.CLASS_NAME, "ot_prodListContainer"))
-        )
+        waits.wait_for_calendar_list(driver)
         logging.info("Calendar content (.ot_prodListContainer) is visible.")
 
         return True
@@ -101,11 +129,12 @@ def extract_event_details(driver):
 
     # Extract the title of the event
     try:
-        title_element = WebDriverWait(driver, 10).until(
-            EC.visibility_of_element_located(
-                (By.CSS_SELECTOR, "h1.calendarTitle.prodTitle")
-            )
+        title_element = waits.wait_for_element(
+            driver, (By.CSS_SELECTOR, "h1.calendarTitle.prodTitle"),
+            condition=EC.visibility_of_element_located, name="title",
         )
+        if title_element is None:
+            raise ValueError("title is not on the page")
         details["title"] = title_element.text.strip()
         logging.info(f"Extracted title: {details['title']}")
     except Exception as e:
@@ -116,6 +145,8 @@ def extract_event_details(driver):
     formatted_date_times = []
 
     try:
+        # Let the date list finish rendering before reading it
+        waits.wait_for_event_list(driver)
         event_list_items = driver.find_elements(By.CSS_SELECTOR, "li.events")
 
         for item in event_list_items:
@@ -149,170 +180,362 @@ def extract_event_details(driver):
 
     return details
 
-# ========== Extract All Events From Calendar ==========
-def extract_events(driver):
-    try:
-        WebDriverWait(driver, 15).until(
-            EC.visibility_of_element_located((By.CLASS_NAME, "ot_prodListContainer"))
-        )
-        logging.info("Event list container is visible.")
-
-        original_events = driver.find_elements(
-            By.CSS_SELECTOR, ".ot_prodListItem.ot_callout"
-        )
-        logging.info(f"Found {len(original_events)} event items.")
+# ========== Extract Details From a Single DOM Snapshot ==========
+PAGE_TIMEOUT = 5  # One short wait per page; a page that needs longer is re-queued
+
+def extract_event_details_snapshot(driver, timeout=PAGE_TIMEOUT):
+    # Same fields as extract_event_details, but with one page_source call
+    # instead of one WebDriver round trip per element. A single wait: the
+    # title renders together with the calendar, so once the event list is
+    # done (or the calendar shows no events) the whole page is there.
+    event_list = waits.wait_for_event_list(driver, timeout=timeout)
+    if event_list["status"] in ("timeout", "error"):
+        # Fail fast instead of sitting through the per-element waits of
+        # extract_event_details; the page goes back on the queue
+        raise retry.PageFailed(f"Event list did not render ({event_list['status']})", kind="render")
+
+    # Errors here mean the browser is in trouble; let the caller classify them
+    event_url = driver.current_url
+    page_html = driver.page_source
+    return page_parser.parse_event_details(page_html, event_url)
 
-        event_data_list = []
-
-        # Loop through all found events
-        for idx in range(len(original_events)):
+# ========== Extract All Events From Calendar ==========
+def extract_events(driver, cache=None):
+    # One pass over the calendar list: read every production URL without
+    # clicking through, then let main() fetch the detail pages. Pages we do
+    # have to click into are extracted on the spot and cached.
+    on_page = None
+    if cache is not None:
+        def on_page(page_driver):
             try:
-                events = driver.find_elements(
-                    By.CSS_SELECTOR, ".ot_prodListItem.ot_callout"
-                )
-
-                # Re-check if event still exists
-                if idx >= len(events):
-                    logging.warning(f"Event #{idx + 1} no longer exists on reloaded page.")
-                    continue
-
-                # Click the event's button to view details
-                button = events[idx].find_element(By.CSS_SELECTOR, "button.ot_prodInfoButton")
-                driver.execute_script(
-                    "arguments[0].scrollIntoView({behavior: 'instant', block: 'center'});", button)
-                button.click()
-                logging.info(f"Clicked 'See this event' on event #{idx + 1}")
-
-                WebDriverWait(driver, 10).until(EC.url_contains("production"))
-
-                # Extract event data
-                details = extract_event_details(driver)
-                event_data_list.append(details)
-                logging.info(f"Extracted event #{idx + 1} details: {details}")
-
-                driver.back()  # Return to calendar
-                WebDriverWait(driver, 10).until(
-                    EC.visibility_of_element_located(
-                        (By.CLASS_NAME, "ot_prodListContainer")
-                    )
-                )
-
+                cache.put(page_driver.current_url, extract_event_details_snapshot(page_driver))
             except Exception as e:
-                logging.error(f"Error processing event #{idx + 1}: {e}")
+                # Not cached: the detail stage fetches it again, with retries
+                logging.warning(f"Could not extract {page_driver.current_url} during discovery: {e}")
+    event_urls = discovery.discover_production_urls(driver, on_page=on_page)
+    logging.info(f"Found {len(event_urls)} event URLs.")
+    return [{"event_url": event_url} for event_url in event_urls]
+
+# ========== Scrape One Production Into Rows ==========
+def scrape_event(driver, session, link, cache=None, fingerprints=None, http_cache=None, lean_profile=None):
+    # Plain HTTP + lxml first; Selenium only if the calendar isn't in the HTML.
+    # Pages whose fingerprint hasn't changed since the last run reuse their record.
+    fetch = lambda: http_backend.fetch_event_details(
+        link["event_url"], session=session, driver=driver,
+        fallback=extract_event_details_snapshot, fingerprints=fingerprints, cache=http_cache,
+        render_timeout=PAGE_TIMEOUT,
+    )
+    # Each production page is fetched and parsed at most once per run
+    event_data = cache.get_or_extract(link["event_url"], fetch) if cache is not None else fetch()
+    if not event_data:
+        raise retry.PageFailed(f"Could not fetch or render {link['event_url']}")
+    if lean_profile is not None:
+        lean_profile.collect(driver)  # Drain this browser's network log into the stats
+
+    # Merge link + newly extracted data, then one row per date/time
+    merged_data = records.merge_details(link, event_data)
+    # Status is classified in batches of productions in main()
+    return records.build_event_rows(merged_data, with_status=False)
+
+# ========== Discover Production URLs ==========
+def discover_event_links(driver, url, cache=None):
+    if not load_page(driver, url):
+        logging.error("Page did not load properly.")
+        return []
+    logging.info("Ready to begin scraping content...")
 
-        return event_data_list
+    if not click_calendar_button(driver):
+        logging.error("Failed to open calendar panel.")
+        return []
 
-    except Exception as e:
-        logging.error(f"Failed to extract events: {e}")
+    event_links = extract_events(driver, cache)
+    if not event_links:
+        logging.warning("No event URLs were extracted.")
         return []
 
-# ========== Main Execution ==========
-def main():
-    url = "https://ci.ovationtix.com/35583/production/1152995"
-    driver = setup_driver()  # Launch Chrome in headless mode
+    logging.info(f"Successfully extracted {len(event_links)} event URLs.")
+    for link in event_links:
+        logging.info(f"→ {link['event_url']}")
+    return event_links
+
+# ========== Streaming Pipeline ==========
+def iter_event_rows(driver, session, event_links, pool=None, cache=None,
+                    fingerprints=None, http_cache=None, lean_profile=None, limits=None, policy=None,
+                    unfinished=None, failed=None):
+    # Yields (link, rows) one production at a time, so nothing accumulates
+    # between fetching a page and writing its rows. A page that fails with a
+    # retryable error goes to the back of the queue and is tried again after
+    # a backoff, once everything else had its turn; pages held back by an
+    # open circuit wait out its cool-down without using up an attempt.
+    # Pages given up on (still failing after policy.attempts tries, a
+    # permanent error, or a host that stayed down) are added to `failed`;
+    # pages the time budget left untried are added to `unfinished`, for --resume.
+    limits = limits or venues.HostLimits()
+    policy = policy or retry.RetryPolicy()
+
+    def scrape(page_driver, link):
+        with limits.slot(link["event_url"]):
+            return scrape_event(page_driver, session, link, cache, fingerprints, http_cache, lean_profile)
+
+    def attempt(page_driver, link):
+        result = policy.attempt(link["event_url"], scrape, page_driver, link)
+        # However the failure was classified (a crash during the fallback
+        # driver.get comes back as a navigation failure), a dead browser goes
+        # back to the pool, which replaces it and retries the page
+        if pool is not None and isinstance(result, retry.Failure) and not driver_is_alive(page_driver):
+            raise result.error or retry.PageFailed("Browser is gone", kind="browser")
+        return result
+
+    pending = list(event_links)
+    skipped = []  # Not tried: the time budget ran out
+    given_up = []
+    tries = Counter()  # event_url -> attempts that actually ran
+    retry_round = 0
+    while pending:
+        if retry_round or tries:
+            # Backoff for pages that failed, or the rest of a circuit's
+            # cool-down when that is all that holds the pages back
+            wait = max(
+                policy.delay(retry_round) if retry_round else 0.0,
+                min(policy.breaker.cool_down_left(link["event_url"]) for link in pending),
+            )
+            if wait >= policy.time_left():
+                break
+            logging.info(f"Re-queued {len(pending)} productions, next round in {wait:.1f}s.")
+            time.sleep(wait)
+
+        if pool is not None:
+            # Detail pages in parallel, one headless browser per worker
+            results = pool.imap(attempt, pending)
+        else:
+            results = (attempt(driver, link) for link in pending)
+
+        retry_links = []
+        tried_any = False
+        for link, result in zip(pending, results):
+            if result is None:
+                result = retry.Failure("browser")  # Pool gave up after replacing the browser
+            if isinstance(result, retry.Failure):
+                if result.kind == "circuit_open":
+                    retry_links.append(link)  # Not tried; doesn't count as an attempt
+                elif result.kind == "budget":
+                    skipped.append(link)
+                elif result.kind == "host_down":
+                    given_up.append(link)
+                else:
+                    tries[link["event_url"]] += 1
+                    tried_any = True
+                    if policy.is_retryable(result.kind) and tries[link["event_url"]] < policy.attempts:
+                        retry_links.append(link)
+                    else:
+                        given_up.append(link)  # Out of attempts, or not worth another one
+                continue
+            tries[link["event_url"]] += 1
+            yield link, result
+        pending = retry_links
+        if tried_any:
+            retry_round += 1
+
+    # Still pending here means the budget ran out before the next round
+    if unfinished is not None:
+        unfinished.extend(pending + skipped)
+    if failed is not None:
+        failed.extend(given_up)
+    if pending or skipped:
+        logging.warning(
+            f"{len(pending) + len(skipped)} productions not scraped before the time budget ran out; "
+            f"continue with --resume."
+        )
+    if given_up:
+        logging.warning(f"Gave up on {len(given_up)} productions this run: {[link['event_url'] for link in given_up]}")
+
+# ========== Batch Productions for Status ==========
+def batch_event_rows(event_rows, batch_rows):
+    # Groups (link, rows) pairs until they hold batch_rows performances, so
+    # status is classified once per batch instead of once per production
+    batch, size = [], 0
+    for link, rows in event_rows:
+        batch.append((link, rows))
+        size += len(rows)
+        if size >= batch_rows:
+            yield batch
+            batch, size = [], 0
+    if batch:
+        yield batch
+
+# ========== Record Failed Productions ==========
+def save_failures(filename, event_urls):
+    # Next to the output, so a finished run still says what it is missing
+    path = f"{os.path.splitext(filename)[0]}_failed.txt"
+    with open(path, "w", encoding="utf-8") as f:
+        f.writelines(f"{event_url}\n" for event_url in event_urls)
+    logging.warning(f"{len(event_urls)} productions could not be scraped this run; listed in {path}")
 
-    all_events = []  # Store all extracted event data
+# ========== Main Execution ==========
+def main(workers=1, full=False, daemon=False, snapshot_formats=(), output_format="csv",
+         flush_every=writers.FLUSH_EVERY, resume=False, mongo_uri=None, sqlite_path=None,
+         venue_ids=None, venue_file=venues.DEFAULT_PATH, per_host_limit=venues.PER_HOST_LIMIT,
+         budget_minutes=None, attempts=retry.ATTEMPTS):
+    registry = venues.load_registry(venue_file)  # client id -> venue config
+    checkpoint = Checkpoint()  # Progress saved after every production
+    state = checkpoint.load() if resume else None
+
+    # Sinks connect first: an unreachable MongoDB fails the run before any
+    # browser is started, so nothing is left running
+    sinks = []  # Extra destinations for every row, next to the output file
+    sqlite = None
+    if mongo_uri:
+        from mongo_sink import MongoSink  # pymongo is only needed with --mongo-uri
+        sinks.append(MongoSink(mongo_uri))
+    if sqlite_path:
+        if sqlite_path is True:  # --sqlite without a path
+            sqlite_path = sqlite_store.DEFAULT_PATH
+        # One snapshot per run, queryable with sqlite_store.py; a resumed run adds to its own
+        sqlite = sqlite_store.SqliteStore(
+            sqlite_path,
+            taken_at=datetime.fromisoformat(state["started"]) if state else None,
+            snapshot_id=state.get("sqlite_snapshot") if state else None,
+        )
+        sinks.append(sqlite)
+    lean_profile = LeanProfile()  # Skip images, fonts, media and analytics downloads
+    if daemon:
+        # Borrow the warm browser from browser_daemon.py (quit() hands it back)
+        driver = browser_daemon.connect(fallback_factory=lambda: setup_driver(lean_profile))
+    else:
+        driver = setup_driver(lean_profile)  # Launch Chrome in headless mode
+    session = http_backend.create_session(pool_size=max(10, workers))  # Pooled HTTP session for detail pages
+    cache = DetailCache()  # Details extracted this run, keyed by canonical URL
+    fingerprints = FingerprintStore()  # Page/record hashes from previous runs
+    http_cache = HttpCache()  # On-disk responses, revalidated with ETag/Last-Modified
+    limits = venues.HostLimits(per_host_limit)  # Shared by discovery and detail pages
+    # Re-queue failed pages, stop at the time budget, trip per-host circuits
+    policy = retry.RetryPolicy(attempts, budget_seconds=budget_minutes * 60 if budget_minutes else None)
+    # Every venue shares these browsers: discovery, then detail pages
+    pool = DriverPool(workers, lambda: setup_driver(lean_profile)) if workers > 1 else None
+    if full:
+        fingerprints.entries = {}  # Re-parse everything this run
+
+    if resume and state is None:
+        logging.info("No unfinished run to resume, starting a new one.")
+    if state:
+        # Continue the unfinished run: same output file, cut back to the last
+        # completed production, and only the productions still missing
+        filename = state["output"]
+        writer = writers.open_writer(
+            filename, records.FIELDNAMES, flush_every=flush_every, resume_offset=state["offset"], count=state["rows"]
+        )
+        production_statuses = Counter(state["statuses"])
+        checkpoint.restore_fingerprints(fingerprints)
+        event_links = venues.tag(registry, [{"event_url": event_url} for event_url in state["event_urls"]])
+        logging.info(f"Resuming {filename}: {len(state['completed'])}/{len(event_links)} productions already done.")
+    else:
+        # Rows are appended to <filename>.part as each production finishes
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        filename = f"data/ovationtix_events_{timestamp}.{output_format}"
+        writer = writers.open_writer(filename, records.FIELDNAMES, flush_every=flush_every)
+        production_statuses = Counter()
+        event_links = None
 
     try:
-        # Load page and scrape content
-        if load_page(driver, url):
-            logging.info("Ready to begin scraping content...")
-
-            if click_calendar_button(driver):
-                event_links = extract_events(driver)
-
-                if event_links:
-                    logging.info(f"Successfully extracted {len(event_links)} event URLs.")
-                    for link in event_links:
-                        logging.info(f"→ {link['event_url']}")
-
-                    for idx, link in enumerate(event_links, start=1):
-                        try:
-                            driver.get(link["event_url"])
-                            time.sleep(2)
-
-                            event_data = extract_event_details(driver)
-
-                            # Merge link + newly extracted data
-                            merged_data = link.copy()
-                            for key in set(list(link.keys()) + list(event_data.keys())):
-                                val1 = event_data.get(key, "N/A")
-                                val2 = link.get(key, "N/A")
-                                merged_data[key] = val1 if val1 not in [None, "", "N/A"] else val2
-
-                            # Go through each date/time combo
-                            for date_time in merged_data.get("date_times", []):
-                                # Check if title is missing
-                                if not merged_data.get("title") or merged_data.get("title") == "N/A":
-                                    logging.warning(f"Missing title for event: {merged_data.get('event_url')}")
-
-                                # Determine event status (upcoming, active, closed)
-                                try:
-                                    event_datetime = datetime.strptime(date_time, "%d %B %Y - %I:%M %p")
-                                    now = datetime.now()
-                                    if abs((event_datetime - now).total_seconds()) <= 300:
-                                        status = "active"
-                                    elif event_datetime > now:
-                                        status = "upcoming"
-                                    else:
-                                        status = "closed"
-                                except Exception as e:
-                                    logging.warning(f"Could not parse date_time '{date_time}' for status: {e}")
-                                    status = "N/A"
-
-                                # Append event data
-                                all_events.append({
-                                    "title": merged_data.get("title", "N/A"),
-                                    "event_url": merged_data.get("event_url", "N/A"),
-                                    "image_url": merged_data.get("image_url", "N/A"),
-                                    "status": status,
-                                    "production_type": merged_data.get("production_type", "N/A"),
-                                    "date_time": date_time,
-                                    "origin": "N/A",
-                                    "market_presence": "N/A",
-                                    "age_of_production": "N/A",  
-                                })
-
-                        except Exception as e:
-                            logging.error(f"Error scraping event page {link['event_url']}: {e}")
+        if event_links is None:
+            selected = venues.select(registry, venue_ids)
+            logging.info(f"Crawling {len(selected)} venues: {[venue['name'] for venue in selected]}")
+            event_links = venues.discover_all(
+                selected, lambda page_driver, url: discover_event_links(page_driver, url, cache),
+                driver, pool, limits,
+            )
+            checkpoint.start(
+                filename, [link["event_url"] for link in event_links], writer.tell(),
+                extra={"sqlite_snapshot": sqlite.snapshot_id} if sqlite else None,
+            )
 
-                else:
-                    logging.warning("No event URLs were extracted.")
-            else:
-                logging.error("Failed to open calendar panel.")
-        else:
-            logging.error("Page did not load properly.")
-
-        # Save to CSV
-        if all_events:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"data/ovationtix_events_{timestamp}.csv"
-            os.makedirs("data", exist_ok=True)
-            with open(filename, mode="w", newline="", encoding="utf-8") as f:
-                writer = csv.DictWriter(
-                    f,
-                    fieldnames=[
-                        "title",
-                        "event_url",
-                        "image_url",
-                        "status",
-                        "production_type",
-                        "date_time",
-                        "origin",	
-                        "market_presence",
-                        "age_of_production",
-                    ],
-                )
-                writer.writeheader()
-                writer.writerows(all_events)
-            logging.info(f"Successfully saved {len(all_events)} records to {filename}")
+        unfinished = []  # Left untried by the time budget, kept for --resume
+        failed = []  # Given up on this session; the run finishes without them
+        event_rows = iter_event_rows(
+            driver, session, checkpoint.remaining(event_links), pool,
+            cache, fingerprints, http_cache, lean_profile, limits, policy, unfinished, failed,
+        )
+        venue_rows = Counter()
+        for batch in batch_event_rows(event_rows, flush_every):
+            # One vectorized status pass over every performance in the batch
+            rollup = status_engine.assign_statuses([row for _, rows in batch for row in rows])
+            for link, rows in batch:
+                if rows:
+                    production_statuses[rollup[rows[0]["event_url"]]] += 1
+                venue_rows[link.get("venue")] += len(rows)
+                writer.write_many(rows)
+                for sink in sinks:
+                    sink.write_many(rows)
+                    sink.flush()  # In the store before the checkpoint calls it done; --resume skips it
+                checkpoint.complete(link["event_url"], len(rows), writer.tell(), production_statuses, fingerprints)
+        if failed:
+            checkpoint.fail(link["event_url"] for link in failed)
+
+        if unfinished:
+            # Stopped by the time budget: same as an interruption, the output
+            # stays in its .part file and the checkpoint stays for --resume
+            writer.abort()
+            for sink in sinks:
+                sink.abort()
+            logging.warning(
+                f"{len(unfinished)} productions still to scrape; {writer.count} records so far in "
+                f"{filename}.part. Continue the run with --resume."
+            )
+        # Keep the file only when something changed since the last run
+        elif writer.count and not fingerprints.has_changes:
+            writer.discard()
+            logging.info("No production changed since the last run. CSV not created.")
+        elif writer.count:
+            writer.close()
+            logging.info(f"Production status: {dict(production_statuses)}")
+            logging.info(f"Rows per venue this session: {dict(venue_rows)}")
+            logging.info(f"Successfully saved {writer.count} records to {filename}")
+            if snapshot_formats:
+                snapshots.convert_file(filename, formats=snapshot_formats)  # Normalized productions/performances
         else:
+            writer.discard()
             logging.warning("No event data collected. CSV not created.")
+
+        if not unfinished:
+            if checkpoint.failed:
+                save_failures(filename, checkpoint.failed)
+            fingerprints.save()
+            for sink in sinks:
+                sink.close()
+            checkpoint.clear()
+    except BaseException:
+        writer.abort()  # Rows written so far stay in the .part file
+        for sink in sinks:
+            try:
+                sink.abort()
+            except Exception as e:
+                logging.error(f"Could not flush {type(sink).__name__} after the interruption: {e}")
+        logging.warning("Run interrupted; continue it with --resume.")
+        raise
     finally:
-        # Always quit the driver to release resources
+        # Always quit the drivers to release resources
+        if pool is not None:
+            pool.close()
+        session.close()
+        limits.log_summary()  # Waits caused by the per-host limit
+        policy.log_summary()  # Failures by kind and circuit trips
+        waits.log_summary()  # How long each kind of wait actually took
+        cache.log_summary()  # Pages served from the detail cache
+        dates.log_summary()  # Date/time strings that could not be parsed
+        fingerprints.log_summary()  # Pages unchanged since the last run
+        http_cache.save()
+        rate_limiter.get_limiter().save()  # The next run starts from the rates learned here
+        rate_limiter.get_limiter().log_summary()  # Delays, pushback and the rate each host settled at
+        http_cache.log_summary()  # Cache hits/misses and bandwidth saved
+        lean_profile.collect(driver)
+        lean_profile.log_summary()  # Requests and bytes saved by the lean profile
         driver.quit()
         del driver
 
 # Run the script
 if __name__ == "__main__":
-    main()
+    import argparse
+    import cli  # The same options as "cli.py scrape"
+    parser = argparse.ArgumentParser()
+    cli.add_scrape_arguments(parser)
+    main(**cli.scrape_options(parser.parse_args()))
@@ -1,14 +1,18 @@
 import csv
 import os
-import time
 # import datetime
 from datetime import datetime
 import logging
 import undetected_chromedriver as uc
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
+import discovery
+import waits
+import rate_limiter
+import records
+import driver_cache
+
 # ========== Setup Logging ==========
 os.makedirs("log", exist_ok=True)
 
@@ -47,7 +51,7 @@ def setup_driver():
         "--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/114.0.0.0 Safari/537.36"
     )
 
-    driver = uc.Chrome(options=options)
+    driver = uc.Chrome(options=options, **driver_cache.chrome_kwargs())
     if not options.headless:
         driver.maximize_window()
     return driver
@@ -56,12 +60,11 @@ def setup_driver():
 # ========== Load Page and Wait ==========
 def load_page(driver, url):
     try:
-        driver.get(url)
+        rate_limiter.browser_get(driver, url)
         logging.info(f"Navigated to {url}")
 
-        WebDriverWait(driver, 20).until(
-            EC.presence_of_element_located((By.TAG_NAME, "body"))
-        )
+        # Wait until the DOM is ready (no fixed sleep)
+        waits.wait_for_dom_ready(driver, timeout=20)
         logging.info("Page fully loaded")
         return True
     except Exception as e:
@@ -72,17 +75,17 @@ def load_page(driver, url):
 def click_calendar_button(driver):
     try:
         # Wait for the calendar button to be clickable
-        calendar_btn = WebDriverWait(driver, 15).until(
-            EC.element_to_be_clickable(
-                (By.CSS_SELECTOR, 'button[data-test="calendar_button"]')
-            )
+        calendar_btn = waits.wait_for_element(
+            driver, (By.CSS_SELECTOR, 'button[data-test="calendar_button"]'),
+            timeout=15, condition=EC.element_to_be_clickable, name="calendar_button",
         )
+        if calendar_btn is None:
+            logging.error("Calendar button is not on this page.")
+            return False
         calendar_btn.click()
         logging.info("Clicked the 'Calendar' button successfully.")
 
-        WebDriverWait(driver, 15).until(
-            EC.visibility_of_element_located((By.CLASS_NAME, "ot_prodListContainer"))
-        )
+        waits.wait_for_calendar_list(driver)
         logging.info("Calendar content (.ot_prodListContainer) is visible.")
 
         return True
@@ -101,11 +104,12 @@ def extract_event_details(driver):
         details["event_url"] = "N/A"
 
     try:
-        title_element = WebDriverWait(driver, 10).until(
-            EC.visibility_of_element_located(
-                (By.CSS_SELECTOR, "h1.calendarTitle.prodTitle")
-            )
+        title_element = waits.wait_for_element(
+            driver, (By.CSS_SELECTOR, "h1.calendarTitle.prodTitle"),
+            condition=EC.visibility_of_element_located, name="title",
         )
+        if title_element is None:
+            raise ValueError("title is not on the page")
         details["title"] = title_element.text.strip()
         logging.info(f"Extracted title: {details['title']}")
     except Exception as e:
@@ -116,6 +120,8 @@ def extract_event_details(driver):
     formatted_date_times = []
 
     try:
+        # Let the date list finish rendering before reading it
+        waits.wait_for_event_list(driver)
         event_list_items = driver.find_elements(By.CSS_SELECTOR, "li.events")
 
         for item in event_list_items:
@@ -163,67 +169,11 @@ def extract_event_details(driver):
 
 
 def extract_events(driver):
-    try:
-        WebDriverWait(driver, 15).until(
-            EC.visibility_of_element_located((By.CLASS_NAME, "ot_prodListContainer"))
-        )
-        logging.info("Event list container is visible.")
-
-        original_events = driver.find_elements(
-            By.CSS_SELECTOR, ".ot_prodListItem.ot_callout"
-        )
-        logging.info(f"Found {len(original_events)} event items.")
-
-        event_data_list = []
-
-        for idx in range(len(original_events)):
-            try:
-                events = driver.find_elements(
-                    By.CSS_SELECTOR, ".ot_prodListItem.ot_callout"
-                )
-
-                if idx >= len(events):
-                    logging.warning(
-                        f"Event #{idx + 1} no longer exists on reloaded page."
-                    )
-                    continue
-
-                button = events[idx].find_element(
-                    By.CSS_SELECTOR, "button.ot_prodInfoButton"
-                )
-
-                driver.execute_script(
-                    "arguments[0].scrollIntoView({behavior: 'instant', block: 'center'});",
-                    button,
-                )
-
-                button.click()
-                logging.info(f"Clicked 'See this event' on event #{idx + 1}")
-
-                WebDriverWait(driver, 10).until(EC.url_contains("production"))
-
-                # ✅ Get event details + link
-                details = extract_event_details(driver)
-                event_data_list.append(details)
-                logging.info(f"Extracted event #{idx + 1} details: {details}")
-
-                driver.back()
-                logging.info("Returned to calendar page.")
-
-                WebDriverWait(driver, 10).until(
-                    EC.visibility_of_element_located(
-                        (By.CLASS_NAME, "ot_prodListContainer")
-                    )
-                )
-
-            except Exception as e:
-                logging.error(f"Error processing event #{idx + 1}: {e}")
-
-        return event_data_list
-
-    except Exception as e:
-        logging.error(f"Failed to extract events: {e}")
-        return []
+    # One pass over the calendar list: read every production URL without
+    # clicking through, then let main() fetch the detail pages
+    event_urls = discovery.discover_production_urls(driver)
+    logging.info(f"Found {len(event_urls)} event URLs.")
+    return [{"event_url": event_url} for event_url in event_urls]
 
 
 # ========== Main Script ==========
@@ -256,8 +206,8 @@ def main():
                     # Step 5: Visit each event link to extract detailed data
                     for idx, link in enumerate(event_links, start=1):
                         try:
-                            driver.get(link["event_url"])
-                            time.sleep(2)
+                            rate_limiter.browser_get(driver, link["event_url"])
+                            waits.wait_for_page(driver)
 
                             event_data = extract_event_details(driver)
 
@@ -273,19 +223,7 @@ def main():
                                     logging.warning(f"Missing title for event: {merged_data.get('event_url')}")
 
                             # ➕ Determine status based on date_time
-                                try:
-                                    event_datetime = datetime.strptime(date_time, "%d %B %Y - %I:%M %p")
-                                    now = datetime.now()
-
-                                    if abs((event_datetime - now).total_seconds()) <= 300:
-                                        status = "active"
-                                    elif event_datetime > now:
-                                        status = "upcoming"
-                                    else:
-                                        status = "closed"
-                                except Exception as e:
-                                    logging.warning(f"Could not parse date_time '{date_time}' for status: {e}")
-                                    status = "N/A"
+                                status = records.performance_status(date_time)
 
                                 all_events.append(
                                     {
@@ -336,6 +274,7 @@ def main():
 
     finally:
         # Step 9: Close the browser and cleanup
+        waits.log_summary()  # How long each kind of wait actually took
         driver.quit()
         del driver  # Helps suppress warning messages in Windows
 
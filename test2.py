@@ -1,25 +1,10 @@
 import os
 import time
-import json
-import hashlib
+import re
 import logging
-import schedule
-import smtplib
-import random
-import pandas as pd
 from datetime import datetime
-from pymongo import MongoClient
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.common.action_chains import ActionChains
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
-import undetected_chromedriver as uc
-from bs4 import BeautifulSoup
-import requests
+# selenium, undetected_chromedriver, bs4 and schedule are imported where
+# they are used, so "--help" and scheduler start-up stay fast
 
 
 # --- Setup logging ---
@@ -39,25 +24,54 @@ def log_and_print(message):
 
 
 def scrape_shows():
+    from selenium import webdriver
+    from selenium.webdriver.common.by import By
+    import undetected_chromedriver as uc
+    from bs4 import BeautifulSoup
+
+    import waits
+    import rate_limiter
+    from fingerprints import FingerprintStore
+    from browser_profile import LeanProfile
+    import browser_daemon
+    import driver_cache
+
     start_time = datetime.now()
     log_and_print("🚀 Starting ovationtix.com/35583 Scraper...")
 
+    # Hash of the production list from the previous run
+    fingerprints = FingerprintStore(os.path.join('data', 'calendar_fingerprints.json'))
+
+    # Blocks images, fonts, media and trackers; reports this run's savings
+    lean_profile = LeanProfile()
+
     options = webdriver.ChromeOptions()
     options.add_argument('--ignore-certificate-errors')
     options.add_argument('--ignore-ssl-errors')
-    options.add_argument('--disable-images')
-    options.add_argument('--disable-javascript')
+    # Chrome ignores --disable-images/--disable-javascript; block assets via CDP instead
+    lean_profile.enable_logging(options)
     options.add_argument('--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/116.0.5845.188 Safari/537.36')
 
-    driver = uc.Chrome(options=options)
-    driver.get('https://ci.ovationtix.com/35583')
-    time.sleep(random.uniform(2, 4))
+    start_url = 'https://ci.ovationtix.com/35583'
+    # Warm browser from browser_daemon.py when it's running, fresh Chrome otherwise
+    driver = browser_daemon.connect(fallback_factory=lambda: uc.Chrome(options=options, **driver_cache.chrome_kwargs()))
+    lean_profile.apply(driver)
+    rate_limiter.browser_get(driver, start_url)
+    waits.wait_for_page(driver)
 
     soup = BeautifulSoup(driver.page_source, 'lxml')
     cards = soup.find_all('li', class_='ot_prodListItem ot_callout')
 
     links = []
 
+    # Skip the click-through entirely when the production list hasn't changed
+    page_hash = fingerprints.fingerprint(''.join(str(card) for card in cards))
+    previous_links = fingerprints.unchanged(start_url, page_hash)
+    if previous_links is not None:
+        log_and_print(f"♻️ Production list unchanged since last run, reusing {len(previous_links)} links.")
+        links = previous_links
+        cards = []
+
     for idx, item in enumerate(cards):
         try:
             # Extract title
@@ -73,9 +87,9 @@ def scrape_shows():
             # Click button to get event link
             button = driver.find_elements(By.CSS_SELECTOR, 'button.ot_prodInfoButton')[idx]
             driver.execute_script("arguments[0].scrollIntoView(true);", button)
-            time.sleep(1)
+            calendar_url = driver.current_url
             button.click()
-            time.sleep(random.uniform(2, 4))
+            waits.wait_for_url_change(driver, calendar_url)
 
             link = driver.current_url
 
@@ -85,26 +99,33 @@ def scrape_shows():
                 'Link': link
             })
 
-            log_and_print(f"✅ Fetched: {title} | {Link}")
+            log_and_print(f"✅ Fetched: {title} | {link}")
 
             driver.back()
-            time.sleep(random.uniform(2, 4))
+            waits.wait_for_element(driver, (By.CSS_SELECTOR, 'button.ot_prodInfoButton'), name="production_list")
             soup = BeautifulSoup(driver.page_source, 'lxml')
             cards = soup.find_all('li', class_='ot_prodListItem ot_callout')
 
         except Exception as e:
             log_and_print(f"❌ Error processing card #{idx}: {e}")
 
+    if cards:
+        fingerprints.update(start_url, page_hash, links)
+        fingerprints.save()
 
+    # Production documents in MongoDB when MONGO_URI is set
+    if links and os.environ.get('MONGO_URI'):
+        from mongo_sink import MongoSink
+        with MongoSink(os.environ['MONGO_URI']) as sink:
+            sink.upsert_productions(
+                {'event_url': link['Link'], 'title': link['title'], 'image_url': link['image']} for link in links
+            )
 
-        
-
-
-
-
-
+    waits.log_summary()
+    lean_profile.collect(driver)
+    lean_profile.log_summary()
+    driver.quit()  # Hands the daemon browser back, or closes the local one
 
-scrape_shows()
 
 # --- Scheduling ---
 def main():
@@ -116,6 +137,7 @@ def main():
     if args.once:
         scrape_shows()
     else:
+        import schedule
         schedule.every(6).hours.do(scrape_shows)
         log_and_print("🕒 Scheduler started. Scraper will run every 6 hours.")
         while True:
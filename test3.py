@@ -1,14 +1,17 @@
 import os
-import time
-import json
-import csv
 import logging
 import undetected_chromedriver as uc
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from datetime import datetime
 
+import discovery
+import waits
+import rate_limiter
+import dates
+import writers
+import driver_cache
+
 
 # ========== Setup Logging ==========
 os.makedirs("log", exist_ok=True)
@@ -38,7 +41,7 @@ def setup_driver(headless=False):
         "(KHTML, like Gecko) Chrome/114.0.0.0 Safari/537.36"
     )
 
-    driver = uc.Chrome(options=options)
+    driver = uc.Chrome(options=options, **driver_cache.chrome_kwargs())
     if not headless:
         driver.maximize_window()
     return driver
@@ -47,9 +50,10 @@ def setup_driver(headless=False):
 # ========== Load Page ==========
 def load_page(driver, url):
     try:
-        driver.get(url)
+        rate_limiter.browser_get(driver, url)
         logger.info(f"Navigated to {url}")
-        WebDriverWait(driver, 20).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
+        # Wait until the DOM is ready (no fixed sleep)
+        waits.wait_for_dom_ready(driver, timeout=20)
         logger.info("Page fully loaded")
         return True
     except Exception as e:
@@ -60,15 +64,17 @@ def load_page(driver, url):
 # ========== Click Calendar Button ==========
 def click_calendar_button(driver):
     try:
-        calendar_btn = WebDriverWait(driver, 15).until(
-            EC.element_to_be_clickable((By.CSS_SELECTOR, 'button[data-test="calendar_button"]'))
+        calendar_btn = waits.wait_for_element(
+            driver, (By.CSS_SELECTOR, 'button[data-test="calendar_button"]'),
+            timeout=15, condition=EC.element_to_be_clickable, name="calendar_button",
         )
+        if calendar_btn is None:
+            logger.error("Calendar button is not on this page.")
+            return False
         calendar_btn.click()
         logger.info("Clicked the 'Calendar' button")
 
-        WebDriverWait(driver, 15).until(
-            EC.visibility_of_element_located((By.CLASS_NAME, "ot_prodListContainer"))
-        )
+        waits.wait_for_calendar_list(driver)
         logger.info("Calendar content loaded and visible")
         return True
     except Exception as e:
@@ -78,65 +84,21 @@ def click_calendar_button(driver):
 
 # ========== Extract Event Links ==========
 def extract_event_links(driver):
-    try:
-        WebDriverWait(driver, 15).until(
-            EC.visibility_of_element_located((By.CLASS_NAME, "ot_prodListContainer"))
-        )
-
-        event_links = []
-        events = driver.find_elements(By.CSS_SELECTOR, ".ot_prodListItem.ot_callout")
-        logger.info(f"Found {len(events)} events")
-
-        for idx in range(len(events)):
-            # Refetch elements to avoid stale reference
-            events = driver.find_elements(By.CSS_SELECTOR, ".ot_prodListItem.ot_callout")
-            if idx >= len(events):
-                logger.warning(f"Event #{idx + 1} disappeared, skipping")
-                continue
-
-            try:
-                # Find the button inside the current event
-                button = events[idx].find_element(By.CSS_SELECTOR, "button.ot_prodInfoButton")
-
-                # Scroll button into view for better interaction
-                driver.execute_script("arguments[0].scrollIntoView({behavior: 'instant', block: 'center'});", button)
-
-                # Wait for THIS specific button element to be clickable (not a global selector)
-                WebDriverWait(driver, 10).until(EC.element_to_be_clickable(button))
-
-                button.click()
-                logger.info(f"Clicked 'See this event' button on event #{idx + 1}")
-
-                # Instead of waiting just for URL change, wait for key detail page element to appear
-                WebDriverWait(driver, 15).until(
-                    EC.visibility_of_element_located((By.CSS_SELECTOR, ".ot_productionTitle h1"))
-                )
-
-                event_url = driver.current_url
-                event_links.append(event_url)
-                logger.info(f"Captured event URL: {event_url}")
-
-                driver.back()
-
-                # Wait for calendar page and event list container to reload
-                WebDriverWait(driver, 15).until(
-                    EC.visibility_of_element_located((By.CLASS_NAME, "ot_prodListContainer"))
-                )
+    # Read every production URL from the calendar list in one pass instead of
+    # clicking each "See this event" button and going back
+    event_links = discovery.discover_production_urls(driver)
+    logger.info(f"Found {len(event_links)} events")
+    return event_links
 
-                # Small pause to stabilize page after going back
-                time.sleep(1.5)
 
-            except Exception as e:
-                logger.error(f"Error processing event #{idx + 1}: {e}")
-
-        return event_links
-
-    except Exception as e:
-        logger.error(f"Failed to extract event links: {e}")
-        return []
+# ========== Extract Event Details ==========
+# Columns of data/ovationtix_events.csv, in extract_event_details order
+DETAIL_FIELDS = [
+    "title", "date", "time", "link", "image_url", "production_type",
+    "status", "origin", "market_presence", "age_of_production",
+]
 
 
-# ========== Extract Event Details ==========
 def extract_event_details(driver):
     import re
 
@@ -154,9 +116,11 @@ def extract_event_details(driver):
     }
 
     try:
-        title_elem = WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, ".ot_productionTitle h1"))
+        title_elem = waits.wait_for_element(
+            driver, (By.CSS_SELECTOR, ".ot_productionTitle h1"), name="title"
         )
+        if title_elem is None:
+            raise ValueError("title is not on the page")
         details["title"] = title_elem.text.strip()
     except Exception as e:
         logger.warning(f"Title not found: {e}")
@@ -166,8 +130,8 @@ def extract_event_details(driver):
         perf_elems = driver.find_elements(By.CSS_SELECTOR, ".ot_dateGroup .ot_perfInfo")
         if perf_elems:
             first_text = perf_elems[0].text.strip()
-            date_match = re.search(r"\w{3},\s[\w\s]+\d{4}", first_text)
-            time_match = re.search(r"\d{1,2}:\d{2}\s[APMapm]{2}", first_text)
+            date_match = dates.DATE_IN_TEXT.search(first_text)
+            time_match = dates.TIME_IN_TEXT.search(first_text)
             if date_match:
                 details["date"] = date_match.group(0)
             if time_match:
@@ -207,63 +171,66 @@ def extract_event_details(driver):
     return details
 
 
+# ========== Streaming Extraction ==========
+def iter_event_details(driver, start_url):
+    # Yields each event's details as soon as its page is extracted
+    if not load_page(driver, start_url):
+        logger.error("Failed to load start page, exiting.")
+        return
+
+    if not click_calendar_button(driver):
+        logger.error("Failed to open calendar, exiting.")
+        return
+
+    event_links = extract_event_links(driver)
+    logger.info(f"Total event links extracted: {len(event_links)}")
+
+    if not event_links:
+        logger.warning("No event links found.")
+        return
+
+    for idx, link in enumerate(event_links, 1):
+        try:
+            rate_limiter.browser_get(driver, link)
+            # Wait for the page to go quiet instead of a fixed delay
+            waits.wait_for_page(driver, timeout=15)
+
+            details = extract_event_details(driver)
+            logger.info(f"[{idx}/{len(event_links)}] Extracted event details: {details['title']}")
+        except Exception as e:
+            logger.error(f"Error extracting details from event {link}: {e}")
+            continue
+        yield details
+
+
 # ========== Main ==========
 def main():
     start_url = "https://ci.ovationtix.com/35583/production/1152995"  # Starting page URL
 
     driver = setup_driver(headless=False)  # headless=True to run without UI
 
-    all_event_details = []
+    # Rows are appended to .part files as events arrive and renamed at the end
+    csv_writer = writers.CsvWriter("data/ovationtix_events.csv", DETAIL_FIELDS)
+    json_writer = writers.NdjsonWriter("data/ovationtix_events.ndjson")
 
     try:
-        if not load_page(driver, start_url):
-            logger.error("Failed to load start page, exiting.")
-            return
-
-        if not click_calendar_button(driver):
-            logger.error("Failed to open calendar, exiting.")
-            return
-
-        event_links = extract_event_links(driver)
-        logger.info(f"Total event links extracted: {len(event_links)}")
-
-        if not event_links:
-            logger.warning("No event links found.")
-            return
-
-        for idx, link in enumerate(event_links, 1):
-            try:
-                driver.get(link)
-                WebDriverWait(driver, 15).until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, ".ot_productionTitle h1"))
-                )
-                time.sleep(1)  # slight delay to ensure content loads
-
-                details = extract_event_details(driver)
-                all_event_details.append(details)
-                logger.info(f"[{idx}/{len(event_links)}] Extracted event details: {details['title']}")
-            except Exception as e:
-                logger.error(f"Error extracting details from event {link}: {e}")
-
+        for details in iter_event_details(driver, start_url):
+            csv_writer.write(details)
+            json_writer.write(details)
+    except BaseException:
+        csv_writer.abort()
+        json_writer.abort()
+        raise
     finally:
+        waits.log_summary()  # How long each kind of wait actually took
         driver.quit()
 
-    if all_event_details:
-        os.makedirs("data", exist_ok=True)
-        csv_file = "data/ovationtix_events.csv"
-        json_file = "data/ovationtix_events.json"
-
-        keys = all_event_details[0].keys()
-        with open(csv_file, "w", newline="", encoding="utf-8") as f_csv:
-            dict_writer = csv.DictWriter(f_csv, fieldnames=keys)
-            dict_writer.writeheader()
-            dict_writer.writerows(all_event_details)
-        logger.info(f"Saved data to CSV: {csv_file}")
-
-        with open(json_file, "w", encoding="utf-8") as f_json:
-            json.dump(all_event_details, f_json, indent=4)
-        logger.info(f"Saved data to JSON: {json_file}")
+    if csv_writer.count:
+        logger.info(f"Saved data to CSV: {csv_writer.close()}")
+        logger.info(f"Saved data to NDJSON: {json_writer.close()}")
     else:
+        csv_writer.discard()
+        json_writer.discard()
         logger.warning("No event details extracted; no files saved.")
 
 
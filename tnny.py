@@ -1,13 +1,12 @@
-import datetime
-from datetime import timedelta # Add timedelta for robust comparison
-import pandas as pd
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 import json
 import logging
-import time
+
+import waits
+import rate_limiter
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -27,7 +26,7 @@ def setup_driver():
 def navigate_to_calendar(driver, url):
     """Navigates to the website and clicks the Calendar link."""
     logging.info(f"Navigating to {url}")
-    driver.get(url)
+    rate_limiter.browser_get(driver, url)
     try:
         # Corrected: Targeting the button using its data-test attribute
         calendar_button = WebDriverWait(driver, 10).until(
@@ -35,7 +34,7 @@ def navigate_to_calendar(driver, url):
         )
         calendar_button.click()
         logging.info("Clicked 'Calendar' button.")
-        time.sleep(2)  # Give some time for the page to load
+        waits.wait_for_page(driver)  # Wait for the calendar to load instead of a fixed delay
         return True
     except Exception as e:
         logging.error(f"Error navigating to calendar or clicking button: {e}")
@@ -70,8 +69,8 @@ def get_event_buttons(driver): # Renamed function
 def extract_event_details(driver, event_url):
     """Extracts details from a single event page."""
     logging.info(f"Visiting event page: {event_url}")
-    driver.get(event_url)
-    time.sleep(2)  # Give some time for the page to load
+    rate_limiter.browser_get(driver, event_url)
+    waits.wait_for_page(driver)  # DOM ready + network idle instead of a fixed delay
 
     details = {
         "Title": "N/A",
@@ -84,9 +83,11 @@ def extract_event_details(driver, event_url):
 
     try:
         # Title
-        title_element = WebDriverWait(driver, 5).until(
-            EC.presence_of_element_located((By.XPATH, "//h1[@class='calendarTitle prodTitle']"))
+        title_element = waits.wait_for_element(
+            driver, (By.XPATH, "//h1[@class='calendarTitle prodTitle']"), timeout=5, name="title"
         )
+        if title_element is None:
+            raise ValueError("title is not on the page")
         details["Title"] = title_element.text.strip()
         logging.info(f"Extracted Title: {details['Title']}")
     except Exception as e:
@@ -118,11 +119,7 @@ def extract_event_details(driver, event_url):
             logging.warning("No date list items found for status determination.")
             return details # Return early or continue based on your preference
 
-        has_future_performances = False
-        has_past_performances = False
-        has_active_performances = False # For performances scheduled for today
-
-        current_datetime = datetime.datetime.now() # Get current date and time
+        performance_date_times = [] # "4 June 2025 - 7:00 pm", classified together below
 
         for list_item in date_list_items:
             try:
@@ -131,59 +128,25 @@ def extract_event_details(driver, event_url):
                 date_str = date_div.text.strip()
                 logging.debug(f"Processing date: {date_str}")
 
-                # Parse the date string. Format: "DD Month YYYY" (e.g., "4 June 2025")
-                parsed_date = datetime.datetime.strptime(date_str, "%d %B %Y").date()
-
                 # Find all time slots for this specific date
                 time_slot_buttons = list_item.find_elements(By.CSS_SELECTOR, "div.ot_calendarTimeSlots button p")
                 logging.debug(f"Found {len(time_slot_buttons)} time slots for {date_str}.")
 
                 for time_p_tag in time_slot_buttons:
-                    time_str = time_p_tag.text.strip()
-                    logging.debug(f"Processing time: {time_str}")
-
-                    try:
-                        # Parse the time string (e.g., "7:00 pm"). Adjust format as needed.
-                        # Using %I for 12-hour clock, %M for minute, %p for AM/PM
-                        parsed_time = datetime.datetime.strptime(time_str, "%I:%M %p").time()
-
-                        # Combine date and time for a full datetime object
-                        performance_datetime = datetime.datetime.combine(parsed_date, parsed_time)
-
-                        # Compare with current time
-                        # Give a small buffer (e.g., 5 minutes) for "active" status around the current time
-                        time_buffer = timedelta(minutes=5)
-
-                        if performance_datetime > current_datetime + time_buffer:
-                            has_future_performances = True
-                        elif performance_datetime < current_datetime - time_buffer:
-                            has_past_performances = True
-                        else: # Within the buffer of current time
-                            has_active_performances = True
-
-                    except ValueError as ve:
-                        logging.warning(f"Could not parse time string '{time_str}' for date '{date_str}': {ve}")
-                        continue # Skip to the next time slot
+                    performance_date_times.append(f"{date_str} - {time_p_tag.text.strip()}")
 
             except Exception as e:
                 logging.warning(f"Could not process date item or its times: {e}")
                 continue # Skip to the next list item if there's an issue with a date
 
-        # Determine overall status based on combined flags
-        if has_active_performances:
-            details["Status"] = "active"
-        elif has_future_performances and not has_past_performances:
-            details["Status"] = "upcoming"
-        elif has_past_performances and not has_future_performances and not has_active_performances:
-            details["Status"] = "closed"
-        elif has_future_performances and has_past_performances:
-            # If there are both past and future performances (but none currently active),
-            # it implies it's an ongoing run, so "active" is still appropriate.
-            details["Status"] = "active"
-        else:
-            details["Status"] = "N/A - Indeterminate" # Fallback if logic doesn't fit
+        # Active if any performance is within 5 minutes of now or the run has
+        # both past and future dates; upcoming/closed if only future/past ones
+        import status_engine  # pandas/numpy: imported on first use, not with tnny
+        details["Status"] = status_engine.production_status(performance_date_times)
+        if details["Status"] == "N/A":
+            details["Status"] = "N/A - Indeterminate" # No date/time could be parsed
 
-        logging.info(f"Extracted Status: {details['Status']} (Active: {has_active_performances}, Future: {has_future_performances}, Past: {has_past_performances})")
+        logging.info(f"Extracted Status: {details['Status']} ({len(performance_date_times)} performances)")
 
     except Exception as e:
         logging.error(f"Error determining Status for production: {e}")
@@ -255,35 +218,24 @@ def main():
             calendar_page_url = driver.current_url
             logging.info(f"Calendar page URL captured: {calendar_page_url}")
 
-            # Get the initial count of event buttons. We'll re-find them inside the loop.
-            # Using a temporary driver instance or quickly navigating to get count, then closing.
-            # For robustness, we'll navigate back for each click.
-            temp_driver_for_count = setup_driver()
-            if not temp_driver_for_count:
-                logging.error("Failed to setup temp driver for initial count. Exiting.")
-                return
+            # Get the initial count of event buttons from the page we're already on.
+            # We'll re-find them inside the loop, navigating back for each click.
             try:
-                temp_driver_for_count.get(calendar_page_url)
-                WebDriverWait(temp_driver_for_count, 10).until(
+                WebDriverWait(driver, 10).until(
                     EC.presence_of_element_located((By.CSS_SELECTOR, ".ot_prodListItem.ot_callout"))
                 )
-                temp_event_buttons = get_event_buttons(temp_driver_for_count)
-                total_events_to_process = len(temp_event_buttons)
+                total_events_to_process = len(get_event_buttons(driver))
                 logging.info(f"Detected {total_events_to_process} events to process from calendar.")
             except Exception as e:
                 logging.error(f"Error getting initial event count: {e}")
                 total_events_to_process = 0
-            finally:
-                temp_driver_for_count.quit()
-
 
             for i in range(total_events_to_process):
                 logging.info(f"Processing event {i+1} of {total_events_to_process}...")
-                driver.get(calendar_page_url) # Navigate back to the calendar page for each event
+                rate_limiter.browser_get(driver, calendar_page_url) # Navigate back to the calendar page for each event
                 WebDriverWait(driver, 10).until(
                     EC.presence_of_element_located((By.CSS_SELECTOR, ".ot_prodListItem.ot_callout")) # Wait for event containers to reappear
                 )
-                time.sleep(1) # Small pause for page rendering
 
                 # Re-find ALL the buttons on the current (refreshed) calendar page
                 current_event_buttons = get_event_buttons(driver)
@@ -300,7 +252,7 @@ def main():
                     WebDriverWait(driver, 10).until(EC.element_to_be_clickable(event_button_to_click))
                     event_button_to_click.click()
                     logging.info(f"Clicked 'See this event' button for event {i+1}.")
-                    time.sleep(3) # Wait for the new event details page to load
+                    waits.wait_for_url_change(driver, calendar_page_url) # Wait for the event details page to open
 
                     event_url = driver.current_url # Get the URL of the newly loaded page
                     event_data = extract_event_details(driver, event_url)
@@ -316,10 +268,12 @@ def main():
         logging.critical(f"An overarching error occurred during the main scraping process: {e}")
     finally:
         logging.info("Scraping process finished. Quitting driver.")
+        waits.log_summary()  # How long each kind of wait actually took
         driver.quit()
 
     # Save to CSV
     try:
+        import pandas as pd  # Only needed for the CSV export; slow to import
         df = pd.DataFrame(all_events_data)
         df.to_csv("production_details.csv", index=False)
         logging.info("Data saved to production_details.csv")
@@ -0,0 +1,160 @@
+# ========== Import Required Libraries ==========
+import os  # For the registry file
+import json  # The registry is a small JSON file
+import logging  # For logging events (info, warnings, errors)
+import threading  # Per-host concurrency limits across browser workers
+from collections import Counter, defaultdict  # Per-venue counts, grouping by venue
+from contextlib import contextmanager  # HostLimits.slot()
+from itertools import chain, zip_longest  # Round-robin interleaving
+from urllib.parse import urlsplit  # For grouping requests by host
+
+import http_backend  # BASE_URL and production URLs
+from discovery import client_id_from_url
+
+DEFAULT_PATH = "venues.json"
+PER_HOST_LIMIT = 4  # Pages in flight per host, whatever the number of workers
+
+# Used when there is no venues.json: the client every script started with
+DEFAULT_VENUES = {
+    "35583": {"start_url": f"{http_backend.BASE_URL}/35583/production/1152995"},
+}
+
+
+# ========== Venue Registry ==========
+def venue_config(client_id, config=None):
+    """Fills in the defaults for one registry entry."""
+    config = dict(config or {})
+    config["client_id"] = str(client_id)
+    config.setdefault("name", config["client_id"])
+    # Any page of the client with a "Calendar" button works as the start page
+    config.setdefault("start_url", f"{http_backend.BASE_URL}/{client_id}")
+    config.setdefault("enabled", True)
+    return config
+
+
+def load_registry(path=DEFAULT_PATH):
+    """
+    client id -> venue config, from a JSON object like
+    {"35583": {"name": "...", "start_url": "...", "enabled": true}}.
+    """
+    venues = DEFAULT_VENUES
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            venues = json.load(f)
+        logging.info(f"Loaded {len(venues)} venues from {path}")
+    return {str(client_id): venue_config(client_id, config) for client_id, config in venues.items()}
+
+
+def select(registry, client_ids=None):
+    """Enabled venues, or exactly the given client ids ("all" for every enabled one)."""
+    if not client_ids or client_ids == ["all"]:
+        return [venue for venue in registry.values() if venue["enabled"]]
+    missing = [client_id for client_id in client_ids if client_id not in registry]
+    if missing:
+        logging.warning(f"Not in the venue registry, using defaults: {missing}")
+    return [registry.get(client_id) or venue_config(client_id) for client_id in client_ids]
+
+
+def venue_of(registry, url):
+    """Registry name of the venue a production URL belongs to."""
+    client_id = client_id_from_url(url)
+    if client_id is None:
+        return "N/A"
+    return registry[client_id]["name"] if client_id in registry else client_id
+
+
+def tag(registry, event_links):
+    for link in event_links:
+        link["venue"] = venue_of(registry, link["event_url"])
+    return event_links
+
+
+# ========== Per-Host Limits ==========
+class HostLimits:
+    """
+    At most `limit` pages in flight per host, shared by every worker thread.
+    The threaded counterpart of AsyncScraper's per-host semaphores.
+    """
+
+    def __init__(self, limit=PER_HOST_LIMIT, overrides=None):
+        self.limit = limit
+        self.overrides = overrides or {}  # host -> limit
+        self._hosts = {}
+        self._lock = threading.Lock()
+        self.waits = Counter()  # host -> times a worker had to wait for a slot
+
+    def _semaphore(self, url):
+        host = urlsplit(url).netloc
+        with self._lock:
+            if host not in self._hosts:
+                self._hosts[host] = threading.BoundedSemaphore(self.overrides.get(host, self.limit))
+            return host, self._hosts[host]
+
+    @contextmanager
+    def slot(self, url):
+        host, semaphore = self._semaphore(url)
+        if not semaphore.acquire(blocking=False):
+            self.waits[host] += 1
+            semaphore.acquire()
+        try:
+            yield
+        finally:
+            semaphore.release()
+
+    def log_summary(self):
+        if self.waits:
+            logging.info(f"Per-host limit ({self.limit}) made workers wait: {dict(self.waits)}")
+
+
+# ========== Multi-Venue Crawl ==========
+def interleave(event_links):
+    """
+    Round-robin across venues, so one large venue does not hold every worker
+    on the same host while the rest wait behind it.
+    """
+    by_venue = defaultdict(list)
+    for link in event_links:
+        by_venue[link.get("venue")].append(link)
+    return [link for link in chain.from_iterable(zip_longest(*by_venue.values())) if link is not None]
+
+
+def discover_all(venues, discover, driver, pool=None, limits=None):
+    """
+    Production links of every venue, tagged with the venue name and
+    interleaved across venues.
+
+    discover(driver, start_url) returns one venue's links (test0's
+    discover_event_links). With a DriverPool the calendar pages load in
+    parallel on the same browsers that later scrape the detail pages; the
+    caller's driver is used otherwise. A venue that fails just contributes
+    no links.
+    """
+    limits = limits or HostLimits()
+
+    def discover_venue(page_driver, venue):
+        with limits.slot(venue["start_url"]):
+            links = discover(page_driver, venue["start_url"])
+        for link in links:
+            link["venue"] = venue["name"]
+        return links
+
+    if pool is not None and len(venues) > 1:
+        found = pool.map(discover_venue, venues)
+    else:
+        found = []
+        for venue in venues:
+            try:
+                found.append(discover_venue(driver, venue))
+            except Exception as e:
+                logging.error(f"Discovery failed for venue {venue['name']}: {e}")
+                found.append(None)
+
+    event_links = []
+    seen = set()
+    for venue, links in zip(venues, found):
+        logging.info(f"Venue {venue['name']} ({venue['client_id']}): {len(links or [])} productions")
+        for link in links or []:
+            if link["event_url"] not in seen:  # A production listed by two venues is scraped once
+                seen.add(link["event_url"])
+                event_links.append(link)
+    return interleave(event_links)
@@ -0,0 +1,220 @@
+# ========== Import Required Libraries ==========
+import time  # For measuring how long each wait took
+import logging  # For logging events (info, warnings, errors)
+from collections import defaultdict  # Per-wait timing buckets
+from selenium.common.exceptions import (  # Raised by waits and lookups
+    NoSuchElementException,
+    StaleElementReferenceException,
+    TimeoutException,
+)
+from selenium.webdriver.common.by import By  # For locating elements
+from selenium.webdriver.support.ui import WebDriverWait  # Polling waits
+from selenium.webdriver.support import expected_conditions as EC  # Expected conditions for waits
+
+POLL_FREQUENCY = 0.1  # Seconds between checks (WebDriverWait defaults to 0.5)
+SETTLE_MS = 500  # Page counts as settled after this long without network activity
+
+EVENT_LIST_SELECTOR = "li.events"
+# Rendered once the calendar has loaded, even for a production with no dates
+CALENDAR_SELECTOR = ".ot_calendarView, .ot_calendarMsg"
+
+ABSENT = object()  # Marker for "the page settled and the element never appeared"
+
+# ========== Wait Timings ==========
+_timings = defaultdict(list)  # name -> [(seconds, outcome), ...]
+
+
+def record(name, seconds, outcome):
+    _timings[name].append((seconds, outcome))
+    logging.debug(f"Wait '{name}' finished as {outcome} in {seconds:.2f}s")
+
+
+def summary():
+    """Count, total and max seconds per wait name, plus outcome counts."""
+    result = {}
+    for name, entries in _timings.items():
+        outcomes = defaultdict(int)
+        for _, outcome in entries:
+            outcomes[outcome] += 1
+        durations = [seconds for seconds, _ in entries]
+        result[name] = {
+            "count": len(entries),
+            "total": sum(durations),
+            "max": max(durations),
+            "outcomes": dict(outcomes),
+        }
+    return result
+
+
+def log_summary():
+    for name, stats in sorted(summary().items()):
+        logging.info(
+            f"Wait '{name}': {stats['count']} waits, {stats['total']:.2f}s total, "
+            f"{stats['max']:.2f}s max, outcomes {stats['outcomes']}"
+        )
+
+
+def reset():
+    _timings.clear()
+
+
+def _timed_until(driver, name, timeout, condition):
+    # WebDriverWait with a fast poll, recording how long it really took
+    start = time.perf_counter()
+    try:
+        result = WebDriverWait(driver, timeout, poll_frequency=POLL_FREQUENCY).until(condition)
+    except TimeoutException:
+        record(name, time.perf_counter() - start, "timeout")
+        raise
+    record(name, time.perf_counter() - start, "absent" if result is ABSENT else "ok")
+    return result
+
+
+# ========== Page-Level Conditions ==========
+# Counts in-flight fetch/XHR calls and remembers when the network was last busy.
+# Resource timing entries cover requests made before the hooks were installed.
+NETWORK_STATE_SCRIPT = """
+if (!window.__otWait) {
+    const state = window.__otWait = {pending: 0, last: performance.now()};
+    const done = () => { state.pending--; state.last = performance.now(); };
+    const send = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        state.pending++;
+        this.addEventListener('loadend', done);
+        return send.apply(this, arguments);
+    };
+    if (window.fetch) {
+        const fetch = window.fetch;
+        window.fetch = function () {
+            state.pending++;
+            return fetch.apply(this, arguments).finally(done);
+        };
+    }
+}
+const entries = performance.getEntriesByType('resource');
+const lastResource = entries.length ? Math.max(...entries.map(e => e.responseEnd)) : 0;
+return {
+    ready: document.readyState,
+    pending: window.__otWait.pending,
+    quiet: performance.now() - Math.max(window.__otWait.last, lastResource),
+};
+"""
+
+
+def page_settled(driver, settle_ms=SETTLE_MS):
+    """True when the DOM is complete and the network has been idle for settle_ms."""
+    try:
+        state = driver.execute_script(NETWORK_STATE_SCRIPT)
+    except Exception:
+        return False
+    return state["ready"] == "complete" and state["pending"] <= 0 and state["quiet"] >= settle_ms
+
+
+def wait_for_dom_ready(driver, timeout=20):
+    return _timed_until(
+        driver, "dom_ready", timeout,
+        lambda d: d.execute_script("return document.readyState") == "complete",
+    )
+
+
+def wait_for_network_idle(driver, timeout=20, settle_ms=SETTLE_MS):
+    return _timed_until(driver, "network_idle", timeout, lambda d: page_settled(d, settle_ms))
+
+
+# ========== Element Conditions With Fast Absence ==========
+def wait_for_element(driver, locator, timeout=10, condition=EC.presence_of_element_located,
+                     settle_ms=SETTLE_MS, name=None):
+    """
+    Returns the element, or None once the page has settled without it.
+
+    A missing element costs roughly settle_ms after the page goes idle
+    instead of the full timeout.
+    """
+    check = condition(locator)
+
+    def found_or_absent(d):
+        try:
+            element = check(d)
+        except (NoSuchElementException, StaleElementReferenceException):
+            element = False
+        if element:
+            return element
+        if page_settled(d, settle_ms):
+            return ABSENT
+        return False
+
+    try:
+        result = _timed_until(driver, name or f"element {locator[1]}", timeout, found_or_absent)
+    except TimeoutException:
+        return None
+    return None if result is ABSENT else result
+
+
+def wait_for_url_change(driver, old_url, timeout=10):
+    return _timed_until(driver, "url_change", timeout, lambda d: d.current_url != old_url)
+
+
+def wait_for_calendar_list(driver, timeout=15):
+    return _timed_until(
+        driver, "calendar_list", timeout,
+        EC.visibility_of_element_located((By.CLASS_NAME, "ot_prodListContainer")),
+    )
+
+
+# ========== Event List via MutationObserver ==========
+# Resolves once li.events exist and the DOM has been quiet for quietMs, or
+# once the calendar rendered with no events ("absent"), without polling.
+EVENT_LIST_SCRIPT = """
+const [selector, calendarSelector, quietMs, timeoutMs, done] = arguments;
+let quietTimer = null;
+let hardTimer = null;
+let observer = null;
+function finish(status) {
+    if (observer) observer.disconnect();
+    clearTimeout(quietTimer);
+    clearTimeout(hardTimer);
+    done({status: status, count: document.querySelectorAll(selector).length});
+}
+function check() {
+    clearTimeout(quietTimer);
+    quietTimer = setTimeout(() => {
+        if (document.querySelector(selector)) {
+            finish('present');
+        } else if (document.readyState === 'complete' && document.querySelector(calendarSelector)) {
+            finish('absent');
+        }
+    }, quietMs);
+}
+observer = new MutationObserver(check);
+observer.observe(document.documentElement, {childList: true, subtree: true});
+hardTimer = setTimeout(() => finish('timeout'), timeoutMs);
+check();
+"""
+
+
+def wait_for_event_list(driver, timeout=10, quiet_ms=300):
+    """Waits for the li.events list to finish rendering; returns its status dict."""
+    start = time.perf_counter()
+    try:
+        driver.set_script_timeout(timeout + 5)
+        result = driver.execute_async_script(
+            EVENT_LIST_SCRIPT, EVENT_LIST_SELECTOR, CALENDAR_SELECTOR,
+            quiet_ms, int(timeout * 1000),
+        )
+    except Exception as e:
+        logging.warning(f"Event list observer failed: {e}")
+        result = {"status": "error", "count": 0}
+    record("event_list", time.perf_counter() - start, result["status"])
+    return result
+
+
+# ========== Page Load ==========
+def wait_for_page(driver, timeout=20, settle_ms=SETTLE_MS):
+    """DOM ready followed by network idle; returns False instead of raising."""
+    try:
+        wait_for_dom_ready(driver, timeout)
+        wait_for_network_idle(driver, timeout, settle_ms)
+        return True
+    except TimeoutException:
+        logging.warning(f"Page did not settle within {timeout}s")
+        return False
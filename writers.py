@@ -0,0 +1,136 @@
+# ========== Import Required Libraries ==========
+import os  # For the temporary file, fsync and atomic rename
+import csv  # For writing data to CSV files
+import json  # One JSON object per line for NDJSON
+import time  # For the time-based flush cadence
+import logging  # For logging events (info, warnings, errors)
+
+FLUSH_EVERY = 50  # Rows between flushes
+FLUSH_SECONDS = 5.0  # ...or seconds, whichever comes first
+
+
+# ========== Incremental Writer ==========
+class IncrementalWriter:
+    """
+    Appends rows to "<path>.part" as they arrive and renames it to path on
+    close(). A run that crashes leaves the .part file with every row written
+    up to its last flush; a discarded run leaves nothing behind. With
+    resume_offset, an existing .part file is cut back to that offset (the
+    last checkpoint) and appended to, so rows are never written twice.
+
+        with CsvWriter("data/events.csv", FIELDNAMES) as writer:
+            for row in rows:
+                writer.write(row)
+    """
+
+    def __init__(self, path, flush_every=FLUSH_EVERY, flush_seconds=FLUSH_SECONDS, resume_offset=None, count=0):
+        self.path = path
+        self.part_path = f"{path}.part"
+        self.flush_every = flush_every
+        self.flush_seconds = flush_seconds
+        self.count = count
+        self._unflushed = 0
+        self._last_flush = time.monotonic()
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        if resume_offset is not None and os.path.exists(self.part_path):
+            self._file = open(self.part_path, "r+", newline="", encoding="utf-8")
+            self._file.truncate(resume_offset)
+            self._file.seek(resume_offset)
+            self._start(header=False)
+        else:
+            self._file = open(self.part_path, "w", newline="", encoding="utf-8")
+            self._start(header=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    # ---------- Format hooks ----------
+    def _start(self, header):
+        pass
+
+    def _write_row(self, row):
+        raise NotImplementedError
+
+    # ---------- Writing ----------
+    def write(self, row):
+        self._write_row(row)
+        self.count += 1
+        self._unflushed += 1
+        if self._unflushed >= self.flush_every or time.monotonic() - self._last_flush >= self.flush_seconds:
+            self.flush()
+
+    def write_many(self, rows):
+        for row in rows:
+            self.write(row)
+
+    def flush(self):
+        self._file.flush()
+        self._unflushed = 0
+        self._last_flush = time.monotonic()
+
+    def tell(self):
+        """Flushes and returns the .part file size: a safe resume_offset."""
+        self.flush()
+        return self._file.tell()
+
+    # ---------- Finishing ----------
+    def close(self):
+        """Flushes to disk and renames the .part file to its final name."""
+        if self._file.closed:
+            return self.path
+        self.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+        os.replace(self.part_path, self.path)
+        return self.path
+
+    def abort(self):
+        """Keeps the .part file (everything written so far) for inspection or resume."""
+        if self._file.closed:
+            return
+        self.flush()
+        self._file.close()
+        logging.warning(f"Run did not finish; {self.count} rows kept in {self.part_path}")
+
+    def discard(self):
+        """Closes and deletes the .part file, e.g. when the run found nothing new."""
+        if not self._file.closed:
+            self._file.close()
+        try:
+            os.remove(self.part_path)
+        except OSError:
+            pass
+
+
+class CsvWriter(IncrementalWriter):
+    def __init__(self, path, fieldnames, **kwargs):
+        self.fieldnames = fieldnames
+        super().__init__(path, **kwargs)
+
+    def _start(self, header):
+        self._writer = csv.DictWriter(self._file, fieldnames=self.fieldnames, extrasaction="ignore")
+        if header:
+            self._writer.writeheader()
+
+    def _write_row(self, row):
+        self._writer.writerow(row)
+
+
+class NdjsonWriter(IncrementalWriter):
+    def _write_row(self, row):
+        self._file.write(json.dumps(row, ensure_ascii=False, default=str))
+        self._file.write("\n")
+
+
+def open_writer(path, fieldnames=None, **kwargs):
+    """CsvWriter for .csv paths, NdjsonWriter for .ndjson/.jsonl."""
+    if path.endswith((".ndjson", ".jsonl")):
+        return NdjsonWriter(path, **kwargs)
+    return CsvWriter(path, fieldnames, **kwargs)